@@ -16,50 +16,45 @@ import time
 import json
 import socket
 import logging
-from datetime import datetime, timedelta, UTC
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import List, Dict, Any, Optional, Set, Tuple, Callable, Awaitable
+from dataclasses import dataclass, field
 from pathlib import Path
-import aiohttp
 import os
 from contextlib import asynccontextmanager
-import concurrent.futures
-import psutil
-import mysql.connector
-from mysql.connector import pooling
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 import os
 
+from body_reader import read_missing_keywords
+from circuit_breaker import CircuitBreaker
+from keywords import get_keyword_matcher
+from log_pipeline import CheckLogSampler, configure_logging
+from dispatcher import HostDispatcher
+from dns_cache import CachingResolver, DNSCache
+from http_client import ClientOptions, HTTPBackend, create_http_backend
+from change_feed import ChangeFeed, PollingSource, RedisSource, UnixSocketSource
+from log_writer import MonitorLogWriter
+from probe import ICMPProbeEngine, TCPProbeEngine
+from metrics import MetricsRegistry, MetricsServer, RateMeter, measure_loop_lag
+from registry import MonitorRegistry, RegistryDiff
+from request_strategy import HEAD_REJECTED, RequestStrategy, response_bytes
+from rollups import RollupWriter, purge_expired
+from scheduler import MonitorScheduler, next_check_time
+from sharding import ShardCoordinator
+from status_tracker import StatusTracker
+from tracing import PhaseTimings, current_timings
+from storage import StorageBackend, create_backend
+
 load_dotenv()
 
-class ColorFormatter(logging.Formatter):
-    COLORS = {
-        logging.DEBUG: "\033[94m",   # Blue
-        logging.INFO: "\033[92m",    # Green
-        logging.WARNING: "\033[93m", # Yellow
-        logging.ERROR: "\033[91m",   # Red
-        logging.CRITICAL: "\033[95m" # Magenta
-    }
-    RESET = "\033[0m"
-
-    
-    def format(self, record):
-        color = self.COLORS.get(record.levelno, self.RESET)
-        # Add time to log output (HH:MM:SS)
-        log_time = self.formatTime(record, "%Y-%m-%d %H:%M:%S")        
-        message = super().format(record)
-        return f"{color}[{log_time}] {message}{self.RESET}"
-
-# Setup logger
-logger = logging.getLogger(__name__)
-handler = logging.StreamHandler()
-formatter = ColorFormatter("%(levelname)s - %(message)s")
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-logger.setLevel(logging.DEBUG)
-
-
-@dataclass
+# Setup logger (shared by the checker modules), records are written by a
+# background thread so formatting and stdout never block the event loop
+logger = logging.getLogger("monitor_checker")
+log_pipeline = configure_logging(logger)
+
+
+@dataclass(slots=True)
 class MonitorResult:
     """Data class for monitor results"""
 
@@ -69,11 +64,23 @@ class MonitorResult:
     error: Optional[str] = None
     http_code: Optional[int] = None
     missing_keywords: Optional[List[str]] = None
-
-
-@dataclass
+    started_at: Optional[datetime] = None
+    # Phase breakdown (ms, monotonic clock), None when a phase did not happen
+    # (e.g. no dns/connect/tls on a reused connection). dns_time is not
+    # included in response_time
+    dns_time: Optional[int] = None
+    connect_time: Optional[int] = None
+    tls_time: Optional[int] = None
+    ttfb_time: Optional[int] = None
+    body_time: Optional[int] = None
+    # Website checks: request made (head, get, not_modified) and bytes received
+    request: Optional[str] = None
+    bytes_received: Optional[int] = None
+
+
+@dataclass(slots=True)
 class Monitor:
-    """Data class for monitor configuration"""
+    """Data class for monitor configuration (slotted, no per-instance __dict__)"""
 
     id: int
     label: str
@@ -84,6 +91,8 @@ class Monitor:
     url: Optional[str] = None
     check_status: Optional[bool] = None
     keywords: Optional[List[str]] = None
+    # Compiled keywords, cached until the monitor configuration changes
+    keyword_matcher: Optional[Any] = field(default=None, compare=False, repr=False)
 
 
 class MonitorChecker:
@@ -93,9 +102,20 @@ class MonitorChecker:
         self.env_path = env_path or os.path.join(os.path.dirname(__file__), ".env")
 
         # Monitor storage
-        self.ping_monitors: List[Monitor] = []
-        self.website_monitors: List[Monitor] = []
-        self.monitor_next_checks: List[Dict] = []
+        self.registry = MonitorRegistry()
+        self.SCHEDULER_MAX_RATE = float(os.getenv("SCHEDULER_MAX_RATE", 0))
+        self.SCHEDULER_PHASE_SPREAD = os.getenv("SCHEDULER_PHASE_SPREAD", "true").lower() in ("1", "true", "yes")
+        self.STARTUP_RAMP_WINDOW = float(os.getenv("STARTUP_RAMP_WINDOW", 30))
+        self.scheduler = MonitorScheduler(self.registry.get, max_rate=self.SCHEDULER_MAX_RATE)
+        self.registry_sync_task: Optional[asyncio.Task] = None
+        # Last monitor_deletions id applied, None while deletions are not tracked
+        self.deletions_watermark: Optional[int] = None
+        self.checksum_checked_at = time.monotonic()
+        self.shard: Optional[ShardCoordinator] = None
+
+        # Authoritative last check time per monitor id (UTC), seeded once at
+        # startup and then updated from the results the checker produces
+        self.last_check_times: Dict[int, datetime] = {}
 
         # Performance tracking
         self.stats = {
@@ -103,14 +123,17 @@ class MonitorChecker:
             "successful_checks": 0,
             "failed_checks": 0,
             "avg_response_time": 0.0,
+            "dns_samples": 0,
+            "avg_dns_time": 0.0,
+            "website_checks": 0,
+            "website_bytes": 0,
+            "time_to_first_check": None,
         }
+        self.process_started = time.monotonic()
 
         # Connection management
-        self.http_session: Optional[aiohttp.ClientSession] = None
-        self.db_pool: Optional[pooling.MySQLConnectionPool] = None
-
-        # Thread pool for database operations
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+        self.http_client: Optional[HTTPBackend] = None
+        self.storage: Optional[StorageBackend] = None
 
         # Initialize
         # self._load_env()
@@ -119,14 +142,221 @@ class MonitorChecker:
         self.PING_TIMEOUT = float(os.getenv("PING_TIMEOUT", 2))
         self.WEBSITE_TIMEOUT = float(os.getenv("WEBSITE_TIMEOUT", 5))
         self.CONNECTION_POOL_SIZE = int(os.getenv("CONNECTION_POOL_SIZE", 100))
+        # aiohttp (HTTP/1.1) or httpx (HTTP/2 multiplexing, pip install "httpx[http2]")
+        self.HTTP_BACKEND = os.getenv("HTTP_BACKEND", "aiohttp")
+        # Idle time (s) of pooled connections, and reuse (warm) or fresh (cold) connections
+        self.HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 75))
+        self.WEBSITE_CONNECTIONS = os.getenv("WEBSITE_CONNECTIONS", "reuse").lower()
         self.PING_CONCURRENCY = int(os.getenv("PING_CONCURRENCY", 200))
+        # multiplexer (probe engine) or asyncio (open_connection per check)
+        self.PING_ENGINE = os.getenv("PING_ENGINE", "multiplexer")
+        # ICMP echo for ping monitors without a port (needs ping/raw socket permission)
+        self.PING_ICMP = os.getenv("PING_ICMP", "false").lower() in ("1", "true", "yes")
         self.WEBSITE_CONCURRENCY = int(os.getenv("WEBSITE_CONCURRENCY", 100))
+        self.WEBSITE_HOST_INITIAL_CONCURRENCY = int(os.getenv("WEBSITE_HOST_INITIAL_CONCURRENCY", 4))
+        self.WEBSITE_HOST_MIN_CONCURRENCY = int(os.getenv("WEBSITE_HOST_MIN_CONCURRENCY", 1))
+        self.WEBSITE_HOST_MAX_CONCURRENCY = int(os.getenv("WEBSITE_HOST_MAX_CONCURRENCY", 20))
+        self.WEBSITE_LATENCY_TOLERANCE = float(os.getenv("WEBSITE_LATENCY_TOLERANCE", 2.0))
+        self.WEBSITE_MAX_BODY_BYTES = int(os.getenv("WEBSITE_MAX_BODY_BYTES", 2 * 1024 * 1024))
+        self.WEBSITE_READ_CHUNK_SIZE = int(os.getenv("WEBSITE_READ_CHUNK_SIZE", 64 * 1024))
+        self.KEYWORD_MATCH_MODE = os.getenv("KEYWORD_MATCH_MODE", "exact")
+        # HEAD for monitors without keywords (GET again after the retry
+        # interval when a server rejected it) and conditional GETs for keywords
+        self.WEBSITE_HEAD_REQUESTS = os.getenv("WEBSITE_HEAD_REQUESTS", "true").lower() in ("1", "true", "yes")
+        self.WEBSITE_HEAD_RETRY_INTERVAL = float(os.getenv("WEBSITE_HEAD_RETRY_INTERVAL", 3600))
+        self.WEBSITE_CONDITIONAL_REQUESTS = os.getenv("WEBSITE_CONDITIONAL_REQUESTS", "true").lower() in ("1", "true", "yes")
+        # Store the phase breakdown in the optional monitor_logs columns
+        self.LOG_PHASE_TIMINGS = os.getenv("LOG_PHASE_TIMINGS", "true").lower() in ("1", "true", "yes")
+        # Success lines per monitor: sampled (0..1) and/or at most one per interval (s),
+        # failures and status changes are always logged
+        self.LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", 1.0))
+        self.LOG_SUCCESS_INTERVAL = float(os.getenv("LOG_SUCCESS_INTERVAL", 0))
+        self.LOG_WRITE_BATCH_SIZE = int(os.getenv("LOG_WRITE_BATCH_SIZE", 500))
+        self.LOG_WRITE_FLUSH_INTERVAL = float(os.getenv("LOG_WRITE_FLUSH_INTERVAL", 1))
+        self.LOG_WRITE_QUEUE_SIZE = int(os.getenv("LOG_WRITE_QUEUE_SIZE", 10000))
+
+        # Per-minute/per-hour aggregates of monitor_logs and retention (0 days = keep)
+        self.ROLLUPS_ENABLED = os.getenv("ROLLUPS_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.ROLLUP_GRACE = float(os.getenv("ROLLUP_GRACE", 30))
+        self.ROLLUP_CHECKPOINT_INTERVAL = float(os.getenv("ROLLUP_CHECKPOINT_INTERVAL", 300))
+        self.LOG_RETENTION_DAYS = float(os.getenv("LOG_RETENTION_DAYS", 0))
+        self.ROLLUP_MINUTE_RETENTION_DAYS = float(os.getenv("ROLLUP_MINUTE_RETENTION_DAYS", 14))
+        self.ROLLUP_HOUR_RETENTION_DAYS = float(os.getenv("ROLLUP_HOUR_RETENTION_DAYS", 0))
+        self.RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", 300))
+        self.RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", 5000))
+        # trigger (update_monitor_status on every log row) or checker (bulk
+        # UPDATE on status changes, must match the Laravel migration setting)
+        self.CHECKER_STATUS_UPDATES = os.getenv("CHECKER_STATUS_UPDATES", "trigger").lower()
+        self.STATUS_TRANSITIONS_ENABLED = os.getenv("STATUS_TRANSITIONS_ENABLED", "true").lower() in ("1", "true", "yes")
+        # Targets failing CIRCUIT_FAILURE_THRESHOLD checks in a row are checked in a lane
+        # of their own (website lane checks count against CONNECTION_POOL_SIZE). Their
+        # timeout is shortened (down to CIRCUIT_TIMEOUT_FACTOR) only when the lane could
+        # not check every open target once per period, full-timeout trials back off exponentially
+        self.CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 3))
+        self.CIRCUIT_TIMEOUT_FACTOR = float(os.getenv("CIRCUIT_TIMEOUT_FACTOR", 0.25))
+        self.CIRCUIT_TRIAL_INTERVAL = float(os.getenv("CIRCUIT_TRIAL_INTERVAL", 60))
+        self.CIRCUIT_MAX_TRIAL_INTERVAL = float(os.getenv("CIRCUIT_MAX_TRIAL_INTERVAL", 300))
+        self.CIRCUIT_LANE_CONCURRENCY = int(os.getenv("CIRCUIT_LANE_CONCURRENCY", 50))
+
+        self.DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", 300))
+        self.DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", 30))
+        self.DNS_MIN_TTL = float(os.getenv("DNS_MIN_TTL", 5))
+        self.DNS_MAX_TTL = float(os.getenv("DNS_MAX_TTL", 3600))
+
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+        self.METRICS_PORT = int(os.getenv("METRICS_PORT", 9102))
+        self.STATS_LOG_INTERVAL = float(os.getenv("STATS_LOG_INTERVAL", 60))
+
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+        # Open the DB/HTTP pools and resolve monitor hosts before the first checks
+        self.PREWARM_POOLS = os.getenv("PREWARM_POOLS", "true").lower() in ("1", "true", "yes")
+        self.REGISTRY_SYNC_INTERVAL = float(os.getenv("REGISTRY_SYNC_INTERVAL", 10))
+        # Deletions are read from monitor_deletions on every sync, the full
+        # count/sum comparison of the monitors table only runs this often
+        self.REGISTRY_CHECKSUM_INTERVAL = float(os.getenv("REGISTRY_CHECKSUM_INTERVAL", 3600))
+        self.STARTUP_FETCH_SIZE = int(os.getenv("STARTUP_FETCH_SIZE", 5000))
+        self.SHARD_ENABLED = os.getenv("SHARD_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.SHARD_WORKER_ID = os.getenv("SHARD_WORKER_ID") or None
+        self.SHARD_LEASE_TTL = float(os.getenv("SHARD_LEASE_TTL", 15))
+        self.SHARD_HEARTBEAT_INTERVAL = float(os.getenv("SHARD_HEARTBEAT_INTERVAL", 5))
+
+        self.CHANGE_FEED_SOURCES = [
+            name.strip()
+            for name in os.getenv("CHANGE_FEED_SOURCES", "").split(",")
+            if name.strip()
+        ]
+        self.CHANGE_FEED_SOCKET = os.getenv(
+            "CHANGE_FEED_SOCKET", "/tmp/monitor-checker.sock"
+        )
+        self.CHANGE_FEED_REDIS_URL = os.getenv(
+            "CHANGE_FEED_REDIS_URL", "redis://127.0.0.1:6379/0"
+        )
+        self.CHANGE_FEED_REDIS_CHANNEL = os.getenv(
+            "CHANGE_FEED_REDIS_CHANNEL", "monitor-updates"
+        )
+
+        # Push-based notification about created/updated monitors
+        self.change_feed = self._build_change_feed()
+        self.updates_task: Optional[asyncio.Task] = None
+
+        # Ping probe engines (open_connection is the fallback)
+        self.tcp_probes: Optional[TCPProbeEngine] = (
+            TCPProbeEngine() if self.PING_ENGINE == "multiplexer" else None
+        )
+        self.icmp_probes: Optional[ICMPProbeEngine] = None
+        if self.PING_ICMP:
+            icmp_probes = ICMPProbeEngine()
+            self.icmp_probes = icmp_probes if icmp_probes.available() else None
+
+        # Name resolution shared by ping checks and the HTTP connector
+        self.dns_cache = DNSCache(
+            ttl=self.DNS_CACHE_TTL,
+            negative_ttl=self.DNS_NEGATIVE_TTL,
+            min_ttl=self.DNS_MIN_TTL,
+            max_ttl=self.DNS_MAX_TTL,
+        )
+
+        # Per-host fair scheduling of website checks with adaptive limits
+        self.website_dispatcher = HostDispatcher(
+            self._website_host,
+            max_concurrency=self.WEBSITE_CONCURRENCY,
+            initial_limit=self.WEBSITE_HOST_INITIAL_CONCURRENCY,
+            min_limit=self.WEBSITE_HOST_MIN_CONCURRENCY,
+            max_limit=self.WEBSITE_HOST_MAX_CONCURRENCY,
+            latency_tolerance=self.WEBSITE_LATENCY_TOLERANCE,
+        )
+
+        # Targets with an open circuit are checked in a low-priority lane with
+        # its own concurrency, they never hold the slots of healthy checks
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if self.CIRCUIT_BREAKER_ENABLED:
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=self.CIRCUIT_FAILURE_THRESHOLD,
+                lane_concurrency=self.CIRCUIT_LANE_CONCURRENCY,
+                timeout_factor=self.CIRCUIT_TIMEOUT_FACTOR,
+                trial_interval=self.CIRCUIT_TRIAL_INTERVAL,
+                max_trial_interval=self.CIRCUIT_MAX_TRIAL_INTERVAL,
+            )
+        self.ping_lane = asyncio.Semaphore(self.CIRCUIT_LANE_CONCURRENCY)
+        self.ping_lane_in_flight = 0
+        # Hosts in the lane start as unreachable: all their due checks run at
+        # once, a round takes one timeout however many monitors share a host
+        self.website_lane_dispatcher = HostDispatcher(
+            self._website_host,
+            max_concurrency=self.CIRCUIT_LANE_CONCURRENCY,
+            initial_limit=self.WEBSITE_HOST_MIN_CONCURRENCY,
+            min_limit=self.WEBSITE_HOST_MIN_CONCURRENCY,
+            max_limit=self.WEBSITE_HOST_MAX_CONCURRENCY,
+            latency_tolerance=self.WEBSITE_LATENCY_TOLERANCE,
+            assume_unreachable=True,
+        )
 
-        print("PING CONCURRENCY:", self.PING_CONCURRENCY)
-        print("WEBSITE CONCURRENCY:", self.WEBSITE_CONCURRENCY)
-        print("CONNECTION POOL SIZE:", self.CONNECTION_POOL_SIZE)
-        print("PING TIMEOUT:", self.PING_TIMEOUT)
-        print("WEBSITE TIMEOUT:", self.WEBSITE_TIMEOUT)
+        # Check batches running next to the loop, the ping checks of every
+        # batch share PING_CONCURRENCY slots
+        self.background_batches: Set[asyncio.Task] = set()
+        self.ping_slots = asyncio.Semaphore(self.PING_CONCURRENCY)
+
+        self.request_strategy = RequestStrategy(
+            head_enabled=self.WEBSITE_HEAD_REQUESTS,
+            conditional_enabled=self.WEBSITE_CONDITIONAL_REQUESTS,
+            head_retry_interval=self.WEBSITE_HEAD_RETRY_INTERVAL,
+        )
+
+        self.check_log = CheckLogSampler(
+            sample_rate=self.LOG_SUCCESS_SAMPLE_RATE,
+            min_interval=self.LOG_SUCCESS_INTERVAL,
+        )
+
+        self.rollups: Optional[RollupWriter] = None
+        if self.ROLLUPS_ENABLED:
+            self.rollups = RollupWriter(
+                self._get_storage,
+                grace=self.ROLLUP_GRACE,
+                checkpoint_interval=self.ROLLUP_CHECKPOINT_INTERVAL,
+                owns=self._owns,
+            )
+        self.rollup_tasks: Set[asyncio.Task] = set()
+        self.retention_task: Optional[asyncio.Task] = None
+        self.retention_stats: Dict[str, int] = {}
+
+        # Last known status per monitor, monitors.status is only written on changes
+        self.status_tracker = StatusTracker(
+            self._get_storage,
+            write_status=self.CHECKER_STATUS_UPDATES == "checker",
+            record_transitions=self.STATUS_TRANSITIONS_ENABLED,
+        )
+
+        # Write-behind buffer for monitor_logs inserts
+        self.log_writer = MonitorLogWriter(
+            self._write_log_rows_async,
+            max_batch_size=self.LOG_WRITE_BATCH_SIZE,
+            flush_interval=self.LOG_WRITE_FLUSH_INTERVAL,
+            max_queue_size=self.LOG_WRITE_QUEUE_SIZE,
+        )
+
+        # Prometheus metrics (served on METRICS_HOST:METRICS_PORT)
+        self.metrics = self._build_metrics()
+        self.metrics_server: Optional[MetricsServer] = None
+        self.housekeeping_task: Optional[asyncio.Task] = None
+        self.prewarm_task: Optional[asyncio.Task] = None
+
+        logger.info(
+            f"Concurrency - Ping: {self.PING_CONCURRENCY}, Website: {self.WEBSITE_CONCURRENCY}, "
+            f"Website per host: {self.WEBSITE_HOST_MAX_CONCURRENCY}, "
+            f"Open-circuit lane: {self.CIRCUIT_LANE_CONCURRENCY if self.circuit_breaker else 'disabled'}, "
+            f"Connection pool: {self.CONNECTION_POOL_SIZE} ({self.HTTP_BACKEND}, {self.WEBSITE_CONNECTIONS}), "
+            f"Timeouts - Ping: {self.PING_TIMEOUT}s, Website: {self.WEBSITE_TIMEOUT}s"
+        )
+
+    @property
+    def ping_monitors(self) -> List[Monitor]:
+        return self.registry.by_type("ping")
+
+    @property
+    def website_monitors(self) -> List[Monitor]:
+        return self.registry.by_type("website")
 
     def _load_env(self) -> Dict[str, str]:
         """Load environment variables from .env file"""
@@ -151,191 +381,245 @@ class MonitorChecker:
     import os
 
 
-    def _connect_to_database(self) -> pooling.MySQLConnectionPool:
-        """Establish MySQL database connection pool using environment variables"""
-        required_keys = [
-            "DB_CONNECTION",
-            "DB_HOST",
-            "DB_PORT",
-            "DB_DATABASE",
-            "DB_USERNAME",
-            "DB_PASSWORD",
-        ]
-
-        # Check for missing environment variables
-        missing_keys = [key for key in required_keys if not os.getenv(key)]
-        if missing_keys:
-            raise ValueError(f"Missing DB configuration in environment: {missing_keys}")
-
-        if os.getenv("DB_CONNECTION") != "mysql":
-            raise ValueError(
-                f"Unsupported DB connection type: {os.getenv('DB_CONNECTION')}"
-            )
-
+    async def _connect_to_database(self) -> StorageBackend:
+        """Create and connect the storage backend selected in the environment"""
         try:
-            config = {
-                "user": os.getenv("DB_USERNAME"),
-                "password": os.getenv("DB_PASSWORD"),
-                "host": os.getenv("DB_HOST"),
-                "port": int(os.getenv("DB_PORT")),
-                "database": os.getenv("DB_DATABASE"),
-                "charset": "utf8mb4",
-                "autocommit": True,
-                "pool_name": "monitor_pool",
-                "pool_size": 10,
-                "pool_reset_session": True,
-            }
-
-            self.db_pool = pooling.MySQLConnectionPool(**config)
+            storage = create_backend(self.DB_POOL_SIZE)
+            await storage.connect()
+            self.storage = storage
             logger.info(
-                f"MySQL connection pool created: {config['host']}:{config['port']}/{config['database']}"
+                f"Storage backend connected: {storage.name} (pool size {storage.pool_size})"
             )
-            return self.db_pool
+            return self.storage
         except Exception as e:
-            logger.error(f"Failed to create MySQL connection pool: {e}")
+            logger.error(f"Failed to connect storage backend: {e}")
             raise
 
-    async def _get_http_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session with connection pooling"""
-        if self.http_session is None or self.http_session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.WEBSITE_TIMEOUT)
-            connector = aiohttp.TCPConnector(
-                limit=self.CONNECTION_POOL_SIZE,
-                limit_per_host=20,
-                ttl_dns_cache=300,
-                use_dns_cache=True,
-            )
-            self.http_session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=connector,
-                headers={"User-Agent": "MonitorChecker/2.0 (Python)"},
+    async def _get_storage(self) -> StorageBackend:
+        """Get or create the storage backend"""
+        if self.storage is None:
+            await self._connect_to_database()
+        return self.storage
+
+    async def _get_http_client(self) -> HTTPBackend:
+        """Get or create the HTTP client backend and its connection pool"""
+        if self.http_client is None:
+            self.http_client = create_http_backend(
+                self.HTTP_BACKEND,
+                ClientOptions(
+                    timeout=self.WEBSITE_TIMEOUT,
+                    limit=self.CONNECTION_POOL_SIZE,
+                    limit_per_origin=self.WEBSITE_HOST_MAX_CONCURRENCY,
+                    keepalive_timeout=self.HTTP_KEEPALIVE_TIMEOUT,
+                    connections=self.WEBSITE_CONNECTIONS,
+                ),
+                resolver=CachingResolver(self.dns_cache),
             )
-        return self.http_session
-
-    async def _load_monitors(self, monitor_type: str) -> List[Monitor]:
-        """Load monitors from database with proper type conversion"""
-
-        def _load_monitors_sync():
-            if not self.db_pool:
-                self._connect_to_database()
-
-            conn = self.db_pool.get_connection()
+        await self.http_client.start()
+        return self.http_client
+
+    async def _query_monitors(
+        self, where: str = "1 = 1", params: Tuple = ()
+    ) -> Tuple[List[Monitor], Optional[datetime]]:
+        """Load monitors matching a WHERE clause, returns them with their max updated_at"""
+        storage = await self._get_storage()
+        rows = await storage.fetch_all(f"SELECT * FROM monitors WHERE {where}", params)
+
+        updated_at = [row["updated_at"] for row in rows if row.get("updated_at")]
+        watermark = max(updated_at) if updated_at else None
+        return [self._monitor_from_row(row) for row in rows], watermark
+
+    @staticmethod
+    def _monitor_from_row(row: Dict[str, Any]) -> Monitor:
+        """Convert a monitors table row into a Monitor"""
+        # Parse keywords if present
+        keywords = None
+        if row.get("keywords"):
             try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(
-                    "SELECT * FROM monitors WHERE monitor_type = %s", (monitor_type,)
-                )
-                rows = cursor.fetchall()
-                return rows
-            finally:
-                cursor.close()
-                conn.close()
-
-        rows = await asyncio.get_event_loop().run_in_executor(
-            self.executor, _load_monitors_sync
-        )
-
-        monitors = []
-        for row in rows:
-            # Parse keywords if present
-            keywords = None
-            if row.get("keywords"):
-                try:
-                    keywords = json.loads(row["keywords"])
-                    if not isinstance(keywords, list):
-                        keywords = None
-                except json.JSONDecodeError:
+                keywords = json.loads(row["keywords"])
+                if not isinstance(keywords, list):
                     keywords = None
+            except json.JSONDecodeError:
+                keywords = None
 
-            monitor = Monitor(
-                id=row["id"],
-                label=row["label"],
-                monitor_type=row["monitor_type"],
-                periodicity=row.get("periodicity", 300),
-                hostname=row.get("hostname"),
-                port=row.get("port"),
-                url=row.get("url"),
-                check_status=bool(row.get("check_status", False)),
-                keywords=keywords,
-            )
-            monitors.append(monitor)
-
-        return monitors
-
-    async def _has_log(self, monitor: Monitor) -> bool:
-        """Check if monitor has existing logs"""
-
-        def _has_log_sync():
-            if not self.db_pool:
-                self._connect_to_database()
-
-            conn = self.db_pool.get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT COUNT(*) FROM monitor_logs WHERE monitor_id = %s",
-                    (monitor.id,),
-                )
-                result = cursor.fetchone()
-                return result[0] > 0
-            finally:
-                cursor.close()
-                conn.close()
-
-        return await asyncio.get_event_loop().run_in_executor(
-            self.executor, _has_log_sync
+        return Monitor(
+            id=row["id"],
+            label=row["label"],
+            monitor_type=row["monitor_type"],
+            periodicity=row.get("periodicity", 300),
+            hostname=row.get("hostname"),
+            port=row.get("port"),
+            url=row.get("url"),
+            check_status=bool(row.get("check_status", False)),
+            keywords=keywords,
         )
 
     async def _run_single_ping_check(self, monitor: Monitor) -> MonitorResult:
-        """Enhanced single ping check with async socket operations"""
+        """Enhanced single ping check with async socket operations
+
+        The host is resolved through the shared DNS cache first, so
+        response_time is the TCP connect time only and the lookup is
+        reported separately as dns_time.
+        """
         host = monitor.hostname
         port = monitor.port
-        timeout = self.PING_TIMEOUT
+        timeout = self._check_timeout(monitor, self.PING_TIMEOUT)
 
-        start_time = time.time()
+        started_at = datetime.now(UTC)
+        start_time = time.monotonic()
+        connect_start = start_time
+        dns_time = None
         try:
-            # Use asyncio for non-blocking socket operations
-            future = asyncio.open_connection(host, port)
-            reader, writer = await asyncio.wait_for(future, timeout=timeout)
-            writer.close()
-            await writer.wait_closed()
-
-            response_time = round((time.time() - start_time) * 1000)
-            logger.info(f"Ping monitor {monitor.id} - {monitor.hostname}:{monitor.port} - Connection success -> status:succeeded")
+            addresses = await asyncio.wait_for(self.dns_cache.resolve(host), timeout=timeout)
+            connect_start = time.monotonic()
+            dns_time = round((connect_start - start_time) * 1000)
+
+            remaining = max(0.0, timeout - (connect_start - start_time))
+            if self.tcp_probes is not None:
+                # Multiplexed probe, no stream objects and no FIN exchange
+                await self._probe_any(addresses, port, remaining)
+            else:
+                # Use asyncio for non-blocking socket operations
+                future = self._open_connection_any(addresses, port)
+                reader, writer = await asyncio.wait_for(future, timeout=remaining)
+                writer.close()
+                await writer.wait_closed()
+
+            response_time = round((time.monotonic() - connect_start) * 1000)
             return MonitorResult(
-                success=True, status="succeeded", response_time=response_time
+                success=True,
+                status="succeeded",
+                response_time=response_time,
+                started_at=started_at,
+                dns_time=dns_time,
+                connect_time=response_time,
             )
         except asyncio.TimeoutError:
-            response_time = round((time.time() - start_time) * 1000)
-            logger.warning(f"Ping monitor {monitor.id} - {monitor.hostname}:{monitor.port} - Connection timeout -> status:failed")
+            response_time = round((time.monotonic() - connect_start) * 1000)
             return MonitorResult(
                 success=False,
                 status="failed",
                 response_time=response_time,
-                error="Connection timeout",
+                error=self._timeout_error(
+                    "Connection timeout" if dns_time is not None else "DNS timeout",
+                    timeout,
+                    self.PING_TIMEOUT,
+                ),
+                started_at=started_at,
+                dns_time=dns_time,
             )
         except Exception as e:
-            response_time = round((time.time() - start_time) * 1000)
-            logger.warning(f"Ping monitor {monitor.id} - {monitor.hostname}:{monitor.port} - Connection error -> status:failed")
+            response_time = round((time.monotonic() - connect_start) * 1000)
             return MonitorResult(
                 success=False,
                 status="failed",
                 response_time=response_time,
                 error=str(e),
+                started_at=started_at,
+                dns_time=dns_time,
             )
 
+    async def _probe_any(self, addresses: List[Tuple[int, str]], port: Optional[int], timeout: float):
+        """Probe the resolved addresses with the probe engines, raises like open_connection
+
+        Monitors without a port get an ICMP echo when PING_ICMP is enabled
+        and permitted, everything else a TCP connect probe.
+        """
+        deadline = time.monotonic() + timeout
+        last_error = "No addresses to probe"
+        for family, address in addresses:
+            remaining = max(0.0, deadline - time.monotonic())
+            if not port and family == socket.AF_INET and self.icmp_probes is not None:
+                result = await self.icmp_probes.probe(address, remaining)
+            else:
+                try:
+                    result = await self.tcp_probes.probe(address, port, family, remaining)
+                except NotImplementedError:
+                    # Event loop without add_writer (e.g. Windows proactor)
+                    logger.warning("Probe engine not supported by this event loop, using open_connection")
+                    self.tcp_probes = None
+                    future = self._open_connection_any(addresses, port)
+                    reader, writer = await asyncio.wait_for(future, timeout=remaining)
+                    writer.close()
+                    await writer.wait_closed()
+                    return
+            if result.success:
+                return
+            if result.error == "timeout":
+                raise asyncio.TimeoutError()
+            last_error = result.error
+        raise OSError(last_error)
+
+    @staticmethod
+    async def _open_connection_any(addresses: List[Tuple[int, str]], port: int):
+        """Connect to the first reachable resolved address (like open_connection does)"""
+        last_error: Optional[OSError] = None
+        for _, address in addresses:
+            try:
+                return await asyncio.open_connection(address, port)
+            except OSError as e:
+                last_error = e
+        raise last_error or OSError(f"No addresses to connect to on port {port}")
+
     async def _run_single_website_check(self, monitor: Monitor) -> MonitorResult:
-        """Enhanced single website check with aiohttp"""
-        session = await self._get_http_session()
+        """Website check with the cheapest request that answers it
+
+        Monitors without keywords use HEAD. A failing HEAD answer is checked
+        again with GET, which is used from then on when the server rejected
+        HEAD or answered GET differently.
+        """
+        client = await self._get_http_client()
+        started_at = datetime.now(UTC)
+        timeout = self._check_timeout(monitor, self.WEBSITE_TIMEOUT)
+        strategy = self.request_strategy
+        method = strategy.method(monitor)
+        result = await self._website_request(client, monitor, method, started_at, timeout)
+        if method != "HEAD" or result.http_code is None:
+            return result
+
+        if result.success:
+            strategy.head_confirmed(monitor, None)
+        elif strategy.needs_confirmation(monitor, result.http_code):
+            head = result
+            result = await self._website_request(client, monitor, "GET", started_at, timeout)
+            if head.http_code in HEAD_REJECTED or result.success:
+                strategy.head_rejected(monitor)
+            else:
+                strategy.head_confirmed(monitor, head.http_code)
+            result.bytes_received += head.bytes_received
+        return result
+
+    async def _website_request(
+        self,
+        client: HTTPBackend,
+        monitor: Monitor,
+        method: str,
+        started_at: datetime,
+        timeout: Optional[float] = None,
+    ) -> MonitorResult:
+        """One request of a website check
+
+        response_time is the time until the response headers without name
+        resolution, the phases (dns, connect, tls, ttfb, body) are reported
+        separately. timeout overrides WEBSITE_TIMEOUT (open circuits).
+        """
         url = monitor.url
         check_status = monitor.check_status
         keywords = monitor.keywords or []
+        conditional_headers = (
+            self.request_strategy.conditional_headers(monitor) if method == "GET" else None
+        )
+        request = method.lower()
+        response = None
 
-        start_time = time.time()
+        # Filled by the trace hooks of the session and the TLS context
+        timings = PhaseTimings()
+        token = current_timings.set(timings)
         try:
-            async with session.get(url, ssl=False) as response:
-                response_time = round((time.time() - start_time) * 1000)
-                content = await response.text()
+            request_timeout = timeout if timeout is not None and timeout < self.WEBSITE_TIMEOUT else None
+            async with client.request(method, url, conditional_headers, timings, request_timeout) as response:
+                timings.mark_headers()
+                response_time = timings.response_time()
                 http_code = response.status
 
                 success = True
@@ -343,413 +627,1132 @@ class MonitorChecker:
                 error_message = None
                 missing_keywords = []
 
-                # Check status code
-                if check_status and not (200 <= http_code < 300):
+                cached_verdict = None
+                if http_code == 304 and conditional_headers:
+                    cached_verdict = self.request_strategy.cached_verdict(monitor)
+
+                if cached_verdict is not None:
+                    # Not modified since the response the verdict was taken from
+                    request = "not_modified"
+                    missing_keywords = cached_verdict
+                elif check_status and not (200 <= http_code < 300):
                     success = False
                     status = "failed"
                     error_message = (
                         f"HTTP status code {http_code} not in range [200, 300)"
                     )
+                # Check keywords, the body is only read (streamed, up to
+                # WEBSITE_MAX_BODY_BYTES) when there are keywords to look for
+                elif keywords:
+                    matcher = get_keyword_matcher(monitor, self.KEYWORD_MATCH_MODE)
+                    body_start = time.monotonic()
+                    missing_keywords, _ = await read_missing_keywords(
+                        response,
+                        keywords,
+                        self.WEBSITE_MAX_BODY_BYTES,
+                        self.WEBSITE_READ_CHUNK_SIZE,
+                        matcher.scanner(),
+                    )
+                    timings.body = time.monotonic() - body_start
+                    if 200 <= http_code < 300:
+                        self.request_strategy.remember(monitor, response, missing_keywords)
 
-                # Check keywords
-                if success and keywords:
-                    for keyword in keywords:
-                        if keyword and keyword not in content:
-                            missing_keywords.append(keyword)
-
-                    if missing_keywords:
-                        success = False
-                        status = "failed"
-                        error_message = (
-                            f'Missing keywords: {", ".join(missing_keywords)}'
-                        )
-                logger.info(f"Website monitor {monitor.id} - {monitor.url} - Connection success -> status:succeeded")
+                if missing_keywords:
+                    success = False
+                    status = "failed"
+                    error_message = (
+                        f'Missing keywords: {", ".join(missing_keywords)}'
+                    )
 
-                return MonitorResult(
+                return self._website_result(
+                    timings,
                     success=success,
                     status=status,
                     response_time=response_time,
                     http_code=http_code,
                     error=error_message,
                     missing_keywords=missing_keywords,
+                    started_at=started_at,
+                    request=request,
+                    bytes_received=response_bytes(response),
                 )
 
         except asyncio.TimeoutError:
-            response_time = round((time.time() - start_time) * 1000)
-            logger.warning(f"Website monitor {monitor.id} - {monitor.url} - Connection timeout -> status:failed")
-            return MonitorResult(
+            return self._website_result(
+                timings,
                 success=False,
                 status="failed",
-                response_time=response_time,
-                error="Request timeout",
+                response_time=timings.response_time(),
+                error=self._timeout_error("Request timeout", timeout, self.WEBSITE_TIMEOUT),
+                started_at=started_at,
+                request=request,
+                bytes_received=response_bytes(response) if response is not None else 0,
             )
         except Exception as e:
-            logger.warning(f"Website monitor {monitor.id} - {monitor.url} - Connection error -> status:failed")
-            response_time = round((time.time() - start_time) * 1000)
-            return MonitorResult(
+            return self._website_result(
+                timings,
                 success=False,
                 status="failed",
-                response_time=response_time,
+                response_time=timings.response_time(),
                 error=str(e),
+                started_at=started_at,
+                request=request,
+                bytes_received=response_bytes(response) if response is not None else 0,
             )
+        finally:
+            current_timings.reset(token)
+
+    @staticmethod
+    def _website_result(timings: PhaseTimings, **fields) -> MonitorResult:
+        """MonitorResult with the phase breakdown of a website check"""
+        phases = timings.phases()
+        return MonitorResult(
+            **fields,
+            dns_time=phases["dns"],
+            connect_time=phases["connect"],
+            tls_time=phases["tls"],
+            ttfb_time=phases["ttfb"],
+            body_time=phases["body"],
+        )
 
-    async def run_batch_ping_checks(
-        self, monitors: List[Monitor]
-    ) -> List[Tuple[Monitor, MonitorResult]]:
-        """Run ping checks concurrently with semaphore for connection limiting"""
-        semaphore = asyncio.Semaphore(self.PING_CONCURRENCY)
-
-        async def check_with_semaphore(monitor):
-            async with semaphore:
-                result = await self._run_single_ping_check(monitor)
-                return (monitor, result)
-
-        tasks = [check_with_semaphore(monitor) for monitor in monitors]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Filter out exceptions and log them
-        valid_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Ping check failed with exception: {result}")
-            else:
-                valid_results.append(result)
-                # Save to database asynchronously
-                monitor, check_result = result
-                await self._save_result_async(monitor, check_result)
+    async def _check_and_record(
+        self,
+        monitor: Monitor,
+        check: Callable[[Monitor], Awaitable[MonitorResult]],
+        on_result: Optional[Callable[[Monitor, Optional[MonitorResult]], None]] = None,
+    ) -> Optional[MonitorResult]:
+        """Run one check, then save, count and hand over its result right away
 
-        return valid_results
+        on_result gets None when the check raised an exception.
+        """
+        try:
+            result = await check(monitor)
+        except Exception as e:
+            logger.error(
+                f"{monitor.monitor_type.capitalize()} check failed with exception: {e}"
+            )
+            result = None
 
-    async def run_batch_website_checks(
-        self, monitors: List[Monitor]
-    ) -> List[Tuple[Monitor, MonitorResult]]:
-        """Run website checks concurrently with proper connection pooling"""
-        semaphore = asyncio.Semaphore(self.WEBSITE_CONCURRENCY)
+        if result is not None:
+            if self.circuit_breaker:
+                # Any answer (even an HTTP error) means the target is reachable
+                self.circuit_breaker.record(
+                    self._circuit_target(monitor), result.success or result.http_code is not None
+                )
+            self._log_check(monitor, result)
+            await self._save_result_async(monitor, result)
+            self._update_stats([(monitor, result)])
 
-        async def check_with_semaphore(monitor):
-            async with semaphore:
-                result = await self._run_single_website_check(monitor)
-                return (monitor, result)
+        if on_result:
+            on_result(monitor, result)
+        return result
 
-        tasks = [check_with_semaphore(monitor) for monitor in monitors]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    def _log_check(self, monitor: Monitor, result: MonitorResult):
+        """Log a check result (status changes and failures always, successes sampled)"""
+        emit, previous = self.check_log.should_log(monitor.id, result.success)
+        if not emit:
+            return
 
-        # Filter out exceptions and log them
-        valid_results = []
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Website check failed with exception: {result}")
-            else:
-                valid_results.append(result)
-                # Save to database asynchronously
-                monitor, check_result = result
-                await self._save_result_async(monitor, check_result)
+        if monitor.monitor_type == "ping":
+            target = f"{monitor.hostname}:{monitor.port}"
+        else:
+            target = monitor.url
+        if result.success:
+            detail = "Connection success"
+        else:
+            detail = result.error or "Connection error"
+        change = ""
+        if previous is not None:
+            change = " (recovered)" if result.success else " (went down)"
+
+        # %-style arguments, the message is built on the log writer thread
+        logger.log(
+            logging.INFO if result.success else logging.WARNING,
+            "%s monitor %s - %s - %s (dns %sms, response %sms)%s -> status:%s",
+            monitor.monitor_type.capitalize(),
+            monitor.id,
+            target,
+            detail,
+            "-" if result.dns_time is None else result.dns_time,
+            result.response_time,
+            change,
+            result.status,
+            extra={
+                "monitor_id": monitor.id,
+                "monitor_type": monitor.monitor_type,
+                "target": target,
+                "status": result.status,
+                "previous_status": None if previous is None else ("succeeded" if previous else "failed"),
+                "response_time_ms": result.response_time,
+                "dns_time_ms": result.dns_time,
+                "http_code": result.http_code,
+                "bytes_received": result.bytes_received,
+                "error": result.error,
+            },
+        )
 
-        return valid_results
+    async def _run_check_stream(
+        self,
+        monitors: List[Monitor],
+        check: Callable[[Monitor], Awaitable[MonitorResult]],
+        concurrency: int,
+        on_result: Optional[Callable[[Monitor, Optional[MonitorResult]], None]] = None,
+    ) -> int:
+        """Run checks with a fixed pool of workers, handling each result as soon as it completes
+
+        Every finished check is saved, counted and passed to on_result
+        immediately, so a slow target never delays the rest of the batch and
+        at most `concurrency` checks are in memory at once.
+        """
+        pending = iter(monitors)
+        processed = 0
+
+        async def worker():
+            nonlocal processed
+            for monitor in pending:
+                if await self._check_and_record(monitor, check, on_result) is not None:
+                    processed += 1
+
+        workers = [worker() for _ in range(min(concurrency, len(monitors)))]
+        await asyncio.gather(*workers)
+        return processed
 
-    async def _save_result_async(self, monitor: Monitor, result: MonitorResult):
-        """Save result to database asynchronously (using UTC)"""
+    async def run_batch_ping_checks(
+        self,
+        monitors: List[Monitor],
+        on_result: Optional[Callable[[Monitor, Optional[MonitorResult]], None]] = None,
+    ) -> int:
+        """Run ping checks concurrently, streaming results, returns the number of completed checks
+
+        Targets with an open circuit are checked in the low-priority lane
+        (CIRCUIT_LANE_CONCURRENCY shared by all batches) next to the others.
+        """
+        monitors, open_circuits = self._split_open_circuits(monitors)
+        streams = [
+            self._run_check_stream(
+                monitors, self._run_pooled_ping_check, self.PING_CONCURRENCY, on_result
+            )
+        ]
+        if open_circuits:
+            streams.append(
+                self._run_check_stream(
+                    open_circuits, self._run_lane_ping_check, self.CIRCUIT_LANE_CONCURRENCY, on_result
+                )
+            )
+        return sum(await asyncio.gather(*streams))
 
-        def _save_result_sync():
-            if not self.db_pool:
-                self._connect_to_database()
+    async def _run_pooled_ping_check(self, monitor: Monitor) -> MonitorResult:
+        """Ping check bounded by the slots shared by all running batches"""
+        async with self.ping_slots:
+            return await self._run_single_ping_check(monitor)
 
-            conn = self.db_pool.get_connection()
+    async def _run_lane_ping_check(self, monitor: Monitor) -> MonitorResult:
+        """Ping check of a target with an open circuit, bounded by the lane"""
+        async with self.ping_lane:
+            self.ping_lane_in_flight += 1
             try:
-                cursor = conn.cursor()
-                utc_now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
-                cursor.execute(
-                    """
-                    INSERT INTO monitor_logs 
-                    (monitor_id, started_at, status, response_time_ms, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        monitor.id,
-                        utc_now,
-                        result.status,
-                        result.response_time,
-                        utc_now,
-                        utc_now,
-                    ),
-                )
+                return await self._run_single_ping_check(monitor)
             finally:
-                cursor.close()
-                conn.close()
+                self.ping_lane_in_flight -= 1
+
+    async def run_batch_website_checks(
+        self,
+        monitors: List[Monitor],
+        on_result: Optional[Callable[[Monitor, Optional[MonitorResult]], None]] = None,
+    ) -> int:
+        """Run website checks with per-host fairness, returns the number of completed checks
+
+        Targets with an open circuit go through the lane's own dispatcher.
+        """
+        processed = 0
+
+        async def handle(monitor: Monitor) -> Optional[MonitorResult]:
+            nonlocal processed
+            result = await self._check_and_record(
+                monitor, self._run_single_website_check, on_result
+            )
+            if result is not None:
+                processed += 1
+            return result
+
+        monitors, open_circuits = self._split_open_circuits(monitors)
+        await asyncio.gather(
+            self.website_dispatcher.run(monitors, handle, self._website_check_outcome),
+            self.website_lane_dispatcher.run(open_circuits, handle, self._website_check_outcome),
+        )
+        return processed
+
+    def _circuit_target(self, monitor: Monitor) -> str:
+        """Circuit breaker key: host:port of ping monitors, the URL's host of websites"""
+        if monitor.monitor_type == "website":
+            return self._website_host(monitor)
+        if monitor.port:
+            return f"{monitor.hostname}:{monitor.port}"
+        return monitor.hostname or ""
+
+    def _split_open_circuits(self, monitors: List[Monitor]) -> Tuple[List[Monitor], List[Monitor]]:
+        """(monitors of healthy targets, monitors of targets with an open circuit)"""
+        if not self.circuit_breaker:
+            return monitors, []
+        healthy = []
+        open_circuits = []
+        for monitor in monitors:
+            if self.circuit_breaker.is_open(self._circuit_target(monitor)):
+                open_circuits.append(monitor)
+            else:
+                healthy.append(monitor)
+        return healthy, open_circuits
+
+    def _check_timeout(self, monitor: Monitor, timeout: float) -> float:
+        """Timeout of a check, shortened while the target's circuit is open"""
+        if not self.circuit_breaker:
+            return timeout
+        return self.circuit_breaker.timeout(self._circuit_target(monitor), timeout, monitor.periodicity)
+
+    @staticmethod
+    def _timeout_error(error: str, timeout: Optional[float], full_timeout: float) -> str:
+        """Timeout message, noting a shortened timeout"""
+        if timeout is not None and timeout < full_timeout:
+            return f"{error} ({timeout:g}s, circuit open)"
+        return error
+
+    @staticmethod
+    def _website_host(monitor: Monitor) -> str:
+        """Dispatcher key of a website monitor (the URL's host)"""
+        try:
+            return urlsplit(monitor.url).hostname or monitor.url or ""
+        except ValueError:
+            return monitor.url or ""
+
+    @staticmethod
+    def _website_check_outcome(
+        result: Optional[MonitorResult],
+    ) -> Tuple[Optional[float], bool]:
+        """Feedback for the host's adaptive limit: (latency ms, overloaded)
+
+        Only answers of a live server count, checks without an HTTP answer
+        (timeout, refused connection, DNS error) report no latency.
+        """
+        if result is None or result.http_code is None:
+            return None, False
+        return result.response_time, result.http_code in (429, 503)
 
-        await asyncio.get_event_loop().run_in_executor(self.executor, _save_result_sync)
+    async def _save_result_async(self, monitor: Monitor, result: MonitorResult):
+        """Queue result for the batched monitor_logs writer (using UTC)"""
+        started_at = result.started_at or datetime.now(UTC)
+        self.last_check_times[monitor.id] = started_at
 
-    async def _calculate_next_check_time(self, monitor: Monitor) -> datetime:
-        """Calculate next check time based on last check and periodicity (UTC)"""
+        if self.stats["time_to_first_check"] is None:
+            self.stats["time_to_first_check"] = time.monotonic() - self.process_started
+            logger.info(
+                f"Time to first check: {self.stats['time_to_first_check']:.2f}s"
+            )
 
-        def _calculate_next_check_time_sync():
-            if not self.db_pool:
-                self._connect_to_database()
+        utc_now = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")
+        row = (
+            monitor.id,
+            started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            result.status,
+            result.response_time,
+            utc_now,
+            utc_now,
+        )
+        if self.LOG_PHASE_TIMINGS:
+            row += (
+                result.dns_time,
+                result.connect_time,
+                result.tls_time,
+                result.ttfb_time,
+                result.body_time,
+            )
+        await self.log_writer.put(row)
+
+    async def _write_log_rows_async(self, rows: List[Tuple]):
+        """Insert a batch of monitor_logs rows with a single multi-row INSERT"""
+        storage = await self._get_storage()
+        if self.LOG_PHASE_TIMINGS:
+            await storage.execute_many(
+                """
+                INSERT INTO monitor_logs
+                (monitor_id, started_at, status, response_time_ms, created_at, updated_at,
+                 dns_time_ms, connect_time_ms, tls_time_ms, ttfb_ms, body_time_ms)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """,
+                rows,
+            )
+        else:
+            await storage.execute_many(
+                """
+                INSERT INTO monitor_logs 
+                (monitor_id, started_at, status, response_time_ms, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+                rows,
+            )
 
-            conn = self.db_pool.get_connection()
+        if self.status_tracker.active:
+            # Same as the rollups, the rows are stored and must not be retried
+            # for this, pending status writes are retried with the next batch
+            self.status_tracker.add_log_rows(rows)
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT started_at FROM monitor_logs WHERE monitor_id = %s ORDER BY started_at DESC LIMIT 1",
-                    (monitor.id,),
-                )
-                result = cursor.fetchone()
-                return result[0] if result else None
-            finally:
-                cursor.close()
-                conn.close()
+                await self.status_tracker.flush()
+            except Exception as e:
+                logger.error(f"Failed to write monitor status changes: {e}")
+
+        if self.rollups:
+            # The raw rows are stored, a failing rollup write must not make
+            # the log writer insert them again (buckets are retried later)
+            self.rollups.add_log_rows(rows)
+            try:
+                await self.rollups.flush()
+            except Exception as e:
+                logger.error(f"Failed to write monitor log rollups: {e}")
+
+    @staticmethod
+    def _to_utc(value: Any) -> datetime:
+        """Convert a DB timestamp (naive UTC datetime or string) to an aware UTC datetime"""
+        if not isinstance(value, datetime):
+            value = datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value
+
+    async def _load_monitors_with_last_checks(self) -> int:
+        """Fast start: load all monitors and their latest started_at in one streamed query
+
+        Rows are read with a server-side cursor in chunks and decoded straight
+        into Monitor objects, so the full result set is never held in memory
+        as dicts. Returns the number of loaded monitors.
+        """
+        storage = await self._get_storage()
 
-        last_check = await asyncio.get_event_loop().run_in_executor(
-            self.executor, _calculate_next_check_time_sync
+        monitors = []
+        watermark = None
+        async for rows in storage.stream(
+            """
+            SELECT m.*, l.last_started_at
+            FROM monitors m
+            LEFT JOIN (
+                SELECT monitor_id, MAX(started_at) AS last_started_at
+                FROM monitor_logs
+                GROUP BY monitor_id
+            ) l ON l.monitor_id = m.id
+        """,
+            chunk_size=self.STARTUP_FETCH_SIZE,
+        ):
+            for row in rows:
+                monitors.append(self._monitor_from_row(row))
+                self.status_tracker.seed(row["id"], row.get("status"))
+                if row["last_started_at"] is not None:
+                    last_check = self._to_utc(row["last_started_at"])
+                    # Never overwrite a newer in-memory value with the loaded one
+                    current = self.last_check_times.get(row["id"])
+                    if current is None or current < last_check:
+                        self.last_check_times[row["id"]] = last_check
+                updated_at = row.get("updated_at")
+                if updated_at and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+
+        self.registry.upsert(monitors, watermark)
+        return len(monitors)
+
+    def _calculate_next_check_time(self, monitor: Monitor, spread: bool = False) -> float:
+        """Calculate next check time (epoch seconds) based on last check and periodicity
+
+        With SCHEDULER_PHASE_SPREAD the time is snapped to the monitor's own
+        phase slot, so monitors sharing a periodicity do not run in lockstep.
+        spread=True (startup, shard takeover) moves checks that are already
+        due into the STARTUP_RAMP_WINDOW instead of running them all at once.
+        """
+        last_check = self.last_check_times.get(monitor.id)
+        return next_check_time(
+            monitor.id,
+            monitor.periodicity,
+            last_check.timestamp() if last_check else None,
+            time.time(),
+            phase_spread=self.SCHEDULER_PHASE_SPREAD,
+            ramp_window=self.STARTUP_RAMP_WINDOW if spread else 0,
         )
 
-        if last_check:
-            if isinstance(last_check, datetime):
-                return last_check + timedelta(seconds=monitor.periodicity)
-            else:
-                last_check_dt = datetime.strptime(str(last_check), "%Y-%m-%d %H:%M:%S")
-                return last_check_dt + timedelta(seconds=monitor.periodicity)
-        else:
-            return datetime.now(UTC)
-
     async def initialize_monitors(self):
         """Initialize all monitors with enhanced batch processing"""
-        if not self.db_pool:
-            self._connect_to_database()
+        await self._get_storage()
 
         start_time = time.time()
         logger.info("=== Monitor initialization started ===")
+        self.log_writer.start()
+
+        # Join the shard before scheduling so only owned monitors are scheduled
+        if self.SHARD_ENABLED:
+            self.shard = ShardCoordinator(
+                self.storage,
+                worker_id=self.SHARD_WORKER_ID,
+                lease_ttl=self.SHARD_LEASE_TTL,
+                heartbeat_interval=self.SHARD_HEARTBEAT_INTERVAL,
+                on_rebalance=self._rebalance_shard,
+            )
+            await self.shard.start()
+            logger.info(
+                f"Shard worker {self.shard.worker_id} joined ({len(self.shard.workers)} workers)"
+            )
+
+        # Position in the deletion log before loading, deletions during the
+        # load are applied by the first sync
+        try:
+            self.deletions_watermark = await self._load_deletions_watermark()
+        except Exception as e:
+            logger.error(
+                f"Deletion tracking disabled, comparing the monitors checksum on every sync "
+                f"(failed to read monitor_deletions): {e}"
+            )
+
+        # Load monitors and their last check times (the only read of monitor_logs)
+        await self._load_monitors_with_last_checks()
+
+        if self.rollups:
+            # Continue the rollup buckets that were open when the checker stopped
+            try:
+                if self.shard and len(self.shard.workers) > 1:
+                    # Read the tables now, the owned buckets are merged once
+                    # the other workers wrote the ones they hand off
+                    await self.rollups.restore(lambda monitor_id: False)
+                    self._start_rollup_rebalance([m.id for m in self.registry if self._owns(m.id)])
+                else:
+                    restored = await self.rollups.restore(self._owns)
+                    logger.info(f"Restored {restored} open rollup buckets")
+            except Exception as e:
+                logger.error(f"Monitor log rollups disabled, failed to read the rollup tables: {e}")
+                self.rollups = None
 
-        # Load monitors from database
-        self.ping_monitors = await self._load_monitors("ping")
-        self.website_monitors = await self._load_monitors("website")
+        if self.status_tracker.record_transitions:
+            try:
+                await self.storage.fetch_all("SELECT id FROM monitor_status_transitions LIMIT 1")
+            except Exception as e:
+                logger.error(f"Status transitions disabled, failed to read monitor_status_transitions: {e}")
+                self.status_tracker.record_transitions = False
+
+        if self.LOG_PHASE_TIMINGS:
+            try:
+                await self.storage.fetch_all(
+                    "SELECT dns_time_ms, connect_time_ms, tls_time_ms, ttfb_ms, body_time_ms "
+                    "FROM monitor_logs LIMIT 1"
+                )
+            except Exception as e:
+                logger.error(f"Phase timings disabled, failed to read the monitor_logs timing columns: {e}")
+                self.LOG_PHASE_TIMINGS = False
 
         logger.info(
             f"Loaded {len(self.ping_monitors)} ping monitors and {len(self.website_monitors)} website monitors"
         )
 
-        # Find monitors that need initial checks
-        ping_check_tasks = [self._has_log(m) for m in self.ping_monitors]
-        website_check_tasks = [self._has_log(m) for m in self.website_monitors]
+        # Schedule all (owned) monitors, monitors without logs or overdue
+        # ones get their initial check spread over the startup ramp window
+        for monitor in self.registry:
+            if self._owns(monitor.id):
+                self.scheduler.schedule(
+                    monitor, self._calculate_next_check_time(monitor, spread=True)
+                )
+
+        if self.PREWARM_POOLS:
+            await self._prewarm_pools()
 
-        ping_has_logs = (
-            await asyncio.gather(*ping_check_tasks) if ping_check_tasks else []
+        elapsed = time.time() - start_time
+        logger.info(f"=== Initialization completed in {elapsed:.2f}s ===")
+
+    async def _prewarm_pools(self):
+        """Open pooled connections up front so the first checks don't pay for them"""
+        start = time.monotonic()
+        try:
+            await self.storage.warm()
+        except Exception as e:
+            logger.warning(f"Failed to pre-warm the database pool: {e}")
+        await self._get_http_client()
+        logger.info(f"Pools pre-warmed in {(time.monotonic() - start) * 1000:.0f}ms")
+
+        # Resolve the monitored hosts in the background, the first checks of a
+        # host still being resolved join the pending lookup in the DNS cache
+        hosts = {monitor.hostname for monitor in self.ping_monitors if monitor.hostname}
+        hosts.update(self._website_host(monitor) for monitor in self.website_monitors)
+        hosts.discard("")
+        if hosts:
+            self.prewarm_task = asyncio.create_task(self._prewarm_dns(hosts))
+
+    async def _prewarm_dns(self, hosts: Set[str]):
+        """Fill the DNS cache for the given hosts (bounded by PING_CONCURRENCY)"""
+        semaphore = asyncio.Semaphore(self.PING_CONCURRENCY)
+        start = time.monotonic()
+
+        async def resolve(host: str):
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(self.dns_cache.resolve(host), self.PING_TIMEOUT)
+                except (OSError, asyncio.TimeoutError):
+                    pass
+
+        await asyncio.gather(*(resolve(host) for host in hosts))
+        logger.info(
+            f"Resolved {len(hosts)} monitored hosts in {(time.monotonic() - start) * 1000:.0f}ms"
         )
-        website_has_logs = (
-            await asyncio.gather(*website_check_tasks) if website_check_tasks else []
+
+    async def _fetch_pending_updates(self) -> List[int]:
+        """Return ids of monitors flagged with must_update = 1 (polling fallback)"""
+        storage = await self._get_storage()
+        rows = await storage.fetch_all(
+            "SELECT monitor_id FROM monitor_updates WHERE must_update = 1"
         )
+        return [row["monitor_id"] for row in rows]
 
-        ping_monitors_needing_check = [
-            m
-            for i, m in enumerate(self.ping_monitors)
-            if not (ping_has_logs and ping_has_logs[i])
-        ]
-        website_monitors_needing_check = [
-            m
-            for i, m in enumerate(self.website_monitors)
-            if not (website_has_logs and website_has_logs[i])
-        ]
+    async def _load_monitors_by_ids(self, monitor_ids: List[int]) -> List[Monitor]:
+        """Load a set of monitors with a single query"""
+        placeholders = ", ".join(["%s"] * len(monitor_ids))
+        monitors, _ = await self._query_monitors(
+            f"id IN ({placeholders})", tuple(monitor_ids)
+        )
+        return monitors
 
-        # Run initial checks concurrently
-        initial_tasks = []
-        if ping_monitors_needing_check:
-            initial_tasks.append(
-                self.run_batch_ping_checks(ping_monitors_needing_check)
-            )
-        if website_monitors_needing_check:
-            initial_tasks.append(
-                self.run_batch_website_checks(website_monitors_needing_check)
-            )
+    async def _reset_monitor_updates(self, monitor_ids: List[int]):
+        """Reset must_update for a set of monitors with a single UPDATE"""
+        storage = await self._get_storage()
+        placeholders = ", ".join(["%s"] * len(monitor_ids))
+        await storage.execute(
+            f"UPDATE monitor_updates SET must_update = 0 WHERE monitor_id IN ({placeholders})",
+            tuple(monitor_ids),
+        )
 
-        if initial_tasks:
-            await asyncio.gather(*initial_tasks)
+    async def _process_monitor_updates(self, monitor_ids: List[int]):
+        """Check changed monitors concurrently and reset their must_update flags"""
+        monitors = await self._load_monitors_by_ids(monitor_ids)
 
-        # Schedule all monitors
-        self.monitor_next_checks = []
-        next_check_tasks = [
-            self._calculate_next_check_time(monitor)
-            for monitor in self.ping_monitors + self.website_monitors
-        ]
-        next_check_times = await asyncio.gather(*next_check_tasks)
+        # Apply the changes to the registry, ids without a row were deleted
+        loaded_ids = {m.id for m in monitors}
+        self._apply_registry_diff(self.registry.upsert(monitors))
+        self._apply_registry_diff(
+            self.registry.remove([mid for mid in monitor_ids if mid not in loaded_ids])
+        )
 
-        for i, monitor in enumerate(self.ping_monitors + self.website_monitors):
-            self.monitor_next_checks.append(
-                {"monitor": monitor, "next_check_time": next_check_times[i]}
-            )
+        # Take the monitors out of the scheduler before the next await, or the
+        # loop checks the ones due now (new monitors) a second time. The
+        # check below reschedules them. Monitors not in the scheduler are
+        # being checked right now, that check reschedules them with the new
+        # settings
+        monitors = [m for m in monitors if self.scheduler.remove(m.id)]
 
-        elapsed = time.time() - start_time
-        logger.info(f"=== Initialization completed in {elapsed:.2f}s ===")
+        # Reset before checking so the polling fallback doesn't report them again
+        await self._reset_monitor_updates(monitor_ids)
 
-    async def _check_monitor_updates(self):
-        """Check monitor_updates table for must_update=1, run check, and reset must_update."""
-        def _get_updates_sync():
-            if not self.db_pool:
-                self._connect_to_database()
-            conn = self.db_pool.get_connection()
-            try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("SELECT monitor_id FROM monitor_updates WHERE must_update = 1")
-                rows = cursor.fetchall()
-                return [row["monitor_id"] for row in rows]
-            finally:
-                cursor.close()
-                conn.close()
+        ping_monitors = [m for m in monitors if m.monitor_type == "ping"]
+        website_monitors = [m for m in monitors if m.monitor_type == "website"]
 
-        monitor_ids = await asyncio.get_event_loop().run_in_executor(self.executor, _get_updates_sync)
-        if not monitor_ids:
-            return
+        tasks = []
+        if ping_monitors:
+            logger.info(f"Running ping update check for {len(ping_monitors)} monitors.")
+            tasks.append(
+                self.run_batch_ping_checks(ping_monitors, self._reschedule_after_check)
+            )
+        if website_monitors:
+            logger.info(f"Running website update check for {len(website_monitors)} monitors.")
+            tasks.append(
+                self.run_batch_website_checks(
+                    website_monitors, self._reschedule_after_check
+                )
+            )
+        if tasks:
+            await asyncio.gather(*tasks)
 
+    async def _consume_monitor_updates(self):
+        """Handle monitor changes pushed by the change feed sources"""
+        while True:
+            # Other workers handle (and reset) the monitors they own
+            monitor_ids = [mid for mid in await self.change_feed.next_batch() if self._owns(mid)]
+            if not monitor_ids:
+                continue
+            try:
+                await self._process_monitor_updates(sorted(monitor_ids))
+            except Exception as e:
+                logger.error(f"Error processing monitor updates: {e}")
+
+    def _owns(self, monitor_id: int) -> bool:
+        """Whether this worker is responsible for checking a monitor"""
+        return self.shard is None or self.shard.owns(monitor_id)
+
+    def _rebalance_shard(self):
+        """Schedule newly owned monitors and drop the ones owned by other workers"""
+        added = removed = 0
+        for monitor in self.registry:
+            owned = self._owns(monitor.id)
+            if owned and monitor.id not in self.scheduler:
+                self.scheduler.schedule(
+                    monitor, self._calculate_next_check_time(monitor, spread=True)
+                )
+                # The status loaded at startup is stale, the previous owner kept writing it
+                self.status_tracker.forget(monitor.id)
+                added += 1
+            elif not owned and monitor.id in self.scheduler:
+                self.scheduler.remove(monitor.id)
+                removed += 1
+        logger.info(f"Shard rebalanced - took over: {added}, handed off: {removed}")
+        if self.rollups:
+            self._start_rollup_rebalance(
+                [m.id for m in self.registry if self._owns(m.id) and not self.shard.owned_before(m.id)]
+            )
 
+    def _start_rollup_rebalance(self, taken_over: List[int]):
+        """Write and drop the rollup buckets of handed off monitors, merge the stored ones of monitors taken over"""
 
-        # Fetch monitors by id
-        def _get_monitor_sync(monitor_id):
-            if not self.db_pool:
-                self._connect_to_database()
-            conn = self.db_pool.get_connection()
+        async def rebalance():
             try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM monitors WHERE id = %s", (monitor_id,))
-                row = cursor.fetchone()
-                return row
-            finally:
-                cursor.close()
-                conn.close()
+                await self.rollups.hand_off(lambda monitor_id: not self._owns(monitor_id))
+                if taken_over:
+                    # The previous owners write their buckets when their next
+                    # heartbeat notices the change
+                    restored = await self.rollups.take_over(
+                        taken_over, delay=2 * self.SHARD_HEARTBEAT_INTERVAL
+                    )
+                    logger.info(f"Merged {restored} rollup buckets of monitors taken over")
+            except Exception as e:
+                logger.error(f"Failed to rebalance monitor log rollups: {e}")
+
+        task = asyncio.create_task(rebalance())
+        self.rollup_tasks.add(task)
+        task.add_done_callback(self.rollup_tasks.discard)
+
+    def _apply_registry_diff(self, diff: RegistryDiff):
+        """Bring the scheduler in line with registry changes"""
+        for monitor in diff.added:
+            # New monitors start as unknown, the first result is a transition
+            self.status_tracker.seed(monitor.id, "unknown")
+            if self._owns(monitor.id):
+                self.scheduler.schedule(monitor, self._calculate_next_check_time(monitor))
+        for old, new in diff.updated:
+            # Monitors being checked right now are rescheduled when their check ends
+            if old.id in self.scheduler:
+                self.scheduler.schedule(new, self._calculate_next_check_time(new))
+        for monitor in diff.removed:
+            self.scheduler.remove(monitor.id)
+            self.last_check_times.pop(monitor.id, None)
+            self.check_log.forget(monitor.id)
+            self.status_tracker.forget(monitor.id)
+            self.request_strategy.forget(monitor.id)
+
+        if diff:
+            logger.info(
+                f"Registry sync - added: {len(diff.added)}, updated: {len(diff.updated)}, removed: {len(diff.removed)}"
+            )
 
-        monitors = []
-        for monitor_id in monitor_ids:
-            row = await asyncio.get_event_loop().run_in_executor(self.executor, _get_monitor_sync, monitor_id)
-            if row:
-                keywords = None
-                if row.get("keywords"):
-                    try:
-                        keywords = json.loads(row["keywords"])
-                        if not isinstance(keywords, list):
-                            keywords = None
-                    except Exception:
-                        keywords = None
-                monitor = Monitor(
-                    id=row["id"],
-                    label=row["label"],
-                    monitor_type=row["monitor_type"],
-                    periodicity=row.get("periodicity", 300),
-                    hostname=row.get("hostname"),
-                    port=row.get("port"),
-                    url=row.get("url"),
-                    check_status=bool(row.get("check_status", False)),
-                    keywords=keywords,
+    async def _load_monitor_checksum(self) -> Tuple[int, int]:
+        """Return (count, sum of ids) of the monitors table"""
+        storage = await self._get_storage()
+        row = await storage.fetch_one(
+            "SELECT COUNT(*) AS count, COALESCE(SUM(id), 0) AS id_sum FROM monitors"
+        )
+        return int(row["count"]), int(row["id_sum"])
+
+    async def _load_deletions_watermark(self) -> int:
+        """Return the last id of the monitor_deletions log"""
+        storage = await self._get_storage()
+        row = await storage.fetch_one("SELECT COALESCE(MAX(id), 0) AS id FROM monitor_deletions")
+        return int(row["id"])
+
+    async def _load_deleted_monitor_ids(self) -> List[int]:
+        """Return ids of monitors deleted since the last call (primary key range scan)"""
+        storage = await self._get_storage()
+        rows = await storage.fetch_all(
+            "SELECT id, monitor_id FROM monitor_deletions WHERE id > %s ORDER BY id",
+            (self.deletions_watermark,),
+        )
+        if rows:
+            self.deletions_watermark = rows[-1]["id"]
+        return [row["monitor_id"] for row in rows]
+
+    async def _load_monitor_ids(self) -> List[int]:
+        """Return ids of all monitors"""
+        storage = await self._get_storage()
+        rows = await storage.fetch_all("SELECT id FROM monitors")
+        return [row["id"] for row in rows]
+
+    async def sync_registry(self) -> RegistryDiff:
+        """Apply monitors changed since the last sync (new, edited and deleted)"""
+        diff = RegistryDiff()
+
+        # Rows touched since the watermark (>= so rows sharing the same second aren't missed)
+        if self.registry.watermark is not None:
+            changed, watermark = await self._query_monitors(
+                "updated_at >= %s", (self.registry.watermark,)
+            )
+        else:
+            changed, watermark = await self._query_monitors()
+        upserted = self.registry.upsert(changed, watermark)
+        diff.added, diff.updated = upserted.added, upserted.updated
+
+        # Deletions don't bump updated_at, they are read from the deletion log
+        if self.deletions_watermark is not None:
+            diff.removed = self.registry.remove(await self._load_deleted_monitor_ids()).removed
+
+        # The full table checksum catches what the log missed (rows committed
+        # out of id order, purged before they were read), ids are only listed
+        # when it differs
+        now = time.monotonic()
+        if (
+            self.deletions_watermark is None
+            or now - self.checksum_checked_at >= self.REGISTRY_CHECKSUM_INTERVAL
+        ):
+            self.checksum_checked_at = now
+            if await self._load_monitor_checksum() != self.registry.checksum:
+                diff.removed += self.registry.retain(await self._load_monitor_ids()).removed
+
+        self._apply_registry_diff(diff)
+        return diff
+
+    async def _run_registry_sync(self):
+        """Periodically sync the registry with the monitors table"""
+        while True:
+            await asyncio.sleep(self.REGISTRY_SYNC_INTERVAL)
+            try:
+                await self.sync_registry()
+            except Exception as e:
+                logger.error(f"Error syncing monitor registry: {e}")
+
+    def _build_change_feed(self) -> ChangeFeed:
+        """Create the change feed from CHANGE_FEED_SOURCES, polling is always enabled as a fallback"""
+        feed = ChangeFeed()
+        for name in self.CHANGE_FEED_SOURCES:
+            if name == "unix":
+                feed.add_source(UnixSocketSource(self.CHANGE_FEED_SOCKET))
+            elif name == "redis":
+                feed.add_source(
+                    RedisSource(self.CHANGE_FEED_REDIS_URL, self.CHANGE_FEED_REDIS_CHANNEL)
                 )
-                monitors.append(monitor)
-
-        # Run checks for each monitor and reset must_update
-        for monitor in monitors:
-            if monitor.monitor_type == "ping":
-                logger.info("Running ping update check.")
-                result = await self._run_single_ping_check(monitor)
-            elif monitor.monitor_type == "website":
-                logger.info("Running website update check.")
-
-                result = await self._run_single_website_check(monitor)
             else:
-                continue
-            await self._save_result_async(monitor, result)
+                logger.warning(f"Unknown change feed source: {name}")
 
-            # Reset must_update to 0
-            def _reset_update_sync(monitor_id):
-                if not self.db_pool:
-                    self._connect_to_database()
-                conn = self.db_pool.get_connection()
-                try:
-                    cursor = conn.cursor()
-                    cursor.execute("UPDATE monitor_updates SET must_update = 0 WHERE monitor_id = %s", (monitor_id,))
-                finally:
-                    cursor.close()
-                    conn.close()
-            await asyncio.get_event_loop().run_in_executor(self.executor, _reset_update_sync, monitor.id)
+        # Push sources make polling a safety net only, so it can run much less often
+        default_interval = 30 if feed.sources else 1
+        interval = float(os.getenv("MONITOR_UPDATES_POLL_INTERVAL", default_interval))
+        feed.add_source(PollingSource(self._fetch_pending_updates, interval))
+        return feed
 
     async def run_monitoring_loop(self):
         """Enhanced monitoring loop with better performance tracking"""
         logger.info("Starting monitoring loop...")
 
+        await self.change_feed.start()
+        self.updates_task = asyncio.create_task(self._consume_monitor_updates())
+        self.registry_sync_task = asyncio.create_task(self._run_registry_sync())
+        self.housekeeping_task = asyncio.create_task(self._run_housekeeping())
+        if self._retention_rules():
+            self.retention_task = asyncio.create_task(self._run_retention())
+        if self.METRICS_ENABLED:
+            self.metrics_server = MetricsServer(self.metrics, self.METRICS_HOST, self.METRICS_PORT)
+            try:
+                await self.metrics_server.start()
+            except OSError as e:
+                logger.error(f"Failed to start metrics endpoint: {e}")
+                self.metrics_server = None
 
         while True:
-            current_time = datetime.now(UTC)
             due_ping_monitors = []
             due_website_monitors = []
 
-            # Collect due monitors
-            for i, monitor_check in enumerate(self.monitor_next_checks):
-                next_check_time = monitor_check["next_check_time"]
-                # Ensure next_check_time is UTC-aware
-                if isinstance(next_check_time, datetime):
-                    if next_check_time.tzinfo is None:
-                        next_check_time = next_check_time.replace(tzinfo=UTC)
-                else:
-                    # If not a datetime, skip
+            # Collect due monitors (earliest first, O(log n) per monitor),
+            # monitors this worker lost (lease expired) wait for the rebalance
+            for monitor in self.scheduler.pop_due(on_lag=self.scheduler_lag_metric.observe):
+                if not self._owns(monitor.id):
                     continue
-                if current_time >= next_check_time:
-                    monitor = monitor_check["monitor"]
-                    if monitor.monitor_type == "ping":
-                        due_ping_monitors.append((i, monitor))
-                    elif monitor.monitor_type == "website":
-                        due_website_monitors.append((i, monitor))
-
-            # Process monitors in batches
-            batch_tasks = []
-            if due_ping_monitors:
-                monitors = [item[1] for item in due_ping_monitors]
-                batch_tasks.append(
-                    ("ping", due_ping_monitors, self.run_batch_ping_checks(monitors))
-                )
-
+                if monitor.monitor_type == "ping":
+                    due_ping_monitors.append(monitor)
+                elif monitor.monitor_type == "website":
+                    due_website_monitors.append(monitor)
+
+            # Website checks are handed to the shared host dispatcher without
+            # blocking the loop, so a throttled host never delays the next tick.
+            # Every monitor is rescheduled as soon as its own check completes
             if due_website_monitors:
-                monitors = [item[1] for item in due_website_monitors]
-                batch_tasks.append(
-                    (
-                        "website",
-                        due_website_monitors,
-                        self.run_batch_website_checks(monitors),
-                    )
-                )
+                self._start_background_batch(self.run_batch_website_checks, due_website_monitors)
 
-            # Execute all batches concurrently
-            if batch_tasks:
-                for batch_type, due_monitors, task in batch_tasks:
+            # Ping checks don't hold up the loop either, a slow target never
+            # delays the monitors that become due while it is being checked
+            if due_ping_monitors:
+                self._start_background_batch(self.run_batch_ping_checks, due_ping_monitors)
+
+            # Sleep until the earliest monitor is due (wake up at least once
+            # per second for periodic housekeeping)
+            await self.scheduler.wait_until_due(max_wait=1.0)
+
+    def _retention_rules(self) -> List[Tuple[str, str, Tuple[str, ...], float]]:
+        """(table, time column, primary key columns, retention days) of the tables to purge"""
+        rules = [("monitor_logs", "started_at", ("id",), self.LOG_RETENTION_DAYS)]
+        if self.rollups:
+            rollup_key = ("monitor_id", "bucket_start")
+            rules += [
+                ("monitor_logs_minutely", "bucket_start", rollup_key, self.ROLLUP_MINUTE_RETENTION_DAYS),
+                ("monitor_logs_hourly", "bucket_start", rollup_key, self.ROLLUP_HOUR_RETENTION_DAYS),
+            ]
+        if self.deletions_watermark is not None:
+            # Read by every worker within a sync interval, restarted workers load all monitors
+            rules.append(("monitor_deletions", "deleted_at", ("id",), 1))
+        return [rule for rule in rules if rule[3] > 0]
+
+    async def _run_retention(self):
+        """Delete expired monitor_logs and rollup rows every RETENTION_INTERVAL"""
+        while True:
+            # With several workers only the first one in the shard purges
+            if self.shard is None or self.shard.is_leader:
+                for table, time_column, key_columns, days in self._retention_rules():
                     try:
-                        results = await task
-
-                        # Update next check times
-                        next_check_tasks = [
-                            self._calculate_next_check_time(monitor)
-                            for index, monitor in due_monitors
-                        ]
-                        next_check_times = await asyncio.gather(*next_check_tasks)
-
-                        for i, (index, monitor) in enumerate(due_monitors):
-                            self.monitor_next_checks[index]["next_check_time"] = (
-                                next_check_times[i]
-                            )
-
-                        # Update statistics
-                        self._update_stats(results)
+                        deleted = await purge_expired(
+                            self.storage,
+                            table,
+                            time_column,
+                            key_columns,
+                            time.time() - days * 86400,
+                            self.RETENTION_CHUNK_SIZE,
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to purge expired rows of {table}: {e}")
+                        continue
+                    self.retention_stats[table] = self.retention_stats.get(table, 0) + deleted
+                    if deleted:
+                        logger.info(f"Retention - deleted {deleted} rows older than {days:g} days from {table}")
+            await asyncio.sleep(self.RETENTION_INTERVAL)
+
+    def _start_background_batch(
+        self,
+        run_batch: Callable[..., Awaitable[int]],
+        monitors: List[Monitor],
+    ):
+        """Run a batch in the background (concurrency is bounded by the dispatcher, the ping slots or the lane)"""
+        task = asyncio.create_task(run_batch(monitors, self._reschedule_after_check))
+        self.background_batches.add(task)
+
+        def finished(task: asyncio.Task):
+            self.background_batches.discard(task)
+            if not task.cancelled() and task.exception():
+                logger.error(f"Error processing {monitors[0].monitor_type} monitors: {task.exception()}")
+                self._reschedule_failed_batch(monitors)
+
+        task.add_done_callback(finished)
+
+    def _reschedule_failed_batch(self, monitors: List[Monitor]):
+        """Keep the monitors of a failed batch scheduled instead of dropping them"""
+        for monitor in monitors:
+            if (
+                monitor.id in self.registry
+                and self._owns(monitor.id)
+                and monitor.id not in self.scheduler
+            ):
+                self.scheduler.schedule(monitor, time.time() + monitor.periodicity)
+
+    def _reschedule_after_check(
+        self, monitor: Monitor, result: Optional[MonitorResult]
+    ):
+        """Schedule the next check of a monitor right after its check finished"""
+        # Use the current configuration, skip monitors deleted or handed off
+        # to another worker during the check
+        monitor = self.registry.get(monitor.id)
+        if monitor is None or not self._owns(monitor.id):
+            return
+        if result is None:
+            # The check produced no result, retry after one period
+            next_check_time = time.time() + monitor.periodicity
+        else:
+            next_check_time = self._calculate_next_check_time(monitor)
+        self.scheduler.schedule(monitor, next_check_time)
 
-                        # logger.debug(f"Processed {len(results)} {batch_type} monitors")
+    def _build_metrics(self) -> MetricsRegistry:
+        """Define the exported metrics (hot path children are kept on self)"""
+        metrics = MetricsRegistry(prefix="monitor_checker_")
 
-                    except Exception as e:
-                        logger.error(f"Error processing {batch_type} monitors: {e}")
+        self.checks_metric = metrics.counter(
+            "checks_total", "Completed checks", ("type", "status")
+        )
+        self.check_duration_metric = metrics.histogram(
+            "check_duration_seconds", "Check response time", ("type",)
+        )
+        self.dns_duration_metric = metrics.histogram(
+            "dns_duration_seconds", "Name resolution time of checks", ("type",)
+        )
+        self.website_requests_metric = metrics.counter(
+            "website_requests", "Website check requests by kind (head, get, not_modified)", ("request",)
+        )
+        self.website_bytes_metric = metrics.counter(
+            "website_bytes_received", "Bytes received by website checks (headers and body)", ("request",)
+        )
+        self.check_rate = RateMeter(lambda: self.stats["total_checks"])
+        metrics.gauge(
+            "checks_per_second", "Checks completed per second (last minute)",
+            callback=lambda: {(): round(self.check_rate.rate, 3)},
+        )
+        self.scheduler_lag_metric = metrics.histogram(
+            "scheduler_lag_seconds", "Delay between the planned and the actual start of a check"
+        )
+        metrics.gauge(
+            "scheduled_monitors", "Monitors waiting in the scheduler",
+            callback=lambda: {(): len(self.scheduler)},
+        )
+        self.loop_lag_metric = metrics.histogram(
+            "event_loop_lag_seconds", "How late the event loop runs a timer"
+        )
 
-            # Periodically check monitor_updates table (every 5 seconds)
-            await self._check_monitor_updates()
+        metrics.gauge(
+            "log_write_queue_depth", "monitor_logs rows waiting to be written",
+            callback=lambda: {(): self.log_writer.queue_depth},
+        )
+        metrics.counter(
+            "log_rows", "monitor_logs rows by outcome", ("outcome",),
+            callback=lambda: {
+                ("written",): self.log_writer.stats["rows_written"],
+                ("dropped",): self.log_writer.stats["rows_dropped"],
+            },
+        )
+        metrics.gauge(
+            "log_queue_depth", "Log records waiting for the log writer thread",
+            callback=lambda: {(): log_pipeline.queue_depth},
+        )
+        metrics.counter(
+            "log_records_skipped", "Log records not written by reason", ("reason",),
+            callback=lambda: {
+                ("queue_full",): log_pipeline.dropped,
+                ("sampled",): self.check_log.suppressed,
+            },
+        )
+        metrics.gauge(
+            "rollup_open_buckets", "Rollup buckets held in memory",
+            callback=lambda: {(): self.rollups.aggregator.open_buckets()} if self.rollups else {},
+        )
+        metrics.counter(
+            "status_changes", "Check results by effect on monitors.status", ("result",),
+            callback=lambda: {
+                ("transition",): self.status_tracker.stats["transitions"],
+                ("unchanged",): self.status_tracker.stats["unchanged"],
+            },
+        )
+        metrics.counter(
+            "retention_deleted_rows", "Rows deleted by the retention job", ("table",),
+            callback=lambda: {(table,): count for table, count in self.retention_stats.items()},
+        )
+        metrics.gauge(
+            "db_pool_connections", "Database pool size and connections in use", ("state",),
+            callback=self._db_pool_metrics,
+        )
+        metrics.gauge(
+            "http_pool_connections", "HTTP pool limit, connections in use and idle", ("state",),
+            callback=self._http_pool_metrics,
+        )
+        metrics.gauge(
+            "http_pool_origins", "Origins with pooled HTTP connections",
+            callback=lambda: {(): self.http_client.pool_stats().get("origins", 0)} if self.http_client else {},
+        )
+        metrics.counter(
+            "http_requests_by_connection", "Website requests on a new or a reused connection", ("connection",),
+            callback=lambda: {
+                ("new",): self.http_client.stats["connections_created"],
+                ("reused",): self.http_client.stats["connections_reused"],
+            } if self.http_client else {},
+        )
 
-            # Memory management - log stats periodically
-            if time.time() % 60 < 1:  # Every minute
+        metrics.gauge(
+            "website_in_flight", "Website checks in flight and queued in the host dispatcher", ("state",),
+            callback=lambda: {
+                ("in_flight",): self.website_dispatcher.in_flight,
+                ("queued",): self.website_dispatcher.stats()["queued"],
+            },
+        )
+        metrics.gauge(
+            "website_host_in_flight", "Website checks in flight per host", ("host",),
+            callback=lambda: {
+                (host,): stats["in_flight"]
+                for host, stats in self.website_dispatcher.host_stats().items()
+            },
+        )
+        metrics.gauge(
+            "website_host_limit", "Adaptive concurrency limit per host", ("host",),
+            callback=lambda: {
+                (host,): stats["limit"]
+                for host, stats in self.website_dispatcher.host_stats().items()
+            },
+        )
+        metrics.gauge(
+            "circuit_open_targets", "Check targets with an open circuit",
+            callback=lambda: {(): self.circuit_breaker.open_count()} if self.circuit_breaker else {},
+        )
+        metrics.counter(
+            "circuit_events", "Circuits opened and closed, full-timeout trials and shortened checks", ("event",),
+            callback=lambda: {
+                (event,): value for event, value in self.circuit_breaker.stats.items()
+            } if self.circuit_breaker else {},
+        )
+        metrics.gauge(
+            "circuit_lane_in_flight", "Checks of open-circuit targets in flight in the low-priority lane", ("type",),
+            callback=lambda: {
+                ("ping",): self.ping_lane_in_flight,
+                ("website",): self.website_lane_dispatcher.in_flight,
+            },
+        )
+        metrics.counter(
+            "dns_cache_lookups", "DNS cache lookups by result", ("result",),
+            callback=lambda: {
+                (name,): value
+                for name, value in self.dns_cache.stats().items()
+                if name in ("hits", "misses", "negative_hits", "coalesced")
+            },
+        )
+        metrics.gauge(
+            "process_resident_memory_bytes", "Resident memory of the checker process",
+            callback=lambda: {(): self._resident_memory()},
+        )
+        return metrics
+
+    @staticmethod
+    def _resident_memory() -> int:
+        """Resident memory of the process in bytes"""
+        # psutil is only needed for stats, keep it off the startup path
+        import psutil
+
+        return psutil.Process().memory_info().rss
+
+    def _db_pool_metrics(self) -> Dict[Tuple[str, ...], float]:
+        if not self.storage:
+            return {}
+        pool = self.storage.pool_stats()
+        return {("size",): pool["size"], ("in_use",): pool["in_use"]}
+
+    def _http_pool_metrics(self) -> Dict[Tuple[str, ...], float]:
+        if not self.http_client:
+            return {}
+        pool = self.http_client.pool_stats()
+        return {(state,): pool[state] for state in ("limit", "in_use", "idle") if state in pool}
+
+    async def _run_housekeeping(self):
+        """Measure event loop lag and the check rate, log the stats every STATS_LOG_INTERVAL"""
+        last_log = time.monotonic()
+        while True:
+            self.loop_lag_metric.observe(await measure_loop_lag(0.5))
+            self.check_rate.sample()
+            if time.monotonic() - last_log >= self.STATS_LOG_INTERVAL:
+                last_log = time.monotonic()
                 self._log_stats()
-
-            # Short sleep to prevent CPU spinning
-            await asyncio.sleep(1)
+                if self.circuit_breaker:
+                    # Targets of removed monitors no longer get results
+                    longest = max((monitor.periodicity for monitor in self.registry), default=0)
+                    self.circuit_breaker.prune(2 * max(longest, self.CIRCUIT_MAX_TRIAL_INTERVAL))
 
     def _update_stats(self, results: List[Tuple[Monitor, MonitorResult]]):
         """Update performance statistics"""
         for monitor, result in results:
+            self.checks_metric.labels(monitor.monitor_type, result.status).inc()
+            self.check_duration_metric.labels(monitor.monitor_type).observe(
+                result.response_time / 1000
+            )
+            if result.dns_time is not None:
+                self.dns_duration_metric.labels(monitor.monitor_type).observe(
+                    result.dns_time / 1000
+                )
+            if result.request is not None:
+                self.website_requests_metric.labels(result.request).inc()
+                self.website_bytes_metric.labels(result.request).inc(result.bytes_received or 0)
+                self.stats["website_checks"] += 1
+                self.stats["website_bytes"] += result.bytes_received or 0
+
             self.stats["total_checks"] += 1
             if result.success:
                 self.stats["successful_checks"] += 1
@@ -762,6 +1765,12 @@ class MonitorChecker:
                 + result.response_time
             ) / self.stats["total_checks"]
 
+            if result.dns_time is not None:
+                self.stats["dns_samples"] += 1
+                self.stats["avg_dns_time"] += (
+                    result.dns_time - self.stats["avg_dns_time"]
+                ) / self.stats["dns_samples"]
+
     def _log_stats(self):
         """Log performance statistics"""
         total = self.stats["total_checks"]
@@ -770,7 +1779,42 @@ class MonitorChecker:
             logger.info(
                 f"Stats - Total: {total}, Success: {success_rate:.1f}%, "
                 f"Avg Response Time: {self.stats['avg_response_time']:.1f}ms, "
-                f"Memory: {psutil.Process().memory_info().rss / 1024 / 1024:.1f}MB"
+                f"Avg DNS Time: {self.stats['avg_dns_time']:.1f}ms, "
+                f"Avg Website Bytes: {self.stats['website_bytes'] / max(1, self.stats['website_checks']):.0f}, "
+                f"Memory: {self._resident_memory() / 1024 / 1024:.1f}MB"
+            )
+
+        dns = self.dns_cache.stats()
+        logger.info(
+            f"DNS cache - Entries: {dns['entries']}, Hits: {dns['hits']}, "
+            f"Misses: {dns['misses']}, Negative hits: {dns['negative_hits']}, "
+            f"Coalesced: {dns['coalesced']}"
+        )
+
+        if self.circuit_breaker:
+            circuits = self.circuit_breaker.stats
+            logger.info(
+                f"Circuit breaker - Open: {self.circuit_breaker.open_count()}, "
+                f"Opened: {circuits['opened']}, Closed: {circuits['closed']}, "
+                f"Trials: {circuits['trials']}, Shortened checks: {circuits['short_checks']}"
+            )
+
+        dispatcher = self.website_dispatcher.stats()
+        if dispatcher["hosts"]:
+            # Hosts held back the most by their adaptive limit
+            throttled = sorted(
+                self.website_dispatcher.host_stats().items(),
+                key=lambda item: item[1]["limit"],
+            )[:5]
+            logger.info(
+                f"Website hosts - Tracked: {dispatcher['hosts']}, "
+                f"In flight: {dispatcher['in_flight']}/{dispatcher['max_concurrency']}, "
+                f"Queued: {dispatcher['queued']}, "
+                "Lowest limits: "
+                + ", ".join(
+                    f"{host}={host_stats['limit']} ({host_stats['in_flight']} in flight)"
+                    for host, host_stats in throttled
+                )
             )
 
     async def run_all_pending_checks(self):
@@ -784,23 +1828,62 @@ class MonitorChecker:
             tasks.append(self.run_batch_website_checks(self.website_monitors))
 
         if tasks:
-            results = await asyncio.gather(*tasks)
-            for result_batch in results:
-                self._update_stats(result_batch)
+            await asyncio.gather(*tasks)
 
         self._log_stats()
         logger.info("=== All pending checks completed ===")
 
     async def cleanup(self):
         """Cleanup resources"""
-        if self.http_session and not self.http_session.closed:
-            await self.http_session.close()
+        for task in (
+            self.updates_task,
+            self.registry_sync_task,
+            self.housekeeping_task,
+            self.prewarm_task,
+            self.retention_task,
+        ):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await self.change_feed.stop()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+
+        for task in list(self.background_batches) + list(self.rollup_tasks):
+            task.cancel()
+        if self.rollup_tasks:
+            await asyncio.gather(*self.rollup_tasks, return_exceptions=True)
+        if self.background_batches:
+            await asyncio.gather(*self.background_batches, return_exceptions=True)
+
+        if self.shard:
+            await self.shard.stop()
+
+        # Flush buffered results before the storage backend goes away
+        await self.log_writer.stop()
+        if self.rollups:
+            # Open buckets are stored too and resumed on the next start
+            try:
+                await self.rollups.flush(force=True)
+            except Exception as e:
+                logger.error(f"Failed to write monitor log rollups: {e}")
+        try:
+            await self.status_tracker.flush()
+        except Exception as e:
+            logger.error(f"Failed to write monitor status changes: {e}")
+
+        if self.http_client:
+            await self.http_client.close()
 
-        if self.db_pool:
-            # MySQL connection pool doesn't need explicit closing
-            pass
+        for engine in (self.tcp_probes, self.icmp_probes):
+            if engine:
+                engine.close()
 
-        self.executor.shutdown(wait=True)
+        if self.storage:
+            await self.storage.close()
         logger.info("Cleanup completed")
 
 
@@ -827,10 +1910,82 @@ async def main():
         await checker.cleanup()
 
 
-if __name__ == "__main__":
-    # Set up asyncio event loop with optimizations
+def configure_event_loop() -> str:
+    """Install the event loop selected by EVENT_LOOP (auto, uvloop or asyncio)"""
+    mode = os.getenv("EVENT_LOOP", "auto").lower()
+    if mode in ("auto", "uvloop"):
+        try:
+            import uvloop
+        except ImportError:
+            if mode == "uvloop":
+                logger.warning("EVENT_LOOP=uvloop but uvloop is not installed, using asyncio")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info(f"Event loop: uvloop {uvloop.__version__}")
+            return "uvloop"
+
     if hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    logger.info("Event loop: asyncio")
+    return "asyncio"
+
+
+def run_worker(index: int):
+    """Entry point of one sharded worker process"""
+    os.environ["SHARD_ENABLED"] = "true"
+    os.environ.setdefault("SHARD_WORKER_ID", f"{socket.gethostname()}-{index}")
+    # Every worker needs its own notification socket, the Laravel notifier
+    # writes to all of them (services.checker.workers = CHECKER_WORKERS)
+    socket_path = os.getenv("CHANGE_FEED_SOCKET") or "/tmp/monitor-checker.sock"
+    os.environ["CHANGE_FEED_SOCKET"] = f"{socket_path}.{index}"
+    # ... and its own metrics port
+    os.environ["METRICS_PORT"] = str(int(os.getenv("METRICS_PORT", 9102)) + index)
+    configure_event_loop()
+    try:
+        asyncio.run(main())
+    finally:
+        # Worker processes exit without running atexit handlers
+        log_pipeline.stop()
 
-    # Run the main function
-    asyncio.run(main())
+
+def run_workers(workers: int):
+    """Run the checker as several sharded worker processes"""
+    import multiprocessing
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(index,), name=f"checker-{index}")
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {workers} sharded checker workers")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        logger.info("Shutdown requested by user")
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monitor checker")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("CHECKER_WORKERS", 1)),
+        help="number of sharded worker processes",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        run_workers(args.workers)
+    else:
+        # Set up the event loop (uvloop when available) and run the main function
+        configure_event_loop()
+        asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Connection benchmark
+
+Runs rounds of website checks for monitors sharing one origin against a
+local HTTPS server (self-signed certificate made with openssl) and reports
+checks per second, the average response time and the connections opened
+for pooled (warm) connections and fresh connections per check, with the
+aiohttp and the httpx backend. The local server speaks HTTP/1.1, so httpx
+is measured without multiplexing here.
+
+Usage: python benchmarks/connection_benchmark.py [--monitors 100] [--rounds 5]
+"""
+
+import argparse
+import asyncio
+import os
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("CHECKER_LOG_LEVEL", "WARNING")
+
+from aiohttp import web
+
+import Main
+
+
+def create_certificate(directory: str) -> ssl.SSLContext:
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+async def run(port: int, monitors: int, rounds: int, backend: str, connections: str) -> tuple:
+    checker = Main.MonitorChecker()
+    checker.HTTP_BACKEND = backend
+    checker.WEBSITE_CONNECTIONS = connections
+    targets = [
+        Main.Monitor(
+            id=i,
+            label="bench",
+            monitor_type="website",
+            periodicity=60,
+            url=f"https://127.0.0.1:{port}/page{i}",
+            check_status=True,
+            keywords=[],
+        )
+        for i in range(monitors)
+    ]
+    semaphore = asyncio.Semaphore(20)
+
+    async def check(monitor):
+        async with semaphore:
+            return await checker._run_single_website_check(monitor)
+
+    response_time = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for result in await asyncio.gather(*(check(monitor) for monitor in targets)):
+            assert result.success, result.error
+            response_time += result.response_time
+    elapsed = time.perf_counter() - start
+    created = checker.http_client.stats["connections_created"]
+    await checker.http_client.close()
+    checks = monitors * rounds
+    return checks / elapsed, response_time / checks, created
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Connection benchmark")
+    parser.add_argument("--monitors", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server_ssl = create_certificate(tmp)
+
+    app = web.Application()
+    app.router.add_route("*", "/{name}", lambda request: web.Response(text="ok"))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=server_ssl)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    modes = [("aiohttp", "reuse"), ("aiohttp", "fresh")]
+    try:
+        import httpx  # noqa: F401
+
+        modes += [("httpx", "reuse"), ("httpx", "fresh")]
+    except ImportError:
+        print('httpx not installed, skipping the httpx backend (pip install "httpx[http2]")')
+
+    print(f"{args.monitors} monitors on one origin, {args.rounds} rounds")
+    print(f"{'backend':>8} {'connections':>12} {'checks/s':>9} {'avg ms':>7} {'opened':>7}")
+    for backend, connections in modes:
+        rate, response_time, created = await run(port, args.monitors, args.rounds, backend, connections)
+        print(f"{backend:>8} {connections:>12} {rate:>9.0f} {response_time:>7.1f} {created:>7}")
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Keyword matching microbenchmark
+
+Compares the previous per-keyword loop (`keyword not in content` for every
+keyword) with the compiled single-pass keyword engine for growing keyword
+counts. Every keyword is present near the end of the page (worst case for
+both, the whole page has to be scanned).
+
+Usage: python benchmarks/keywords_benchmark.py [--page-size 262144]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import keywords as keyword_engine
+from keywords import AlternationMatcher, AhoCorasickMatcher, compile_keywords
+
+
+def loop_missing(content, keywords):
+    """The previous implementation"""
+    return [k for k in keywords if k and k not in content]
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-size", type=int, default=256 * 1024)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(1)
+    words = ["".join(random.choices(string.ascii_lowercase, k=8)) for _ in range(5000)]
+    page = " ".join(random.choices(words[:4000], k=args.page_size // 9))
+
+    engines = {"alternation": AlternationMatcher}
+    if keyword_engine.ahocorasick is not None:
+        engines["aho-corasick"] = AhoCorasickMatcher
+    # What the checker actually uses for the given keyword count
+    engines["selected"] = compile_keywords
+
+    header = f"{'keywords':>9} {'loop ms':>9}" + "".join(f" {name + ' ms':>17}" for name in engines)
+    print(f"page size: {len(page)} chars")
+    print(header)
+    for count in args.counts:
+        # Keywords that do not occur in the filler, appended at the end
+        kws = [f"kw{i}-{w}" for i, w in enumerate(random.sample(words[4000:], min(count, 1000)))]
+        content = page + " " + " ".join(kws)
+
+        row = f"{count:>9} {timeit(lambda: loop_missing(content, kws), args.repeat):>9.2f}"
+        for build in engines.values():
+            matcher = build(kws)
+            assert matcher.missing(content) == loop_missing(content, kws)
+            row += f" {timeit(lambda: matcher.missing(content), args.repeat):>17.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
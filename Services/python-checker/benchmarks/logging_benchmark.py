@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Logging benchmark
+
+Emits per-check log lines and reports the time spent on the calling (event
+loop) thread per line for the previous setup (eager f-string, ColorFormatter
+and a synchronous StreamHandler) and for the queued log pipeline, with all
+successes logged and with 1 in 10 success lines sampled. Output goes to
+os.devnull, once as fast as possible and once with a per-write delay that
+stands in for a slow terminal or a log pipe applying backpressure.
+
+Usage: python benchmarks/logging_benchmark.py [--lines 100000] [--write-delay-us 50]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_pipeline import CheckLogSampler, ColorFormatter, LogPipeline
+
+MONITORS = 1000
+
+
+class SlowStream:
+    """os.devnull with a blocking delay per write"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.file = open(os.devnull, "w")
+
+    def write(self, data: str):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+def synchronous(lines: int, delay: float) -> float:
+    logger = logging.getLogger(f"bench.sync.{delay}")
+    logger.propagate = False
+    handler = logging.StreamHandler(SlowStream(delay))
+    handler.setFormatter(ColorFormatter("%(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+
+    start = time.perf_counter()
+    for i in range(lines):
+        monitor_id = i % MONITORS
+        logger.info(
+            f"Ping monitor {monitor_id} - example.com:443 - Connection success (dns 1ms, connect 12ms) -> status:succeeded"
+        )
+    return time.perf_counter() - start
+
+
+def queued(lines: int, delay: float, sample_rate: float) -> float:
+    logger = logging.getLogger(f"bench.queued.{delay}.{sample_rate}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    pipeline = LogPipeline(logger, queue_size=lines)
+    # The pipeline creates its StreamHandler on sys.stderr
+    sys.stderr = SlowStream(delay)
+    pipeline.start()
+    sampler = CheckLogSampler(sample_rate=sample_rate)
+
+    start = time.perf_counter()
+    for i in range(lines):
+        monitor_id = i % MONITORS
+        emit, _ = sampler.should_log(monitor_id, True)
+        if emit:
+            logger.info(
+                "%s monitor %s - %s - %s (dns %sms, response %sms)%s -> status:%s",
+                "Ping", monitor_id, "example.com:443", "Connection success", 1, 12, "", "succeeded",
+            )
+    elapsed = time.perf_counter() - start
+    pipeline.stop()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging benchmark")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--write-delay-us", type=float, default=50)
+    args = parser.parse_args()
+
+    stderr = sys.stderr
+    print(f"{'output':>12} {'mode':>20} {'us/line on loop':>16}")
+    for output, delay in (("devnull", 0.0), ("slow", args.write_delay_us / 1e6)):
+        for label, elapsed in (
+            ("stream handler", synchronous(args.lines, delay)),
+            ("queued", queued(args.lines, delay, 1.0)),
+            ("queued, 10% sampled", queued(args.lines, delay, 0.1)),
+        ):
+            print(f"{output:>12} {label:>20} {elapsed / args.lines * 1e6:>16.2f}")
+    sys.stderr = stderr
+
+
+if __name__ == "__main__":
+    main()
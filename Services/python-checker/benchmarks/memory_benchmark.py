@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark
+
+Reports the bytes allocated per monitor for the in-memory monitor state:
+- before: plain @dataclass monitors, each wrapped by the scheduler in a
+  {"monitor": ..., "next_check_time": datetime} dict
+- after: slotted Monitor objects in the registry plus the struct-of-arrays
+  MonitorScheduler (packed heap keys, array columns, no monitor references)
+
+Both variants hold the same label/hostname/url strings.
+
+Usage: python benchmarks/memory_benchmark.py [--monitors 100000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, UTC
+from typing import Any, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import Monitor
+from registry import MonitorRegistry
+from scheduler import MonitorScheduler
+
+
+@dataclass
+class DictMonitor:
+    """The Monitor dataclass as it was before slots"""
+
+    id: int
+    label: str
+    monitor_type: str
+    periodicity: int
+    hostname: Optional[str] = None
+    port: Optional[int] = None
+    url: Optional[str] = None
+    check_status: bool = False
+    keywords: Optional[List[str]] = None
+    keyword_matcher: Optional[Any] = field(default=None, compare=False, repr=False)
+
+
+def monitor_fields(i: int) -> dict:
+    if i % 2:
+        return dict(
+            id=i, label=f"website {i}", monitor_type="website", periodicity=60,
+            url=f"https://example-{i}.test/", check_status=True,
+        )
+    return dict(
+        id=i, label=f"ping {i}", monitor_type="ping", periodicity=60,
+        hostname=f"host-{i}.test", port=443,
+    )
+
+
+def build_before(count: int, now: datetime):
+    monitors = {}
+    for i in range(count):
+        monitor = DictMonitor(**monitor_fields(i))
+        monitors[i] = {
+            "monitor": monitor,
+            "next_check_time": now + timedelta(seconds=i % 60),
+        }
+    return monitors
+
+
+def build_after(count: int, now: datetime):
+    registry = MonitorRegistry()
+    scheduler = MonitorScheduler(registry.get)
+    monitors = [Monitor(**monitor_fields(i)) for i in range(count)]
+    registry.upsert(monitors)
+    start = now.timestamp()
+    for monitor in monitors:
+        scheduler.schedule(monitor, start + monitor.id % 60)
+    del monitors
+    return registry, scheduler
+
+
+def measure(build, count: int) -> float:
+    """Bytes still allocated per monitor after build() returns"""
+    now = datetime.now(UTC)
+    gc.collect()
+    tracemalloc.start()
+    state = build(count, now)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del state
+    return current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-monitor memory benchmark")
+    parser.add_argument("--monitors", type=int, default=100_000)
+    args = parser.parse_args()
+
+    before = measure(build_before, args.monitors)
+    after = measure(build_after, args.monitors)
+
+    print(f"{'representation':>28} {'bytes/monitor':>14}")
+    print(f"{'dataclass + wrapper dict':>28} {before:>14.0f}")
+    print(f"{'slots + struct-of-arrays':>28} {after:>14.0f}")
+    print(f"{'saved':>28} {before - after:>14.0f} ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Outage benchmark
+
+Simulates a datacenter going dark: half of the ping and website targets are
+loopback addresses whose listen backlog is full, so connects to them hang
+until the timeout, the other half answer right away. The failing targets
+come first in every batch (they were due just before the healthy ones).
+Runs rounds of checks of all targets with and without the circuit breaker
+and reports the throughput of the healthy checks (checks/s until the last
+healthy check of a round finished), the round time of the healthy and of
+the failing targets, and the checks of the failing targets that were made
+(every target is still checked once per round).
+
+Usage: python benchmarks/outage_benchmark.py [--healthy 400] [--failing 400] [--rounds 3] [--timeout 1]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("CHECKER_LOG_LEVEL", "ERROR")
+# Open the circuits on the first failed round
+os.environ.setdefault("CIRCUIT_FAILURE_THRESHOLD", "1")
+
+from aiohttp import web
+
+import Main
+
+
+def address(network: int, index: int) -> str:
+    return f"127.{network}.{index // 250}.{index % 250 + 1}"
+
+
+def blackholes(count: int) -> list:
+    """Listeners that never accept, with the backlog filled up connects time out"""
+    sockets = []
+    for index in range(count):
+        listener = socket.socket()
+        listener.bind((address(2, index), 80))
+        listener.listen(0)
+        sockets.append(listener)
+        for _ in range(2):
+            filler = socket.socket()
+            filler.setblocking(False)
+            filler.connect_ex((address(2, index), 80))
+            sockets.append(filler)
+    return sockets
+
+
+def targets(monitor_type: str, healthy: int, failing: int, port: int) -> list:
+    monitors = []
+    for network, count, target_port in ((2, failing, 80), (1, healthy, port)):
+        for index in range(count):
+            host = address(network, index)
+            monitors.append(
+                Main.Monitor(
+                    id=len(monitors),
+                    label=f"{network}",
+                    monitor_type=monitor_type,
+                    periodicity=60,
+                    hostname=host,
+                    port=target_port,
+                    url=f"http://{host}:{target_port}/",
+                    check_status=True,
+                    keywords=[],
+                )
+            )
+    return monitors
+
+
+async def run(monitor_type: str, monitors: list, rounds: int, breaker: bool) -> tuple:
+    checker = Main.MonitorChecker()
+    if not breaker:
+        checker.circuit_breaker = None
+
+    async def discard(rows):
+        pass
+
+    checker.log_writer.write_batch = discard
+    run_batch = checker.run_batch_ping_checks if monitor_type == "ping" else checker.run_batch_website_checks
+
+    # Warm-up round: the failing targets fail once (and open their circuits)
+    await run_batch(monitors)
+
+    healthy_checks = failing_checks = 0
+    healthy_time = failing_time = 0.0
+    for _ in range(rounds):
+        finished = {"1": 0.0, "2": 0.0}
+        start = time.perf_counter()
+
+        def on_result(monitor, result):
+            finished[monitor.label] = time.perf_counter() - start
+
+        await run_batch(monitors, on_result)
+        healthy_time += finished["1"]
+        failing_time += finished["2"]
+        healthy_checks += sum(1 for monitor in monitors if monitor.label == "1")
+        failing_checks += sum(1 for monitor in monitors if monitor.label == "2")
+
+    await checker.log_writer.stop()
+    if checker.http_client:
+        await checker.http_client.close()
+    if checker.tcp_probes:
+        checker.tcp_probes.close()
+    return healthy_checks / healthy_time, healthy_time / rounds, failing_time / rounds, failing_checks
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Outage benchmark")
+    parser.add_argument("--healthy", type=int, default=400)
+    parser.add_argument("--failing", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=1)
+    args = parser.parse_args()
+    os.environ["PING_TIMEOUT"] = os.environ["WEBSITE_TIMEOUT"] = str(args.timeout)
+
+    sockets = blackholes(args.failing)
+    app = web.Application()
+    app.router.add_route("*", "/", lambda request: web.Response(text="ok"))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    # All of 127.0.0.0/8 reaches a listener on 0.0.0.0
+    site = web.TCPSite(runner, "0.0.0.0", 0, backlog=4096)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    print(
+        f"{args.healthy} healthy and {args.failing} failing targets, {args.rounds} rounds, "
+        f"timeout {args.timeout:g}s"
+    )
+    print(f"{'type':>8} {'breaker':>8} {'healthy/s':>10} {'healthy ms':>11} {'failing ms':>11} {'failing checks':>15}")
+    for monitor_type in ("ping", "website"):
+        monitors = targets(monitor_type, args.healthy, args.failing, port)
+        for breaker in (False, True):
+            rate, healthy_time, failing_time, failing_checks = await run(
+                monitor_type, monitors, args.rounds, breaker
+            )
+            print(
+                f"{monitor_type:>8} {'on' if breaker else 'off':>8} {rate:>10.0f} "
+                f"{healthy_time * 1000:>11.0f} {failing_time * 1000:>11.0f} {failing_checks:>15}"
+            )
+
+    await runner.cleanup()
+    for sock in sockets:
+        sock.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Phase spread benchmark
+
+Simulates the scheduler on a virtual clock after a checker restart (half
+of the monitors were last checked at the same moment, the rest never) and
+reports the checks started per second with and without phase spreading:
+peak, p99 and standard deviation for the startup minute and the steady
+state, plus the steady-state mean interval between checks relative to the
+periodicity (it must stay 1.00).
+
+Usage: python benchmarks/phase_spread_benchmark.py [--monitors 10000] [--seconds 900]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import MonitorScheduler, next_check_time
+
+PERIODICITIES = (30, 60, 60, 300)
+STEP = 0.1
+
+
+@dataclass
+class FakeMonitor:
+    id: int
+    periodicity: int
+    monitor_type: str = "ping"
+
+
+def simulate(monitors: int, seconds: int, phase_spread: bool, ramp_window: float):
+    registry = {i: FakeMonitor(i, PERIODICITIES[i % len(PERIODICITIES)]) for i in range(1, monitors + 1)}
+    scheduler = MonitorScheduler(registry.get)
+    start = 1_000_000.0
+    last_checks = {}
+    for i, monitor in registry.items():
+        last_check = start - 10 if i % 2 else None
+        due = next_check_time(i, monitor.periodicity, last_check, start, phase_spread, ramp_window)
+        scheduler.schedule(monitor, due)
+
+    per_second = Counter()
+    intervals = []
+    now = start
+    while now < start + seconds:
+        for monitor in scheduler.pop_due(now):
+            per_second[int(now - start)] += 1
+            previous = last_checks.get(monitor.id)
+            # The first interval may be shortened once to reach the phase slot
+            if previous is not None and previous >= start + max(PERIODICITIES):
+                intervals.append((now - previous) / monitor.periodicity)
+            last_checks[monitor.id] = now
+            scheduler.schedule(
+                monitor, next_check_time(monitor.id, monitor.periodicity, now, now, phase_spread)
+            )
+        now += STEP
+
+    counts = [per_second[second] for second in range(seconds)]
+    return counts, statistics.mean(intervals)
+
+
+def describe(counts):
+    ordered = sorted(counts)
+    return (
+        max(counts),
+        ordered[int(len(ordered) * 0.99)],
+        statistics.pstdev(counts),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phase spread benchmark")
+    parser.add_argument("--monitors", type=int, default=10000)
+    parser.add_argument("--seconds", type=int, default=900)
+    parser.add_argument("--ramp", type=float, default=30)
+    args = parser.parse_args()
+    # The steady state starts after the longest periodicity, every monitor
+    # needs a full interval in it
+    min_seconds = 2 * max(PERIODICITIES)
+    if args.seconds <= min_seconds:
+        parser.error(f"--seconds must be greater than {min_seconds} (twice the longest periodicity)")
+
+    print(
+        f"{'mode':>14} {'window':>8} {'peak/s':>8} {'p99/s':>8} {'stddev':>8} {'interval':>9}"
+    )
+    for label, phase_spread, ramp in (
+        ("lockstep", False, 0),
+        ("phase spread", True, args.ramp),
+    ):
+        counts, interval = simulate(args.monitors, args.seconds, phase_spread, ramp)
+        for window, values in (("startup", counts[:60]), ("steady", counts[max(PERIODICITIES):])):
+            peak, p99, stddev = describe(values)
+            print(
+                f"{label:>14} {window:>8} {peak:>8} {p99:>8} {stddev:>8.1f} {interval:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Probe engine benchmark
+
+Probes a loopback TCP listener with the multiplexed probe engine and with
+the previous open_connection + wait_closed path (one wait_for per probe),
+and reports probes/sec and CPU time per probe of this process.
+
+Usage: python benchmarks/probe_benchmark.py [--probes 20000] [--concurrency 500]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from probe import TCPProbeEngine
+
+HOST = "127.0.0.1"
+
+
+async def open_connection_probe(port: int, timeout: float) -> bool:
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, port), timeout)
+        writer.close()
+        await writer.wait_closed()
+        return True
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+
+async def run(probe, probes: int, concurrency: int):
+    remaining = iter(range(probes))
+    succeeded = 0
+
+    async def worker():
+        nonlocal succeeded
+        for _ in remaining:
+            if await probe():
+                succeeded += 1
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - wall, time.process_time() - cpu, succeeded
+
+
+def listener() -> socket.socket:
+    """Non-blocking loopback listener on an ephemeral port"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((HOST, 0))
+    sock.listen(4096)
+    sock.setblocking(False)
+    return sock
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Probe engine benchmark")
+    parser.add_argument("--probes", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    loop = asyncio.get_running_loop()
+    server = listener()
+    port = server.getsockname()[1]
+
+    # Accept and drop connections so the backlog never fills
+    def drain():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.close()
+
+    loop.add_reader(server.fileno(), drain)
+
+    engine = TCPProbeEngine()
+    variants = (
+        ("open_connection", lambda: open_connection_probe(port, args.timeout)),
+        (
+            "probe engine",
+            lambda: _succeeded(engine.probe(HOST, port, socket.AF_INET, args.timeout)),
+        ),
+    )
+
+    print(f"{'engine':>16} {'probes/sec':>11} {'cpu us/probe':>13} {'ok':>7}")
+    for label, probe in variants:
+        elapsed, cpu, succeeded = await run(probe, args.probes, args.concurrency)
+        print(
+            f"{label:>16} {args.probes / elapsed:>11.0f} "
+            f"{cpu / args.probes * 1e6:>13.1f} {succeeded:>7}"
+        )
+
+    loop.remove_reader(server.fileno())
+    server.close()
+
+
+async def _succeeded(probe) -> bool:
+    return (await probe).success
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
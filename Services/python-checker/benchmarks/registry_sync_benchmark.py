@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Registry sync benchmark
+
+Runs MonitorChecker.sync_registry against an in-memory monitors table
+(indexed by updated_at like the real one) and reports the sync cost for a
+fixed number of changed rows while the total number of monitors grows.
+The cost should follow the number of changed rows, not the table size.
+
+Usage: python benchmarks/registry_sync_benchmark.py [--changed 100]
+"""
+
+import argparse
+import asyncio
+import bisect
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Main import Monitor, MonitorChecker, logger
+
+
+class FakeMonitorTable:
+    """monitors table with an updated_at index"""
+
+    def __init__(self):
+        self.rows = {}
+        self.index = []  # sorted (updated_at, id)
+        self.clock = datetime(2025, 1, 1)
+        self.id_sum = 0
+
+    def tick(self) -> datetime:
+        self.clock += timedelta(seconds=1)
+        return self.clock
+
+    def upsert(self, monitor: Monitor):
+        if monitor.id not in self.rows:
+            self.id_sum += monitor.id
+        updated_at = self.tick()
+        self.rows[monitor.id] = (monitor, updated_at)
+        self.index.append((updated_at, monitor.id))
+
+    def changed_since(self, watermark):
+        start = bisect.bisect_left(self.index, (watermark, -1))
+        seen = {}
+        for updated_at, monitor_id in self.index[start:]:
+            row = self.rows.get(monitor_id)
+            if row and row[1] == updated_at:
+                seen[monitor_id] = row
+        monitors = [monitor for monitor, _ in seen.values()]
+        latest = max((updated_at for _, updated_at in seen.values()), default=None)
+        return monitors, latest
+
+
+def make_checker(table: FakeMonitorTable) -> MonitorChecker:
+    checker = MonitorChecker()
+
+    async def query_monitors(where="1 = 1", params=()):
+        if where.startswith("updated_at"):
+            return table.changed_since(params[0])
+        monitors = [monitor for monitor, _ in table.rows.values()]
+        return monitors, table.clock
+
+    async def checksum():
+        return len(table.rows), table.id_sum
+
+    async def ids():
+        return list(table.rows)
+
+    checker._query_monitors = query_monitors
+    checker._load_monitor_checksum = checksum
+    checker._load_monitor_ids = ids
+    return checker
+
+
+async def bench(total: int, changed: int, rounds: int) -> float:
+    table = FakeMonitorTable()
+    for i in range(1, total + 1):
+        table.upsert(Monitor(i, f"m{i}", "ping", 60, "127.0.0.1", 80))
+
+    checker = make_checker(table)
+    await checker.sync_registry()
+
+    elapsed = 0.0
+    next_id = total + 1
+    for r in range(rounds):
+        # Edit periodicity of some monitors and add a few new ones
+        for i in range(changed - 10):
+            monitor_id = 1 + (r * changed + i) % total
+            table.upsert(Monitor(monitor_id, f"m{monitor_id}", "ping", 30 + r % 2, "127.0.0.1", 80))
+        for _ in range(10):
+            table.upsert(Monitor(next_id, f"m{next_id}", "website", 60, url="https://example.com"))
+            next_id += 1
+
+        start = time.perf_counter()
+        await checker.sync_registry()
+        elapsed += time.perf_counter() - start
+
+    return elapsed / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--changed", type=int, default=100, help="changed rows per sync")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    logger.disabled = True
+    print(f"{'monitors':>10} {'changed':>8} {'ms/sync':>9}")
+    for total in args.sizes:
+        cost = asyncio.run(bench(total, args.changed, args.rounds))
+        print(f"{total:>10} {args.changed:>8} {cost:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Rollup benchmark
+
+Builds an SQLite database with a week of one-minute checks for a set of
+monitors and compares a per-monitor dashboard query (hourly checks,
+failures and average response time over 7 days) on the raw monitor_logs
+table without and with the (monitor_id, started_at) index and on the
+hourly rollup table. Also reports the aggregation cost per result row.
+
+Usage: python benchmarks/rollup_benchmark.py [--monitors 50] [--days 7]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rollups import RollupAggregator, format_timestamp
+
+RAW_QUERY = """
+    SELECT substr(started_at, 1, 13) AS hour, COUNT(*),
+           SUM(status = 'failed'), AVG(CASE WHEN status = 'succeeded' THEN response_time_ms END)
+    FROM monitor_logs
+    WHERE monitor_id = ? AND started_at >= ?
+    GROUP BY hour
+"""
+ROLLUP_QUERY = """
+    SELECT bucket_start, checks, failures, response_time_avg_ms
+    FROM monitor_logs_hourly
+    WHERE monitor_id = ? AND bucket_start >= ?
+"""
+
+
+def timed_queries(conn: sqlite3.Connection, query: str, monitors: int, since: str, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        conn.execute(query, ((i % monitors) + 1, since)).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rollup benchmark")
+    parser.add_argument("--monitors", type=int, default=50)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(1)
+    end = int(time.time()) // 3600 * 3600
+    start = end - args.days * 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "rollups.sqlite"))
+        conn.executescript(
+            """
+            CREATE TABLE monitor_logs (id INTEGER PRIMARY KEY, monitor_id INT, started_at TEXT,
+                status TEXT, response_time_ms INT);
+            CREATE TABLE monitor_logs_hourly (monitor_id INT, bucket_start TEXT, checks INT,
+                failures INT, response_time_avg_ms REAL, response_time_p50_ms INT,
+                response_time_p95_ms INT, response_time_max_ms INT, latency_histogram TEXT,
+                PRIMARY KEY (monitor_id, bucket_start));
+            """
+        )
+
+        aggregator = RollupAggregator([("monitor_logs_hourly", 3600)])
+        rows = []
+        aggregate_time = 0.0
+        for minute in range(start, end, 60):
+            stamp = format_timestamp(minute)
+            for monitor_id in range(1, args.monitors + 1):
+                success = random.random() > 0.02
+                response_time = int(random.lognormvariate(4, 0.5))
+                rows.append((monitor_id, stamp, "succeeded" if success else "failed", response_time))
+                tick = time.perf_counter()
+                aggregator.add(monitor_id, minute, success, response_time, now=minute)
+                aggregate_time += time.perf_counter() - tick
+
+        conn.executemany(
+            "INSERT INTO monitor_logs (monitor_id, started_at, status, response_time_ms) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        pending = aggregator.collect(now=end + 3600, include_open=True)
+        conn.executemany(
+            "INSERT INTO monitor_logs_hourly VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [row for _, _, _, row in pending],
+        )
+        conn.commit()
+
+        since = format_timestamp(start)
+        print(f"{len(rows)} raw rows, {len(pending)} hourly rollup rows")
+        print(f"aggregation: {aggregate_time / len(rows) * 1e6:.2f} us/row")
+        print(f"{'query':>28} {'ms':>8}")
+        print(f"{'raw, no index':>28} {timed_queries(conn, RAW_QUERY, args.monitors, since, 5):>8.2f}")
+        conn.execute("CREATE INDEX monitor_logs_monitor_started ON monitor_logs (monitor_id, started_at)")
+        print(f"{'raw, (monitor_id, started_at)':>28} {timed_queries(conn, RAW_QUERY, args.monitors, since):>8.2f}")
+        print(f"{'hourly rollup':>28} {timed_queries(conn, ROLLUP_QUERY, args.monitors, since):>8.2f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Scheduler benchmark
+
+Measures the cost of one scheduler tick (pop due monitors + reschedule them)
+for growing monitor counts. With the heap the per-tick cost depends on the
+number of due monitors, not on the total number of scheduled monitors.
+
+Usage: python benchmarks/scheduler_benchmark.py [--due 100] [--ticks 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import MonitorScheduler
+
+
+@dataclass
+class FakeMonitor:
+    id: int
+    periodicity: int
+    monitor_type: str = "ping"
+
+
+def bench(total: int, due_per_tick: int, ticks: int) -> float:
+    """Return the average tick cost in microseconds"""
+    monitors = {i: FakeMonitor(i, 60) for i in range(total)}
+    # Monitors that become due on every tick
+    hot = [FakeMonitor(total + i, 1) for i in range(due_per_tick)]
+    monitors.update((monitor.id, monitor) for monitor in hot)
+    scheduler = MonitorScheduler(monitors.get)
+    now = 1_000_000.0
+    for i in range(total):
+        # Keep everything except the due monitors far in the future
+        scheduler.schedule(monitors[i], now + 3600 + random.random() * 3600)
+    for monitor in hot:
+        scheduler.schedule(monitor, now)
+
+    elapsed = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        due = scheduler.pop_due(now)
+        for monitor in due:
+            scheduler.schedule(monitor, now + monitor.periodicity)
+        elapsed += time.perf_counter() - start
+        now += 1
+    return elapsed / ticks * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--due", type=int, default=100, help="due monitors per tick")
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'monitors':>10} {'due/tick':>9} {'us/tick':>10}")
+    for total in args.sizes:
+        cost = bench(total, args.due, args.ticks)
+        print(f"{total:>10} {args.due:>9} {cost:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shard benchmark
+
+Runs 1..N sharded checker worker processes against a local HTTP server and
+reports website checks/sec. Each worker checks only the monitors that
+rendezvous hashing assigns to it, so throughput should grow close to
+linearly with the worker count (up to the number of free CPU cores).
+
+Usage: python benchmarks/shard_benchmark.py [--workers 1 2 4] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def serve(port: int, page_size: int):
+    """Local origin serving one HTML page with a keyword at the end"""
+    from aiohttp import web
+
+    body = ("<p>lorem ipsum dolor sit amet</p>" * (page_size // 32)) + "<p>needle</p>"
+
+    async def page(request):
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/", page)
+    web.run_app(app, host="127.0.0.1", port=port, reuse_port=True, print=None, access_log=None)
+
+
+def worker(index: int, workers: int, monitors: int, duration: float, port: int, results):
+    from Main import Monitor, MonitorChecker, logger
+    from sharding import rendezvous_owner, worker_seed
+
+    logger.disabled = True
+    seeds = [worker_seed(f"bench-{i}") for i in range(workers)]
+    owned = [
+        Monitor(i, f"m{i}", "website", 60, url=f"http://127.0.0.1:{port}/", check_status=True, keywords=["needle"])
+        for i in range(1, monitors + 1)
+        if rendezvous_owner(i, seeds) == index
+    ]
+
+    async def run():
+        checker = MonitorChecker()
+
+        async def discard(rows):
+            pass
+
+        checker.log_writer.write_batch = discard
+        checks = 0
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            checks += await checker.run_batch_website_checks(owned)
+        await checker.log_writer.stop()
+        if checker.http_client:
+            await checker.http_client.close()
+        return checks
+
+    results.put(asyncio.run(run()))
+
+
+def bench(workers: int, monitors: int, duration: float, port: int) -> float:
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(i, workers, monitors, duration, port, results))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    total = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return total / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--monitors", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--page-size", type=int, default=64 * 1024)
+    parser.add_argument("--server-processes", type=int, default=2)
+    parser.add_argument("--port", type=int, default=18080)
+    args = parser.parse_args()
+
+    servers = [
+        multiprocessing.Process(target=serve, args=(args.port, args.page_size), daemon=True)
+        for _ in range(args.server_processes)
+    ]
+    for server in servers:
+        server.start()
+    time.sleep(1)
+
+    try:
+        print(f"{'workers':>8} {'checks/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            rate = bench(workers, args.monitors, args.duration, args.port)
+            baseline = baseline or rate
+            print(f"{workers:>8} {rate:>10.0f} {rate / baseline:>7.2f}x")
+    finally:
+        for server in servers:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
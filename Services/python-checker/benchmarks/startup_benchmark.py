@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+
+Starts the checker in fresh processes against a temporary SQLite database
+(ping monitors on a loopback listener, website monitors on a closed port)
+and reports the median import time of Main and the time from process
+start to the first recorded check, for the asyncio and uvloop event loops
+with and without pre-warmed pools.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--monitors 1000]
+"""
+
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHECKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCHEMA = """
+CREATE TABLE monitors (id INTEGER PRIMARY KEY, project_id INT, label TEXT, periodicity INT,
+    monitor_type TEXT, badge_label TEXT, status TEXT DEFAULT 'unknown', hostname TEXT, port INT,
+    url TEXT, check_status INT, keywords TEXT, created_at TEXT, updated_at TEXT);
+CREATE TABLE monitor_logs (id INTEGER PRIMARY KEY, monitor_id INT, started_at TEXT, status TEXT,
+    response_time_ms INT, created_at TEXT, updated_at TEXT, dns_time_ms INT, connect_time_ms INT,
+    tls_time_ms INT, ttfb_ms INT, body_time_ms INT);
+CREATE TABLE monitor_updates (id INTEGER PRIMARY KEY, monitor_id INT, must_update INT,
+    created_at TEXT, updated_at TEXT);
+"""
+
+
+def create_database(path: str, monitors: int, port: int):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    rows = []
+    for i in range(1, monitors + 1):
+        if i % 10:
+            rows.append((i, "ping", "127.0.0.1", port, None))
+        else:
+            rows.append((i, "website", None, None, "http://127.0.0.1:1/"))
+    conn.executemany(
+        "INSERT INTO monitors (id, label, periodicity, monitor_type, hostname, port, url, "
+        "check_status, keywords, updated_at) "
+        "VALUES (?, 'bench', 60, ?, ?, ?, ?, 1, '[]', '2025-01-01 00:00:00')",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def child():
+    """Measure one startup (runs in a fresh interpreter)"""
+    sys.path.insert(0, CHECKER_DIR)
+    before_import = time.perf_counter()
+    import Main
+
+    imported = time.perf_counter()
+    loop_name = Main.configure_event_loop()
+
+    async def first_check():
+        checker = Main.MonitorChecker()
+        await checker.initialize_monitors()
+        task = asyncio.create_task(checker.run_monitoring_loop())
+        while checker.stats["time_to_first_check"] is None:
+            await asyncio.sleep(0.001)
+        first = time.perf_counter()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await checker.cleanup()
+        return first
+
+    first = asyncio.run(first_check())
+    print(json.dumps({
+        "loop": loop_name,
+        "import_ms": (imported - before_import) * 1000,
+        "first_check_ms": (first - STARTED) * 1000,
+    }))
+
+
+def measure(database: str, event_loop: str, prewarm: bool) -> dict:
+    env = dict(
+        os.environ,
+        DB_CONNECTION="sqlite",
+        DB_DATABASE=database,
+        EVENT_LOOP=event_loop,
+        PREWARM_POOLS="true" if prewarm else "false",
+        METRICS_ENABLED="false",
+        STARTUP_RAMP_WINDOW="0",
+    )
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--monitors", type=int, default=1000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(4096)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'loop':>8} {'prewarm':>8} {'import ms':>10} {'first check ms':>15}")
+        for event_loop in ("asyncio", "uvloop"):
+            for prewarm in (False, True):
+                results = []
+                for run in range(args.runs):
+                    database = os.path.join(tmp, f"{event_loop}-{prewarm}-{run}.sqlite")
+                    create_database(database, args.monitors, listener.getsockname()[1])
+                    results.append(measure(database, event_loop, prewarm))
+
+                loop_name = results[0]["loop"]
+                import_ms = statistics.median(r["import_ms"] for r in results)
+                first_ms = statistics.median(r["first_check_ms"] for r in results)
+                print(f"{loop_name:>8} {str(prewarm):>8} {import_ms:>10.1f} {first_ms:>15.1f}")
+
+    listener.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Status update benchmark
+
+Writes batches of monitor_logs rows (statuses flip with a small probability)
+to a temporary SQLite database and compares how monitors.status is kept up
+to date: the original trigger (one monitors update per log row), the
+conditional trigger (only changed statuses) and the checker's transition
+tracking with one UPDATE ... CASE per batch and no trigger. Reports the
+write time per batch and the monitors rows written, then checks that
+replaying monitor_status_transitions gives the same statuses.
+
+Usage: python benchmarks/status_benchmark.py [--monitors 10000] [--batches 100] [--flip 0.01]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from status_tracker import StatusTracker, replay_transitions
+from storage import SQLiteBackend
+
+SCHEMA = """
+CREATE TABLE monitors (id INTEGER PRIMARY KEY, status TEXT DEFAULT 'unknown');
+CREATE TABLE monitor_logs (id INTEGER PRIMARY KEY, monitor_id INT, started_at TEXT, status TEXT,
+    response_time_ms INT, created_at TEXT, updated_at TEXT);
+CREATE TABLE monitor_status_transitions (id INTEGER PRIMARY KEY, monitor_id INT,
+    previous_status TEXT, status TEXT, changed_at TEXT);
+"""
+TRIGGERS = {
+    "trigger": "UPDATE monitors SET status = NEW.status WHERE id = NEW.monitor_id;",
+    "conditional trigger": "UPDATE monitors SET status = NEW.status WHERE id = NEW.monitor_id AND status <> NEW.status;",
+}
+INSERT = """
+    INSERT INTO monitor_logs (monitor_id, started_at, status, response_time_ms, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+
+def generate_batches(monitors: int, batches: int, batch_size: int, flip: float):
+    random.seed(1)
+    statuses = {monitor_id: "succeeded" for monitor_id in range(1, monitors + 1)}
+    result = []
+    for batch in range(batches):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(1767225600 + batch))
+        rows = []
+        for _ in range(batch_size):
+            monitor_id = random.randint(1, monitors)
+            if random.random() < flip:
+                statuses[monitor_id] = "failed" if statuses[monitor_id] == "succeeded" else "succeeded"
+            rows.append((monitor_id, stamp, statuses[monitor_id], 42, stamp, stamp))
+        result.append(rows)
+    return result, statuses
+
+
+async def run(path: str, mode: str, monitors: int, batches) -> tuple:
+    storage = SQLiteBackend(path)
+    await storage.connect()
+    # The connection belongs to the backend's worker thread
+    await storage._run(storage.conn.executescript, SCHEMA)
+    await storage.execute_many(
+        "INSERT INTO monitors (id, status) VALUES (%s, 'succeeded')",
+        [(monitor_id,) for monitor_id in range(1, monitors + 1)],
+    )
+    if mode in TRIGGERS:
+        await storage.execute(
+            f"CREATE TRIGGER update_monitor_status AFTER INSERT ON monitor_logs "
+            f"FOR EACH ROW BEGIN {TRIGGERS[mode]} END"
+        )
+
+    async def get_storage():
+        return storage
+
+    tracker = StatusTracker(get_storage, write_status=mode == "checker", record_transitions=mode == "checker")
+    for monitor_id in range(1, monitors + 1):
+        tracker.seed(monitor_id, "succeeded")
+
+    async def total_changes() -> int:
+        return await storage._run(lambda: storage.conn.total_changes)
+
+    changes_before = await total_changes()
+    inserted = 0
+    start = time.perf_counter()
+    for rows in batches:
+        await storage.execute_many(INSERT, rows)
+        inserted += len(rows)
+        if tracker.active:
+            tracker.add_log_rows(rows)
+            await tracker.flush()
+    elapsed = time.perf_counter() - start
+    # total_changes counts trigger updates too, minus the log and transition inserts
+    monitor_writes = await total_changes() - changes_before - inserted - tracker.stats["transitions"]
+
+    statuses = {row["id"]: row["status"] for row in await storage.fetch_all("SELECT id, status FROM monitors")}
+    replayed = await replay_transitions(storage) if mode == "checker" else None
+    await storage.close()
+    return elapsed / len(batches) * 1000, monitor_writes, statuses, replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Status update benchmark")
+    parser.add_argument("--monitors", type=int, default=10000)
+    parser.add_argument("--batches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flip", type=float, default=0.01)
+    args = parser.parse_args()
+
+    batches, expected = generate_batches(args.monitors, args.batches, args.batch_size, args.flip)
+    print(f"{args.batches} batches of {args.batch_size} rows, {args.monitors} monitors")
+    print(f"{'mode':>20} {'ms/batch':>9} {'monitors rows written':>22} {'status ok':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("trigger", "conditional trigger", "checker"):
+            path = os.path.join(tmp, f"{mode.replace(' ', '_')}.sqlite")
+            per_batch, writes, statuses, replayed = asyncio.run(run(path, mode, args.monitors, batches))
+            ok = statuses == expected
+            print(f"{mode:>20} {per_batch:>9.2f} {writes:>22} {str(ok):>10}")
+            if replayed is not None:
+                # Monitors without transitions keep their seeded status
+                replay_ok = {**{mid: "succeeded" for mid in expected}, **replayed} == expected
+                print(f"{'replayed transitions':>20} {len(replayed):>9} monitors, matches: {replay_ok}")
+
+
+if __name__ == "__main__":
+    main()
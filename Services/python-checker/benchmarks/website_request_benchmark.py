@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Website request benchmark
+
+Runs website checks against a local aiohttp server serving a page with an
+ETag, half of the monitors status-only and half with a keyword, and
+reports bytes received per check and checks per second for plain GETs
+(previous behaviour) and for the request strategy (HEAD for status-only
+monitors, conditional GETs reusing the keyword verdict on 304).
+
+Usage: python benchmarks/website_request_benchmark.py [--monitors 200] [--rounds 5] [--page-kb 256]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("CHECKER_LOG_LEVEL", "WARNING")
+
+from aiohttp import web
+
+import Main
+
+
+def page_app(page: bytes) -> web.Application:
+    async def handle(request: web.Request) -> web.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(body=page, headers={"ETag": '"v1"'}, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_route("*", "/{name}", handle)
+    return app
+
+
+async def run(port: int, monitors: int, rounds: int, strategy: bool) -> tuple:
+    checker = Main.MonitorChecker()
+    checker.request_strategy.head_enabled = strategy
+    checker.request_strategy.conditional_enabled = strategy
+    targets = [
+        Main.Monitor(
+            id=i,
+            label="bench",
+            monitor_type="website",
+            periodicity=60,
+            url=f"http://127.0.0.1:{port}/page{i}",
+            check_status=True,
+            keywords=["needle"] if i % 2 else [],
+        )
+        for i in range(monitors)
+    ]
+    semaphore = asyncio.Semaphore(50)
+
+    async def check(monitor):
+        async with semaphore:
+            return await checker._run_single_website_check(monitor)
+
+    received = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for result in await asyncio.gather(*(check(monitor) for monitor in targets)):
+            assert result.success, result.error
+            received += result.bytes_received
+    elapsed = time.perf_counter() - start
+    await checker.http_client.close()
+    checks = monitors * rounds
+    return received / checks, checks / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Website request benchmark")
+    parser.add_argument("--monitors", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--page-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    # The keyword sits at the end, keyword checks read the whole page
+    page = b"<html>" + b"x" * (args.page_kb * 1024) + b"needle</html>"
+    runner = web.AppRunner(page_app(page), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    print(f"{args.monitors} monitors (half with a keyword), {args.rounds} rounds, {args.page_kb} KB page")
+    print(f"{'requests':>18} {'bytes/check':>12} {'checks/s':>9}")
+    for label, strategy in (("GET", False), ("HEAD/conditional", True)):
+        per_check, rate = await run(port, args.monitors, args.rounds, strategy)
+        print(f"{label:>18} {per_check:>12.0f} {rate:>9.0f}")
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Body Reader - bounded, streaming evaluation of website response bodies
+
+Instead of buffering and decoding the whole page:
+- The body is read in chunks up to a configurable byte cap
+- Keywords are matched incrementally, also across chunk boundaries
+- Reading stops as soon as every keyword has been found
+- The body is decoded with the encoding aiohttp's text() would use (the
+  declared charset, UTF-8 for JSON), undeclared HTML is sniffed from a
+  BOM or <meta charset> before falling back to UTF-8
+"""
+
+import codecs
+import re
+from typing import List, Optional, Tuple
+
+from keywords import KeywordScanner, compile_keywords
+
+# Bytes searched for a <meta charset> declaration (as browsers prescan)
+META_PRESCAN_BYTES = 1024
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _codec_name(name) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.decode("ascii") if isinstance(name, bytes) else name).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def body_encoding(response, head: bytes) -> str:
+    """Encoding of a response body from its headers and first bytes"""
+    encoding = _codec_name(response.charset)
+    if encoding:
+        return encoding
+
+    content_type = (response.headers.get("Content-Type") or "").lower()
+    if content_type.startswith(("application/json", "application/rdap+json")):
+        # RFC 7159: JSON is UTF-8 unless declared otherwise
+        return "utf-8"
+
+    for bom, bom_encoding in _BOMS:
+        if head.startswith(bom):
+            return bom_encoding
+    match = _META_CHARSET.search(head[:META_PRESCAN_BYTES])
+    return (match and _codec_name(match.group(1))) or "utf-8"
+
+
+async def read_missing_keywords(
+    response,
+    keywords: List[str],
+    max_bytes: int,
+    chunk_size: int = 65536,
+    scanner: Optional[KeywordScanner] = None,
+) -> Tuple[List[str], int]:
+    """Stream an aiohttp response body and return (missing keywords, bytes read)
+
+    Keywords that were not seen within the first max_bytes bytes are
+    reported as missing. Pass the scanner of a cached, compiled matcher to
+    avoid compiling the keywords again.
+    """
+    matcher = scanner or compile_keywords(keywords).scanner()
+    if matcher.done:
+        return [], 0
+
+    decoder = None
+    bytes_read = 0
+    while bytes_read < max_bytes:
+        chunk = await response.content.read(min(chunk_size, max_bytes - bytes_read))
+        if not chunk:
+            break
+        bytes_read += len(chunk)
+        if decoder is None:
+            # Chosen from the first chunk
+            decoder = codecs.getincrementaldecoder(body_encoding(response, chunk))(errors="replace")
+        matcher.feed(decoder.decode(chunk))
+        if matcher.done:
+            break
+
+    if decoder is not None and not matcher.done:
+        matcher.feed(decoder.decode(b"", final=True))
+
+    # Keep the configured order (and duplicates) of the keywords
+    missing = [k for k in keywords if k and k not in matcher.found]
+    return missing, bytes_read
@@ -0,0 +1,189 @@
+"""
+Change Feed - push notifications about created/updated monitors
+
+Sources push monitor ids into one feed that the checker consumes:
+- UnixSocketSource: newline/comma separated ids written to a local socket
+- RedisSource: ids published on a Redis (or compatible) pub/sub channel
+- PollingSource: fallback polling of monitor_updates (must_update = 1)
+"""
+
+import asyncio
+import logging
+import os
+import re
+from typing import Awaitable, Callable, Iterable, List, Optional, Set
+
+logger = logging.getLogger("monitor_checker")
+
+_ID_SEPARATOR = re.compile(r"[\s,;]+")
+
+
+def parse_monitor_ids(payload: str) -> List[int]:
+    """Parse monitor ids from a notification payload (e.g. "12", "12,13" or "12 13")"""
+    ids = []
+    for token in _ID_SEPARATOR.split(payload.strip()):
+        if token.isdigit():
+            ids.append(int(token))
+    return ids
+
+
+class ChangeSource:
+    """Base class for change feed sources"""
+
+    name = "source"
+
+    async def start(self, feed: "ChangeFeed"):
+        raise NotImplementedError
+
+    async def stop(self):
+        pass
+
+
+class ChangeFeed:
+    """Collects monitor ids from all sources and hands them out in coalesced batches"""
+
+    def __init__(self):
+        self.sources: List[ChangeSource] = []
+        self._pending: Set[int] = set()
+        self._event = asyncio.Event()
+
+    def add_source(self, source: ChangeSource):
+        self.sources.append(source)
+
+    def notify(self, monitor_ids: Iterable[int]):
+        """Mark monitors as changed (safe to call from any source)"""
+        before = len(self._pending)
+        self._pending.update(monitor_ids)
+        if len(self._pending) != before:
+            self._event.set()
+
+    async def next_batch(self, timeout: Optional[float] = None) -> Set[int]:
+        """Wait for changed monitors and return all of them at once"""
+        if not self._pending:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return set()
+        batch, self._pending = self._pending, set()
+        return batch
+
+    async def start(self):
+        for source in self.sources:
+            try:
+                await source.start(self)
+                logger.info(f"Change feed source started: {source.name}")
+            except Exception as e:
+                logger.error(f"Failed to start change feed source {source.name}: {e}")
+
+    async def stop(self):
+        for source in self.sources:
+            try:
+                await source.stop()
+            except Exception as e:
+                logger.error(f"Failed to stop change feed source {source.name}: {e}")
+
+
+class UnixSocketSource(ChangeSource):
+    """Accepts monitor ids on a local Unix socket (one or more per line)"""
+
+    name = "unix"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, feed: ChangeFeed):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                while line := await reader.readline():
+                    feed.notify(parse_monitor_ids(line.decode(errors="ignore")))
+            finally:
+                writer.close()
+
+        self._server = await asyncio.start_unix_server(handle, path=self.path)
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class RedisSource(ChangeSource):
+    """Subscribes to a Redis pub/sub channel carrying monitor ids"""
+
+    name = "redis"
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self._client = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, feed: ChangeFeed):
+        # Optional dependency, only needed when the redis source is enabled
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(self.url)
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(self.channel)
+
+        async def listen():
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode(errors="ignore")
+                feed.notify(parse_monitor_ids(str(data)))
+
+        self._task = asyncio.create_task(listen())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+class PollingSource(ChangeSource):
+    """Fallback source polling the DB for pending monitor updates"""
+
+    name = "poll"
+
+    def __init__(self, fetch: Callable[[], Awaitable[List[int]]], interval: float):
+        self.fetch = fetch
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, feed: ChangeFeed):
+        async def poll():
+            while True:
+                try:
+                    feed.notify(await self.fetch())
+                except Exception as e:
+                    logger.error(f"Failed to poll monitor updates: {e}")
+                await asyncio.sleep(self.interval)
+
+        self._task = asyncio.create_task(poll())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
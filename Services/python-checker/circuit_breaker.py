@@ -0,0 +1,123 @@
+"""
+Circuit Breaker - keeps targets that keep failing away from the healthy checks
+
+When a datacenter goes dark, hundreds of unreachable targets would each hold
+a check slot for the full timeout on every period and starve the healthy
+checks. Checks of such targets keep running at the monitor's periodicity
+(outages are logged exactly as before), they just run somewhere else and,
+when needed, cost less:
+- Consecutive unreachable results (timeouts, connection errors, no HTTP
+  answer) are counted per target: host:port for ping, the URL's host for
+  website monitors. Any answer resets the count
+- After CIRCUIT_FAILURE_THRESHOLD of them the circuit opens: checks of the
+  target run in a low-priority lane with its own concurrency
+  (CIRCUIT_LANE_CONCURRENCY), so they never take slots from healthy checks
+- The timeout is only shortened when the lane could not check every open
+  target once per period with the full one, and never below
+  CIRCUIT_TIMEOUT_FACTOR of it. A shortened timeout can only turn a slow
+  answer into a failure, never hide one, so no outage is missed
+- Trial checks with the full timeout run with exponential backoff
+  (CIRCUIT_TRIAL_INTERVAL doubling up to CIRCUIT_MAX_TRIAL_INTERVAL), a
+  target that comes back slower than the shortened timeout is noticed on
+  the next trial, one answering faster right away
+- A successful check closes the circuit, the next checks run in the normal
+  pools again
+"""
+
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger("monitor_checker")
+
+
+class _Circuit:
+    __slots__ = ("failures", "trial_interval", "next_trial", "updated")
+
+    def __init__(self):
+        self.failures = 0
+        self.trial_interval = 0.0
+        self.next_trial = 0.0
+        self.updated = time.monotonic()
+
+
+class CircuitBreaker:
+    """Consecutive failures and open circuits per check target"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        lane_concurrency: int = 50,
+        timeout_factor: float = 0.25,
+        trial_interval: float = 60,
+        max_trial_interval: float = 300,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.lane_concurrency = max(1, lane_concurrency)
+        self.timeout_factor = min(1.0, max(0.0, timeout_factor))
+        self.trial_interval = trial_interval
+        self.max_trial_interval = max(trial_interval, max_trial_interval)
+        self._circuits: Dict[str, _Circuit] = {}
+        self._open = 0
+        self.stats = {"opened": 0, "closed": 0, "trials": 0, "short_checks": 0}
+
+    def is_open(self, target: str) -> bool:
+        circuit = self._circuits.get(target)
+        return circuit is not None and circuit.failures >= self.failure_threshold
+
+    def timeout(self, target: str, timeout: float, periodicity: float) -> float:
+        """Timeout of the next check of a target
+
+        Full while the circuit is closed and on trials. Otherwise the time
+        each open target may take so the lane still checks all of them
+        once per period, bounded by timeout_factor and the full timeout.
+        """
+        if not self.is_open(target):
+            return timeout
+        circuit = self._circuits[target]
+        now = time.monotonic()
+        if now >= circuit.next_trial:
+            circuit.next_trial = now + circuit.trial_interval
+            circuit.trial_interval = min(self.max_trial_interval, circuit.trial_interval * 2)
+            self.stats["trials"] += 1
+            return timeout
+
+        budget = self.lane_concurrency * periodicity / max(1, self._open)
+        if budget >= timeout:
+            return timeout
+        self.stats["short_checks"] += 1
+        return max(timeout * self.timeout_factor, budget)
+
+    def record(self, target: str, reachable: bool):
+        """Count a check result, reachable means the target answered at all"""
+        if reachable:
+            circuit = self._circuits.pop(target, None)
+            if circuit is not None and circuit.failures >= self.failure_threshold:
+                self._open -= 1
+                self.stats["closed"] += 1
+                logger.info(f"Circuit closed for {target}")
+            return
+
+        circuit = self._circuits.get(target)
+        if circuit is None:
+            circuit = self._circuits[target] = _Circuit()
+        circuit.failures += 1
+        circuit.updated = time.monotonic()
+        if circuit.failures == self.failure_threshold:
+            circuit.next_trial = circuit.updated + self.trial_interval
+            circuit.trial_interval = min(self.max_trial_interval, self.trial_interval * 2)
+            self._open += 1
+            self.stats["opened"] += 1
+            logger.warning(f"Circuit opened for {target} after {circuit.failures} failed checks")
+
+    def prune(self, max_age: float) -> int:
+        """Drop targets without results for max_age seconds (no longer checked)"""
+        cutoff = time.monotonic() - max_age
+        stale = [target for target, circuit in self._circuits.items() if circuit.updated < cutoff]
+        for target in stale:
+            if self._circuits.pop(target).failures >= self.failure_threshold:
+                self._open -= 1
+        return len(stale)
+
+    def open_count(self) -> int:
+        return self._open
@@ -0,0 +1,250 @@
+"""
+Host Dispatcher - per-host fairness for website checks
+
+Replaces the single global semaphore, so one slow origin can no longer
+occupy every check slot:
+- Checks are queued per host and started round-robin across hosts
+- A global cap still bounds the total number of checks in flight
+- Every host has an AIMD concurrency limit: it grows by one per window of
+  healthy checks and is cut on overload answers (429/503) or rising latency
+- Checks without an answer (timeout, refused connection, DNS error) are no
+  overload signal, they mark the host unreachable instead: its limit is
+  raised to the number of its due checks, so they finish in one timeout
+  instead of running one after another
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("monitor_checker")
+
+# Latency above the host's baseline by this factor counts as congestion
+LATENCY_BACKOFF = 0.9
+# Latency signals below this (ms) are treated as noise
+LATENCY_FLOOR_MS = 50.0
+# How fast the latency baseline drifts up towards slower responses
+BASELINE_DRIFT = 0.01
+
+
+class AIMDLimit:
+    """Additive-increase / multiplicative-decrease concurrency limit of one host"""
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        # Smoothed lowest latency seen (ms)
+        self.baseline: Optional[float] = None
+
+    def __int__(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def on_success(self, latency_ms: float):
+        """Grow by one per window of checks, or back off gently when latency climbs"""
+        if self.baseline is None or latency_ms < self.baseline:
+            self.baseline = latency_ms
+        else:
+            self.baseline += (latency_ms - self.baseline) * BASELINE_DRIFT
+
+        threshold = max(self.baseline * self.latency_tolerance, self.baseline + LATENCY_FLOOR_MS)
+        if latency_ms > threshold:
+            self.limit = max(self.min_limit, self.limit * LATENCY_BACKOFF)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_overload(self):
+        """Overload response of a live server"""
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+
+class _HostState:
+    __slots__ = ("host", "queue", "in_flight", "limit", "unreachable")
+
+    def __init__(self, host: str, limit: AIMDLimit, unreachable: bool = False):
+        self.host = host
+        self.queue: Deque[Tuple["_Batch", Any]] = deque()
+        self.in_flight = 0
+        self.limit = limit
+        # The last check got no answer, the limit does not apply
+        self.unreachable = unreachable
+
+    def capacity(self) -> int:
+        """Checks the host may have in flight"""
+        if self.unreachable:
+            return max(int(self.limit), self.in_flight + len(self.queue))
+        return int(self.limit)
+
+
+class _Batch:
+    __slots__ = ("handle", "outcome", "remaining", "done", "tasks", "cancelled")
+
+    def __init__(self, handle, outcome, remaining: int):
+        self.handle = handle
+        self.outcome = outcome
+        self.remaining = remaining
+        self.done = asyncio.get_running_loop().create_future()
+        self.tasks: Set[asyncio.Task] = set()
+        self.cancelled = False
+
+
+class HostDispatcher:
+    """Runs checks with per-host round-robin queues and adaptive per-host limits"""
+
+    def __init__(
+        self,
+        host_of: Callable[[Any], str],
+        max_concurrency: int = 100,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        latency_tolerance: float = 2.0,
+        assume_unreachable: bool = False,
+    ):
+        self.host_of = host_of
+        self.max_concurrency = max_concurrency
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        # New hosts start as unreachable (their targets are known to be failing)
+        self.assume_unreachable = assume_unreachable
+
+        self.in_flight = 0
+        self._hosts: Dict[str, _HostState] = {}
+        # Hosts with queued checks and a free slot, served round-robin
+        self._ready: Deque[_HostState] = deque()
+        self._in_ready: Set[str] = set()
+
+    async def run(
+        self,
+        items: List[Any],
+        handle: Callable[[Any], Awaitable[Any]],
+        outcome: Callable[[Any], Tuple[Optional[float], bool]],
+    ):
+        """Run handle(item) for every item and wait until all of them finished
+
+        outcome(result) returns (latency in ms, overloaded) and drives the
+        limit of the item's host, (None, False) means the check got no answer.
+        """
+        if not items:
+            return
+        batch = _Batch(handle, outcome, len(items))
+        for item in items:
+            state = self._state(self.host_of(item))
+            state.queue.append((batch, item))
+            self._mark_ready(state)
+        self._pump()
+
+        try:
+            await asyncio.shield(batch.done)
+        except asyncio.CancelledError:
+            batch.cancelled = True
+            for task in list(batch.tasks):
+                task.cancel()
+            raise
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            limit = AIMDLimit(
+                self.initial_limit,
+                self.min_limit,
+                self.max_limit,
+                latency_tolerance=self.latency_tolerance,
+            )
+            state = self._hosts[host] = _HostState(host, limit, self.assume_unreachable)
+        return state
+
+    def _mark_ready(self, state: _HostState):
+        if state.queue and state.in_flight < state.capacity() and state.host not in self._in_ready:
+            self._in_ready.add(state.host)
+            self._ready.append(state)
+
+    def _pump(self):
+        """Start queued checks round-robin while global and per-host slots are free"""
+        while self._ready and self.in_flight < self.max_concurrency:
+            state = self._ready.popleft()
+            self._in_ready.discard(state.host)
+
+            while state.queue:
+                batch, item = state.queue.popleft()
+                if batch.cancelled:
+                    continue
+                state.in_flight += 1
+                self.in_flight += 1
+                task = asyncio.create_task(self._run_one(state, batch, item))
+                batch.tasks.add(task)
+                break
+
+            # Back to the end of the ring if it can take another check
+            self._mark_ready(state)
+            self._forget_if_idle(state)
+
+    async def _run_one(self, state: _HostState, batch: _Batch, item: Any):
+        try:
+            result = await batch.handle(item)
+            latency_ms, overloaded = batch.outcome(result)
+            if overloaded:
+                state.unreachable = False
+                state.limit.on_overload()
+            elif latency_ms is not None:
+                state.unreachable = False
+                state.limit.on_success(latency_ms)
+            else:
+                state.unreachable = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failing handler says nothing about the host, the limit stays
+            logger.error(f"Dispatched check for {state.host} failed: {e}")
+        finally:
+            state.in_flight -= 1
+            self.in_flight -= 1
+            batch.tasks.discard(asyncio.current_task())
+            batch.remaining -= 1
+            if batch.remaining == 0 and not batch.done.done():
+                batch.done.set_result(None)
+            self._mark_ready(state)
+            self._forget_if_idle(state)
+            self._pump()
+
+    def _forget_if_idle(self, state: _HostState):
+        """Drop idle hosts that learned nothing worth keeping (bounded memory)"""
+        if (
+            not state.queue
+            and state.in_flight == 0
+            and state.limit.limit >= self.initial_limit
+            and state.unreachable == self.assume_unreachable
+            and state.host not in self._in_ready
+        ):
+            self._hosts.pop(state.host, None)
+
+    def host_stats(self) -> Dict[str, Dict[str, float]]:
+        """In-flight checks, queued checks and current limit per tracked host"""
+        return {
+            host: {
+                "in_flight": state.in_flight,
+                "queued": len(state.queue),
+                "limit": round(state.limit.limit, 2),
+            }
+            for host, state in self._hosts.items()
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "hosts": len(self._hosts),
+            "queued": sum(len(state.queue) for state in self._hosts.values()),
+        }
@@ -0,0 +1,203 @@
+"""
+DNS Cache - shared async resolver for ping and website checks
+
+Every check used to resolve its host again through the threaded
+getaddrinfo, which saturates the default executor with thousands of
+monitors and is counted into the measured response time:
+- Answers are cached for their record TTL (aiodns when installed, otherwise
+  getaddrinfo with a fixed TTL)
+- Failed lookups are cached for a short negative TTL
+- Concurrent lookups of the same host share one in-flight query
+- CachingResolver plugs the cache into the aiohttp connector
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp.abc import AbstractResolver
+
+try:
+    import aiodns
+except ImportError:  # Optional dependency, getaddrinfo is used instead
+    aiodns = None
+
+Address = Tuple[int, str]  # (family, ip)
+
+
+class DNSCache:
+    """TTL cache of resolved addresses with negative caching and request coalescing"""
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        negative_ttl: float = 30,
+        min_ttl: float = 5,
+        max_ttl: float = 3600,
+        max_entries: int = 100000,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.max_entries = max_entries
+
+        # (host, family) -> (expires at, addresses or (errno, message) of the failure)
+        self._entries: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+        self._pending: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._resolver = None
+        self._stats = {"hits": 0, "misses": 0, "negative_hits": 0, "coalesced": 0}
+
+    async def resolve(self, host: str, family: int = socket.AF_UNSPEC) -> List[Address]:
+        """Return the addresses of a host, from the cache when possible"""
+        literal = self._literal(host)
+        if literal:
+            return [literal]
+
+        key = (host.lower(), family)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                if isinstance(value, list):
+                    self._stats["hits"] += 1
+                    return value
+                self._stats["negative_hits"] += 1
+                raise socket.gaierror(*value)
+            del self._entries[key]
+
+        pending = self._pending.get(key)
+        if pending is None:
+            self._stats["misses"] += 1
+            # The lookup runs as its own task, so a caller that gives up (ping
+            # timeout) does not cancel it for the others
+            pending = self._pending[key] = asyncio.ensure_future(self._lookup_and_store(key))
+            pending.add_done_callback(partial(self._lookup_done, key))
+        else:
+            self._stats["coalesced"] += 1
+        return await asyncio.shield(pending)
+
+    def _lookup_done(self, key: Tuple[str, int], task: asyncio.Future):
+        self._pending.pop(key, None)
+        if not task.cancelled():
+            # Mark the failure as retrieved when every caller gave up already
+            task.exception()
+
+    async def _lookup_and_store(self, key: Tuple[str, int]) -> List[Address]:
+        try:
+            addresses, ttl = await self._lookup(*key)
+        except Exception as e:
+            error = (
+                (e.errno, e.strerror)
+                if isinstance(e, socket.gaierror) and e.errno is not None
+                else (socket.EAI_NONAME, str(e))
+            )
+            self._store(key, self.negative_ttl, error)
+            raise socket.gaierror(*error) from e
+        self._store(key, min(self.max_ttl, max(self.min_ttl, ttl)), addresses)
+        return addresses
+
+    @staticmethod
+    def _literal(host: str) -> Optional[Address]:
+        try:
+            ip = ipaddress.ip_address(host.strip("[]"))
+        except ValueError:
+            return None
+        return (socket.AF_INET6 if ip.version == 6 else socket.AF_INET, str(ip))
+
+    def _store(self, key: Tuple[str, int], ttl: float, value: Any):
+        if len(self._entries) >= self.max_entries:
+            # Drop the oldest entry (dicts keep insertion order)
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    async def _lookup(self, host: str, family: int) -> Tuple[List[Address], float]:
+        if aiodns is not None:
+            try:
+                return await self._lookup_aiodns(host, family)
+            except socket.gaierror:
+                # Names from /etc/hosts are not visible to DNS queries
+                pass
+
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, None, family=family, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys((info[0], info[4][0]) for info in infos))
+        return addresses, self.ttl
+
+    async def _query(self, host: str, record: str) -> List[Tuple[str, int]]:
+        """(address, ttl) pairs of the A or AAAA records of a host"""
+        if hasattr(self._resolver, "query_dns"):
+            result = await self._resolver.query_dns(host, record)
+            return [
+                (answer.data.addr, answer.ttl)
+                for answer in result.answer
+                if hasattr(answer.data, "addr")
+            ]
+        # aiodns < 4
+        return [(answer.host, answer.ttl) for answer in await self._resolver.query(host, record)]
+
+    async def _lookup_aiodns(self, host: str, family: int) -> Tuple[List[Address], float]:
+        """Query A/AAAA records directly to get their TTL"""
+        if self._resolver is None:
+            self._resolver = aiodns.DNSResolver()
+
+        queries = []
+        if family in (socket.AF_UNSPEC, socket.AF_INET):
+            queries.append((socket.AF_INET, "A"))
+        if family in (socket.AF_UNSPEC, socket.AF_INET6):
+            queries.append((socket.AF_INET6, "AAAA"))
+
+        answers = await asyncio.gather(
+            *(self._query(host, record) for _, record in queries),
+            return_exceptions=True,
+        )
+        addresses: List[Address] = []
+        ttls = []
+        errors = []
+        for (record_family, _), answer in zip(queries, answers):
+            if isinstance(answer, Exception):
+                errors.append(answer)
+                continue
+            for address, ttl in answer:
+                addresses.append((record_family, address))
+                ttls.append(ttl)
+
+        if not addresses:
+            message = str(errors[0]) if errors else "No address records"
+            raise socket.gaierror(socket.EAI_NONAME, f"{host}: {message}")
+        return addresses, min(ttls)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "entries": len(self._entries), "in_flight": len(self._pending)}
+
+
+class CachingResolver(AbstractResolver):
+    """aiohttp resolver backed by the shared DNSCache"""
+
+    def __init__(self, cache: DNSCache):
+        self.cache = cache
+
+    async def resolve(
+        self, host: str, port: int = 0, family: int = socket.AF_INET
+    ) -> List[Dict[str, Any]]:
+        addresses = await self.cache.resolve(host, family)
+        return [
+            {
+                "hostname": host,
+                "host": address,
+                "port": port,
+                "family": address_family,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+            }
+            for address_family, address in addresses
+        ]
+
+    async def close(self):
+        # The cache is shared with the ping checks and outlives the session
+        pass
+
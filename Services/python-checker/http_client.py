@@ -0,0 +1,332 @@
+"""
+HTTP Client - connection management for website checks
+
+Website checks go through a client backend that owns the connection pool:
+- The pool lives as long as the checker, a closed session is recreated on
+  the same connector instead of throwing the pooled connections away
+- Connections are pooled per origin (scheme, host, port) with a per-origin
+  cap, idle connections are kept for a configurable keep-alive time (long
+  enough to be reused across check periods)
+- fresh mode opens a new connection for every request, checks then measure
+  cold-connection latency (connect/tls every time) instead of warm probes
+- aiohttp (HTTP/1.1) is the default backend, httpx multiplexes the checks
+  of an origin over one HTTP/2 connection (pip install "httpx[http2]")
+- pool_stats() reports the pool size, connections in use and idle, origins
+  and how many requests opened a new connection or reused one
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from tracing import PhaseTimings, phase_trace_config, unverified_ssl_context
+
+logger = logging.getLogger("monitor_checker")
+
+USER_AGENT = "MonitorChecker/2.0 (Python)"
+
+
+@dataclass(slots=True)
+class ClientOptions:
+    """Pool and timeout settings shared by the backends"""
+
+    timeout: float = 5
+    limit: int = 100
+    limit_per_origin: int = 20
+    keepalive_timeout: float = 75
+    # reuse (keep-alive pool) or fresh (new connection per request)
+    connections: str = "reuse"
+
+    @property
+    def fresh(self) -> bool:
+        return self.connections == "fresh"
+
+
+class HTTPBackend:
+    """Interface of the website check HTTP clients
+
+    request() is an async context manager yielding a response with the
+    aiohttp attributes the checks use: status, reason, headers,
+    raw_headers, charset and content (read(n), total_bytes). timeout
+    overrides the total timeout of the options for one request.
+    """
+
+    name = "base"
+
+    def __init__(self, options: ClientOptions):
+        self.options = options
+        self.stats = {"connections_created": 0, "connections_reused": 0}
+
+    async def start(self):
+        """Create the pool (called on first use)"""
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timings: PhaseTimings,
+        timeout: Optional[float] = None,
+    ):
+        raise NotImplementedError
+
+    def pool_stats(self) -> Dict[str, int]:
+        """limit, in_use, idle and origins of the pool (empty before start)"""
+        return {}
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class AiohttpBackend(HTTPBackend):
+    """aiohttp session on a long-lived TCPConnector (HTTP/1.1)"""
+
+    name = "aiohttp"
+
+    def __init__(self, options: ClientOptions, resolver: Optional[aiohttp.abc.AbstractResolver] = None):
+        super().__init__(options)
+        self.resolver = resolver
+        # Certificates are not verified (ssl=False), the context times the TLS handshake
+        self.ssl_context = unverified_ssl_context()
+        self.connector: Optional[aiohttp.TCPConnector] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _create_connector(self) -> aiohttp.TCPConnector:
+        options = self.options
+        kwargs: Dict[str, Any] = {}
+        if options.fresh:
+            kwargs["force_close"] = True
+        else:
+            kwargs["keepalive_timeout"] = options.keepalive_timeout
+        return aiohttp.TCPConnector(
+            limit=options.limit,
+            # Per-host concurrency is enforced by the website dispatcher
+            limit_per_host=options.limit_per_origin,
+            # Names are cached (TTL aware) by the resolver shared with ping checks
+            resolver=self.resolver,
+            use_dns_cache=self.resolver is None,
+            **kwargs,
+        )
+
+    def _pool_trace_config(self) -> aiohttp.TraceConfig:
+        async def on_connection_create_end(session, context, params):
+            self.stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats["connections_reused"] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """The session, a closed one is replaced on the same connector"""
+        if self._session is None or self._session.closed:
+            if self.connector is None or self.connector.closed:
+                self.connector = self._create_connector()
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.options.timeout),
+                connector=self.connector,
+                connector_owner=False,
+                trace_configs=[phase_trace_config(), self._pool_trace_config()],
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._session
+
+    async def start(self):
+        self.get_session()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timings: PhaseTimings,
+        timeout: Optional[float] = None,
+    ):
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        return self.get_session().request(
+            method, url, ssl=self.ssl_context, headers=headers, trace_request_ctx=timings, **kwargs
+        )
+
+    def pool_stats(self) -> Dict[str, int]:
+        connector = self.connector
+        if connector is None or connector.closed:
+            return {}
+        # aiohttp keeps idle connections in _conns and handed out ones in _acquired
+        idle = getattr(connector, "_conns", {})
+        acquired = getattr(connector, "_acquired_per_host", {})
+        origins = {key for key, conns in idle.items() if conns}
+        origins.update(key for key, conns in acquired.items() if conns)
+        return {
+            "limit": connector.limit,
+            "in_use": len(getattr(connector, "_acquired", ())),
+            "idle": sum(len(conns) for conns in idle.values()),
+            "origins": len(origins),
+        }
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        if self.connector and not self.connector.closed:
+            await self.connector.close()
+
+
+class _HttpxContent:
+    """aiohttp StreamReader-like read(n) on top of an httpx byte stream"""
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+
+    async def read(self, n: int = -1) -> bytes:
+        if not self._buffer:
+            try:
+                self._buffer = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        if n < 0:
+            n = len(self._buffer)
+        chunk, self._buffer = self._buffer[:n], self._buffer[n:]
+        return chunk
+
+    @property
+    def total_bytes(self) -> int:
+        return self._response.num_bytes_downloaded
+
+
+class _HttpxResponse:
+    """The aiohttp response attributes used by the checks"""
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.raw_headers = response.headers.raw
+        self.charset = response.charset_encoding
+        self.content = _HttpxContent(response)
+
+
+class HttpxBackend(HTTPBackend):
+    """httpx AsyncClient with HTTP/2, requests to an origin share one connection
+
+    httpx resolves names itself, the dns phase is part of connect here.
+    """
+
+    name = "httpx"
+
+    def __init__(self, options: ClientOptions, http2: bool = True):
+        super().__init__(options)
+        self.http2 = http2
+        # httpx sets the ALPN protocols on the context, don't share it
+        self.ssl_context = unverified_ssl_context()
+        self.client = None
+
+    async def start(self):
+        if self.client is not None:
+            return
+        # Optional dependency, only needed when this backend is selected
+        import httpx
+
+        # Streams of an HTTP/2 connection are multiplexed, fresh connections need HTTP/1.1
+        http2 = self.http2 and not self.options.fresh
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning('HTTP/2 disabled, the h2 package is missing (pip install "httpx[http2]")')
+                http2 = False
+
+        options = self.options
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            verify=self.ssl_context,
+            timeout=httpx.Timeout(options.timeout),
+            limits=httpx.Limits(
+                max_connections=options.limit,
+                max_keepalive_connections=0 if options.fresh else options.limit,
+                keepalive_expiry=0 if options.fresh else options.keepalive_timeout,
+            ),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    def _trace(self, timings: PhaseTimings):
+        async def trace(event: str, info: Dict[str, Any]):
+            if event == "connection.connect_tcp.started":
+                timings.connect_started = time.monotonic()
+            elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                timings.connected = time.monotonic()
+                if event == "connection.connect_tcp.complete":
+                    self.stats["connections_created"] += 1
+
+        return trace
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        timings: PhaseTimings,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[_HttpxResponse]:
+        if self.client is None:
+            await self.start()
+        kwargs: Dict[str, Any] = {}
+        if timeout is not None:
+            kwargs["timeout"] = self._httpx.Timeout(timeout)
+        else:
+            timeout = self.options.timeout
+        try:
+            # The total timeout of the aiohttp backend (httpx times each operation)
+            async with asyncio.timeout(timeout):
+                async with self.client.stream(
+                    method, url, headers=headers, extensions={"trace": self._trace(timings)}, **kwargs
+                ) as response:
+                    # No connect events: the request went over a pooled connection
+                    if timings.connect_started is None:
+                        self.stats["connections_reused"] += 1
+                    yield _HttpxResponse(response)
+                    # httpx only returns a connection to the pool after the end of
+                    # the response was read, which costs nothing without a body
+                    if method == "HEAD" or response.status_code in (204, 304):
+                        await response.aread()
+        except self._httpx.TimeoutException as e:
+            raise asyncio.TimeoutError() from e
+
+    def pool_stats(self) -> Dict[str, int]:
+        if self.client is None:
+            return {}
+        # httpcore's pool of the default transport
+        connections = getattr(getattr(self.client._transport, "_pool", None), "connections", [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "limit": self.options.limit,
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "origins": len({str(getattr(connection, "_origin", "")) for connection in connections}),
+        }
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+
+def create_http_backend(name: str, options: ClientOptions, resolver=None) -> HTTPBackend:
+    """Create the website check HTTP client selected by HTTP_BACKEND"""
+    if name == "aiohttp":
+        return AiohttpBackend(options, resolver)
+    if name == "httpx":
+        return HttpxBackend(options)
+    raise ValueError(f"Unsupported HTTP backend: {name}")
@@ -0,0 +1,193 @@
+"""
+Keyword Engine - compiled multi-pattern keyword matching
+
+A monitor's keywords are compiled once and found in a single pass over
+the page (also when it is streamed in chunks):
+- exact: Aho-Corasick automaton (pyahocorasick when installed, otherwise a
+  compiled regex alternation), plain substring search for a few keywords
+  where C-level `in` beats any single-pass engine
+- ignore_case: same engines on case-folded text (the text is folded once
+  per chunk, the kept overlap is measured on the folded text)
+- regex: every keyword is a regular expression
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    import ahocorasick
+except ImportError:  # Optional dependency, the regex engine is used instead
+    ahocorasick = None
+
+MATCH_MODES = ("exact", "ignore_case", "regex")
+
+# Text kept between chunks for regex keywords (their length is unbounded)
+REGEX_OVERLAP = 1024
+
+# Up to this many keywords, per-keyword substring search is the fastest
+SUBSTRING_MAX_KEYWORDS = 8
+
+
+class KeywordScanner:
+    """Matching state for one response body"""
+
+    def __init__(self, matcher: "KeywordMatcher"):
+        self.matcher = matcher
+        self.remaining: Set[str] = set(matcher.keywords)
+        self.found: Set[str] = set()
+        self._tail = ""
+
+    @property
+    def done(self) -> bool:
+        return not self.remaining
+
+    def feed(self, text: str):
+        """Match the next chunk of text (keywords split across chunks are found too)"""
+        if self.done:
+            return
+        window = self._tail + self.matcher.fold(text)
+        for keyword in self.matcher.find(window, self.remaining):
+            self.remaining.discard(keyword)
+            self.found.add(keyword)
+        overlap = self.matcher.overlap
+        self._tail = window[-overlap:] if overlap else ""
+
+
+class KeywordMatcher:
+    """Compiled keywords of one monitor"""
+
+    mode = "exact"
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        self.ignore_case = ignore_case
+        # Keywords as searched for, the overlap is measured on the same representation
+        self._keys: Dict[str, str] = {k: self.fold(k) for k in self.keywords}
+        self.overlap = max((len(k) for k in self._keys.values()), default=1) - 1
+
+    def fold(self, text: str) -> str:
+        """The text in the representation the keywords are searched in"""
+        return text.casefold() if self.ignore_case else text
+
+    def find(self, text: str, remaining: Set[str]) -> Set[str]:
+        """Return the keywords from remaining that occur in text (already folded)"""
+        raise NotImplementedError
+
+    def scanner(self) -> KeywordScanner:
+        return KeywordScanner(self)
+
+    def missing(self, text: str) -> List[str]:
+        """Keywords that do not occur in a complete text"""
+        scanner = self.scanner()
+        scanner.feed(text)
+        return [k for k in self.keywords if k not in scanner.found]
+
+
+class SubstringMatcher(KeywordMatcher):
+    """Per-keyword substring search, fastest for a handful of keywords"""
+
+    def find(self, text: str, remaining: Set[str]) -> Set[str]:
+        return {k for k in remaining if self._keys[k] in text}
+
+
+class AhoCorasickMatcher(KeywordMatcher):
+    """Single pass Aho-Corasick automaton (pyahocorasick)"""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        super().__init__(keywords, ignore_case)
+        self.automaton = ahocorasick.Automaton()
+        for keyword, key in self._keys.items():
+            existing = self.automaton.get(key, ())
+            self.automaton.add_word(key, existing + (keyword,))
+        self.automaton.make_automaton()
+
+    def find(self, text: str, remaining: Set[str]) -> Set[str]:
+        found = set()
+        for _, keywords in self.automaton.iter(text):
+            found.update(keywords)
+            if len(found) >= len(remaining) and remaining <= found:
+                break
+        return found & remaining
+
+
+class AlternationMatcher(KeywordMatcher):
+    """Single pass using one compiled regex alternation of all keywords
+
+    A zero-width lookahead tries the alternatives (longest first) at every
+    position, so overlapping keywords are found. A keyword hidden behind a
+    longer one starting at the same position is a substring of it, so it
+    is reported through the precomputed substring closure.
+    """
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        super().__init__(keywords, ignore_case)
+        self._lookup: Dict[str, List[str]] = {}
+        for keyword, key in self._keys.items():
+            self._lookup.setdefault(key, []).append(keyword)
+        ordered = sorted(self._lookup, key=len, reverse=True)
+        self.pattern = re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))")
+        self._implied: Dict[str, Set[str]] = {
+            key: {other for other in self._lookup if other in key}
+            for key in self._lookup
+        }
+
+    def find(self, text: str, remaining: Set[str]) -> Set[str]:
+        found = set()
+        seen = set()
+        for match in self.pattern.finditer(text):
+            key = match.group(1)
+            if key in seen:
+                continue
+            seen.add(key)
+            for implied in self._implied.get(key, ()):
+                found.update(self._lookup[implied])
+            if remaining <= found:
+                break
+        return found & remaining
+
+
+class RegexMatcher(KeywordMatcher):
+    """Every keyword is a regular expression (matched on the raw text)"""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        # Case folding would change the patterns, IGNORECASE is used instead
+        super().__init__(keywords)
+        flags = re.IGNORECASE if ignore_case else 0
+        self.patterns = {keyword: re.compile(keyword, flags) for keyword in self.keywords}
+        self.overlap = REGEX_OVERLAP
+
+    def find(self, text: str, remaining: Set[str]) -> Set[str]:
+        return {k for k in remaining if self.patterns[k].search(text)}
+
+
+def compile_keywords(keywords: Iterable[str], mode: str = "exact") -> KeywordMatcher:
+    """Compile keywords for the given match mode"""
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unsupported keyword match mode: {mode}")
+
+    keywords = list(keywords)
+    if mode == "regex":
+        matcher = RegexMatcher(keywords)
+    elif len(keywords) <= SUBSTRING_MAX_KEYWORDS:
+        matcher = SubstringMatcher(keywords, mode == "ignore_case")
+    elif ahocorasick is not None:
+        matcher = AhoCorasickMatcher(keywords, mode == "ignore_case")
+    else:
+        matcher = AlternationMatcher(keywords, mode == "ignore_case")
+    matcher.mode = mode
+    return matcher
+
+
+def get_keyword_matcher(monitor, mode: str = "exact") -> Optional[KeywordMatcher]:
+    """Return the compiled keywords of a monitor, compiling them on first use
+
+    The matcher is cached on the Monitor. The registry replaces the Monitor
+    object whenever its configuration changes, which drops the cache.
+    """
+    if not monitor.keywords:
+        return None
+    matcher = monitor.keyword_matcher
+    if matcher is None or matcher.mode != mode:
+        matcher = compile_keywords(monitor.keywords, mode)
+        monitor.keyword_matcher = matcher
+    return matcher
@@ -0,0 +1,200 @@
+"""
+Log Pipeline - non-blocking log output and per-check log sampling
+
+Keeps formatting and stream writes off the event loop thread:
+- Records are handed to a bounded queue as they are (no formatting on the
+  caller's thread) and a QueueListener thread formats and writes them
+- A full queue drops records and counts them instead of blocking the loop
+- Colored text (default), plain text or one JSON object per line
+- CheckLogSampler decides which per-check lines are worth emitting:
+  status transitions always, failures always, successes sampled and/or
+  rate limited per monitor
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import time
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# Per-check fields passed with extra=... and emitted by the JSON formatter
+CHECK_FIELDS = (
+    "monitor_id",
+    "monitor_type",
+    "target",
+    "status",
+    "previous_status",
+    "response_time_ms",
+    "dns_time_ms",
+    "http_code",
+    "bytes_received",
+    "error",
+)
+
+
+class ColorFormatter(logging.Formatter):
+    COLORS = {
+        logging.DEBUG: "\033[94m",   # Blue
+        logging.INFO: "\033[92m",    # Green
+        logging.WARNING: "\033[93m", # Yellow
+        logging.ERROR: "\033[91m",   # Red
+        logging.CRITICAL: "\033[95m" # Magenta
+    }
+    RESET = "\033[0m"
+
+    def format(self, record):
+        color = self.COLORS.get(record.levelno, self.RESET)
+        # Add time to log output (HH:MM:SS)
+        log_time = self.formatTime(record, "%Y-%m-%d %H:%M:%S")
+        message = super().format(record)
+        return f"{color}[{log_time}] {message}{self.RESET}"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, check fields are emitted as their own keys"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        for name in CHECK_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock handler formats the message in prepare() on the calling
+    thread. Records only carry immutable values here, so they are queued
+    unchanged and dropped (counted) when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Queue, handler and listener thread attached to one logger"""
+
+    def __init__(self, logger: logging.Logger, log_format: str = "color", queue_size: int = 10000):
+        self.logger = logger
+        self.log_format = log_format
+        self.queue_size = queue_size
+        self.handler: Optional[DeferredQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+
+    def start(self):
+        """Route the logger through a fresh queue and listener thread"""
+        if self.handler is not None:
+            self.logger.removeHandler(self.handler)
+
+        output = logging.StreamHandler()
+        if self.log_format == "json":
+            output.setFormatter(JsonFormatter())
+        elif self.log_format == "plain":
+            output.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s - %(message)s"))
+        else:
+            output.setFormatter(ColorFormatter("%(levelname)s - %(message)s"))
+
+        self.handler = DeferredQueueHandler(queue.Queue(self.queue_size))
+        self.listener = QueueListener(self.handler.queue, output, respect_handler_level=True)
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+
+    def restart_after_fork(self):
+        """A forked child has the queue but not the listener thread, start over"""
+        self.listener = None
+        self.start()
+
+    def stop(self):
+        """Write the queued records and stop the listener thread"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped if self.handler else 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.handler.queue.qsize() if self.handler else 0
+
+
+class CheckLogSampler:
+    """Decides whether the log line of a check result should be emitted
+
+    - The first result of a monitor and every status change: always
+    - Failures: always
+    - Successes: with probability sample_rate, and at most once per
+      min_interval seconds per monitor (0 disables the limit)
+    """
+
+    def __init__(self, sample_rate: float = 1.0, min_interval: float = 0):
+        self.sample_rate = sample_rate
+        self.min_interval = min_interval
+        # monitor id -> (last success flag, monotonic time of the last success line)
+        self._state: Dict[int, Tuple[bool, float]] = {}
+        self.suppressed = 0
+
+    def should_log(self, monitor_id: int, success: bool) -> Tuple[bool, Optional[bool]]:
+        """(emit the line, previous success flag or None when the status did not change)"""
+        previous = self._state.get(monitor_id)
+        now = time.monotonic()
+        if previous is None or previous[0] != success:
+            self._state[monitor_id] = (success, now if success else 0.0)
+            return True, None if previous is None else previous[0]
+        if not success:
+            return True, None
+
+        last_logged = previous[1]
+        if (self.min_interval and now - last_logged < self.min_interval) or (
+            self.sample_rate < 1 and random.random() >= self.sample_rate
+        ):
+            self.suppressed += 1
+            return False, None
+        self._state[monitor_id] = (True, now)
+        return True, None
+
+    def forget(self, monitor_id: int):
+        self._state.pop(monitor_id, None)
+
+
+def configure_logging(logger: logging.Logger) -> LogPipeline:
+    """Set up the logger from CHECKER_LOG_LEVEL / LOG_FORMAT / LOG_QUEUE_SIZE"""
+    logger.setLevel(os.getenv("CHECKER_LOG_LEVEL", "DEBUG").upper())
+    pipeline = LogPipeline(
+        logger,
+        log_format=os.getenv("LOG_FORMAT", "color").lower(),
+        queue_size=int(os.getenv("LOG_QUEUE_SIZE", 10000)),
+    )
+    pipeline.start()
+    # Write what is still queued on exit
+    atexit.register(pipeline.stop)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=pipeline.restart_after_fork)
+    return pipeline
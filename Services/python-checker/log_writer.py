@@ -0,0 +1,113 @@
+"""
+Monitor Log Writer - write-behind buffer for monitor_logs inserts
+
+Check results are queued and flushed by a single background task as
+multi-row inserts:
+- Flushes when a batch is full or the flush interval has elapsed
+- Bounded queue applies backpressure to producers when the DB is slow
+- stop() drains every queued row before returning
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger("monitor_checker")
+
+LogRow = Tuple
+_STOP = object()
+
+
+class MonitorLogWriter:
+    """Buffers monitor_logs rows and writes them in batches"""
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[LogRow]], Awaitable[None]],
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        max_retries: int = 3,
+    ):
+        self.write_batch = write_batch
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "batches_written": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flusher"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, row: LogRow):
+        """Queue a row, waits while the queue is full (backpressure)"""
+        if not self.running:
+            self.start()
+        await self._queue.put(row)
+
+    async def stop(self):
+        """Flush all queued rows and stop the flusher"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[LogRow]):
+        """Write one batch, retrying with backoff before dropping it"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self.write_batch(batch)
+                self.stats["rows_written"] += len(batch)
+                self.stats["batches_written"] += 1
+                return
+            except Exception as e:
+                logger.error(
+                    f"Failed to write {len(batch)} monitor logs (attempt {attempt}/{self.max_retries}): {e}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+        self.stats["rows_dropped"] += len(batch)
@@ -0,0 +1,322 @@
+"""
+Metrics - Prometheus/OpenMetrics exporter for the checker
+
+Counters, gauges and histograms rendered in the Prometheus text format on
+a local HTTP endpoint (/metrics):
+- Recording is a plain attribute update on the event loop thread, no locks
+- Labelled children are created once and can be kept by the hot path
+- Gauges can be computed at scrape time from a callback (queue depth,
+  pool utilisation, ...)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger("monitor_checker")
+
+LabelValues = Tuple[str, ...]
+
+# Check durations and scheduling/loop lag (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        # Per bucket (not cumulative) counts, the last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A metric family with optional labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Child for the given label values (keep it to skip the lookup on hot paths)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self) -> Iterable[Tuple[str, LabelValues, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for name, values, value in self.samples():
+            labelnames = self.labelnames + (("le",) if len(values) > len(self.labelnames) else ())
+            lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonic counter, or a callback returning the current total"""
+
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        # Counter samples end in _total, HELP and TYPE use the same name
+        # (as prometheus_client exposes them)
+        if not name.endswith("_total"):
+            name = f"{name}_total"
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def samples(self):
+        if self.callback:
+            for values, value in self.callback().items():
+                yield self.name, values, value
+            return
+        for values, child in self._children.items():
+            yield self.name, values, child.value
+
+
+class Gauge(Metric):
+    """Value that goes up and down, or a callback evaluated at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def samples(self):
+        if self.callback:
+            try:
+                values = self.callback()
+            except Exception as e:
+                logger.debug(f"Metric {self.name} unavailable: {e}")
+                return
+            for labels, value in values.items():
+                yield self.name, labels, value
+            return
+        for labels, child in self._children.items():
+            yield self.name, labels, child.value
+
+
+class Histogram(Metric):
+    """Distribution over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self):
+        bounds = self.buckets + (math.inf,)
+        for labels, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + (_format_value(bound),), cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+class RateMeter:
+    """Events per second over a sliding window of periodic samples"""
+
+    def __init__(self, total: Callable[[], float], window: float = 60):
+        self.total = total
+        self.window = window
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def sample(self):
+        now = time.monotonic()
+        self._samples.append((now, self.total()))
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+    @property
+    def rate(self) -> float:
+        if len(self._samples) < 2:
+            return 0.0
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        return (last - first) / (end - start) if end > start else 0.0
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._metrics: List[Metric] = []
+
+    def _add(self, metric: Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Counter:
+        return self._add(Counter(self.prefix + name, documentation, labelnames, callback))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self._add(Gauge(self.prefix + name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(self.prefix + name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves a registry on http://host:port/metrics"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9102):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    async def _handle(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": self.registry.content_type},
+        )
+
+    async def start(self):
+        # aiohttp.web is only imported when the endpoint is enabled
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Metrics available on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def measure_loop_lag(interval: float = 0.5) -> float:
+    """Sleep for interval and return how much later than planned the loop woke up (seconds)"""
+    start = time.monotonic()
+    await asyncio.sleep(interval)
+    return max(0.0, time.monotonic() - start - interval)
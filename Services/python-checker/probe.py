@@ -0,0 +1,267 @@
+"""
+Probe Engine - multiplexed TCP connect and ICMP echo probes for ping monitors
+
+A lighter replacement for open_connection + wait_closed per ping check:
+- Non-blocking sockets registered directly with the event loop selector,
+  no StreamReader/StreamWriter pair per probe
+- Connections are reset right after the handshake (SO_LINGER 0), so there
+  is no FIN exchange and no TIME_WAIT socket left behind
+- One deadline heap and a single loop timer for every outstanding probe
+  instead of one wait_for per probe
+- Optional ICMP echo through one shared socket (unprivileged ping socket,
+  or a raw socket when running as root)
+"""
+
+import asyncio
+import errno
+import heapq
+import itertools
+import logging
+import os
+import socket
+import struct
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("monitor_checker")
+
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, 10035}  # 10035: WSAEWOULDBLOCK
+_LINGER_RESET = struct.pack("ii", 1, 0)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+
+class ProbeResult(NamedTuple):
+    success: bool
+    rtt: float  # seconds
+    error: Optional[str] = None
+
+
+class _Probe:
+    # started is time.monotonic() (round trip time), deadline is loop.time()
+    __slots__ = ("key", "future", "started", "deadline", "sock", "address")
+
+    def __init__(self, key, future, started, deadline, sock=None, address=None):
+        self.key = key
+        self.future = future
+        self.started = started
+        self.deadline = deadline
+        self.sock = sock
+        self.address = address
+
+
+class ProbeEngine:
+    """Outstanding probes with a shared deadline heap and one loop timer"""
+
+    def __init__(self):
+        self._pending: Dict[Any, _Probe] = {}
+        # (deadline, order, probe), keys like file descriptors get reused
+        self._deadlines: List[Tuple[float, int, _Probe]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _track(self, probe: _Probe):
+        self._pending[probe.key] = probe
+        heapq.heappush(self._deadlines, (probe.deadline, next(self._order), probe))
+        if self._timer is None or probe.deadline < self._timer.when():
+            self._arm_timer()
+        probe.future.add_done_callback(lambda _: self._abandon(probe))
+
+    def _arm_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._deadlines and not self._is_pending(self._deadlines[0][2]):
+            heapq.heappop(self._deadlines)
+        if self._deadlines:
+            self._timer = self._loop.call_at(self._deadlines[0][0], self._expire)
+
+    def _expire(self):
+        self._timer = None
+        now = self._loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, probe = heapq.heappop(self._deadlines)
+            if self._is_pending(probe):
+                self._finish(probe, ProbeResult(False, time.monotonic() - probe.started, "timeout"))
+        self._arm_timer()
+
+    def _is_pending(self, probe: _Probe) -> bool:
+        return self._pending.get(probe.key) is probe
+
+    def _finish(self, probe: _Probe, result: ProbeResult):
+        if not self._is_pending(probe):
+            return
+        del self._pending[probe.key]
+        self._release(probe)
+        if not probe.future.done():
+            probe.future.set_result(result)
+
+    def _abandon(self, probe: _Probe):
+        """The caller gave up (cancelled), release the probe's resources"""
+        if self._is_pending(probe):
+            del self._pending[probe.key]
+            self._release(probe)
+
+    def _release(self, probe: _Probe):
+        pass
+
+    def close(self):
+        for probe in list(self._pending.values()):
+            self._finish(probe, ProbeResult(False, 0.0, "probe engine closed"))
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class TCPProbeEngine(ProbeEngine):
+    """TCP connect probes multiplexed on the event loop selector"""
+
+    async def probe(self, address: str, port: int, family: int, timeout: float) -> ProbeResult:
+        """Connect to address:port, success when the handshake completes within timeout"""
+        self._loop = loop = asyncio.get_running_loop()
+        # Monitors without a port only get ICMP probes
+        if not port:
+            return ProbeResult(False, 0.0, "No port to connect to")
+
+        # loop.time() may be cached per iteration (uvloop), the rtt uses the monotonic clock
+        started = time.monotonic()
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            # Reset instead of FIN on close, no TIME_WAIT left behind
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            code = sock.connect_ex((address, port))
+        except OSError as e:
+            sock.close()
+            return ProbeResult(False, time.monotonic() - started, str(e))
+        except BaseException:
+            sock.close()
+            raise
+        if code == 0:
+            sock.close()
+            return ProbeResult(True, time.monotonic() - started)
+        if code not in _IN_PROGRESS:
+            sock.close()
+            return ProbeResult(False, time.monotonic() - started, os.strerror(code))
+
+        probe = _Probe(sock.fileno(), loop.create_future(), started, loop.time() + timeout, sock)
+        self._track(probe)
+        loop.add_writer(probe.key, self._on_writable, probe)
+        return await probe.future
+
+    def _on_writable(self, probe: _Probe):
+        code = probe.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        rtt = time.monotonic() - probe.started
+        if code == 0:
+            self._finish(probe, ProbeResult(True, rtt))
+        else:
+            self._finish(probe, ProbeResult(False, rtt, os.strerror(code)))
+
+    def _release(self, probe: _Probe):
+        self._loop.remove_writer(probe.key)
+        probe.sock.close()
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class ICMPProbeEngine(ProbeEngine):
+    """ICMP echo (IPv4) through one shared socket
+
+    Uses an unprivileged ping socket (Linux net.ipv4.ping_group_range) or a
+    raw socket when the process has CAP_NET_RAW. available() is False when
+    neither can be opened.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._sock: Optional[socket.socket] = None
+        self._raw = False
+        self._identifier = os.getpid() & 0xFFFF
+        self._sequence = itertools.count(1)
+        self._unavailable = False
+
+    def available(self) -> bool:
+        if self._sock is None and not self._unavailable:
+            self._open()
+        return self._sock is not None
+
+    def _open(self):
+        for kind, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+            try:
+                sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+            except (PermissionError, OSError):
+                continue
+            sock.setblocking(False)
+            self._sock, self._raw = sock, raw
+            return
+        self._unavailable = True
+        logger.info("ICMP probes unavailable (no ping or raw socket permission)")
+
+    async def probe(self, address: str, timeout: float) -> ProbeResult:
+        """Send one echo request, success when the reply arrives within timeout"""
+        if not self.available():
+            raise PermissionError("ICMP sockets are not permitted")
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            loop.add_reader(self._sock.fileno(), self._on_readable)
+
+        sequence = next(self._sequence) & 0xFFFF
+        payload = b"monitor-checker!"
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, self._identifier, sequence)
+        checksum = _checksum(header + payload)
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, self._identifier, sequence) + payload
+
+        started = time.monotonic()
+        probe = _Probe(
+            (address, sequence), loop.create_future(), started, loop.time() + timeout, address=address
+        )
+        self._track(probe)
+        try:
+            self._sock.sendto(packet, (address, 0))
+        except OSError as e:
+            self._finish(probe, ProbeResult(False, time.monotonic() - started, str(e)))
+        return await probe.future
+
+    def _on_readable(self):
+        while True:
+            try:
+                data, (sender, _) = self._sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ICMP receive failed: {e}")
+                return
+
+            if self._raw:
+                # Raw sockets deliver the IPv4 header too
+                data = data[(data[0] & 0x0F) * 4:]
+            if len(data) < 8:
+                continue
+            kind, _, _, identifier, sequence = struct.unpack("!BBHHH", data[:8])
+            # Ping sockets rewrite the identifier, raw sockets see every reply
+            if kind != ICMP_ECHO_REPLY or (self._raw and identifier != self._identifier):
+                continue
+            probe = self._pending.get((sender, sequence))
+            if probe is not None:
+                self._finish(probe, ProbeResult(True, time.monotonic() - probe.started))
+
+    def close(self):
+        super().close()
+        if self._sock is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,95 @@
+"""
+Monitor Registry - in-memory monitors keyed by id
+
+Keeps the checker in sync with the monitors table without restarting:
+- O(1) lookup by id
+- Incremental upserts from rows changed since the updated_at watermark
+- Deletions detected from explicit ids or a cheap count/sum checksum
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+@dataclass
+class RegistryDiff:
+    """Changes applied to the registry by one sync"""
+
+    added: List[Any] = field(default_factory=list)
+    updated: List[Tuple[Any, Any]] = field(default_factory=list)
+    removed: List[Any] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.removed)
+
+
+class MonitorRegistry:
+    """Monitors currently known to the checker"""
+
+    def __init__(self):
+        self._monitors: Dict[int, Any] = {}
+        # Highest monitors.updated_at seen so far
+        self.watermark: Optional[Any] = None
+        # Running count and id sum, compared against the DB to detect deletions
+        self._id_sum = 0
+
+    def __len__(self) -> int:
+        return len(self._monitors)
+
+    def __contains__(self, monitor_id: int) -> bool:
+        return monitor_id in self._monitors
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._monitors.values())
+
+    def get(self, monitor_id: int) -> Optional[Any]:
+        return self._monitors.get(monitor_id)
+
+    def ids(self) -> List[int]:
+        return list(self._monitors)
+
+    def by_type(self, monitor_type: str) -> List[Any]:
+        return [m for m in self._monitors.values() if m.monitor_type == monitor_type]
+
+    @property
+    def checksum(self) -> Tuple[int, int]:
+        """(count, sum of ids) of the registered monitors"""
+        return len(self._monitors), self._id_sum
+
+    def upsert(
+        self, monitors: Iterable[Any], watermark: Optional[Any] = None
+    ) -> RegistryDiff:
+        """Add new monitors and replace changed ones"""
+        diff = RegistryDiff()
+        for monitor in monitors:
+            current = self._monitors.get(monitor.id)
+            if current is None:
+                self._id_sum += monitor.id
+                diff.added.append(monitor)
+            elif current != monitor:
+                diff.updated.append((current, monitor))
+            else:
+                continue
+            self._monitors[monitor.id] = monitor
+
+        if watermark is not None and (self.watermark is None or watermark > self.watermark):
+            self.watermark = watermark
+        return diff
+
+    def remove(self, monitor_ids: Iterable[int]) -> RegistryDiff:
+        """Remove monitors by id, unknown ids are ignored"""
+        diff = RegistryDiff()
+        for monitor_id in monitor_ids:
+            monitor = self._monitors.pop(monitor_id, None)
+            if monitor is not None:
+                self._id_sum -= monitor_id
+                diff.removed.append(monitor)
+        return diff
+
+    def retain(self, monitor_ids: Iterable[int]) -> RegistryDiff:
+        """Remove every monitor whose id is not in monitor_ids"""
+        keep = set(monitor_ids)
+        return self.remove([mid for mid in self._monitors if mid not in keep])
@@ -0,0 +1,132 @@
+"""
+Request Strategy - the cheapest HTTP request that still answers a website check
+
+- Monitors without keywords are checked with HEAD: no body is transferred
+  and the connection can go back to the pool right away
+- A HEAD rejected by the server (405/501) is repeated as GET, and the
+  monitor stays on GET for a while before HEAD is tried again. Other
+  failing HEAD answers are confirmed with a GET, so servers that handle
+  HEAD differently never cause a false alarm (once per status code while
+  the monitor keeps failing)
+- Keyword monitors remember ETag/Last-Modified of the last 2xx response and
+  send If-None-Match/If-Modified-Since, a 304 reuses the keyword verdict of
+  that response
+- Bytes received per check (status line, headers, body) are counted to
+  show what this saves
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# HEAD answers that mean "not supported here", not "the site is broken"
+HEAD_REJECTED = frozenset({405, 501})
+
+
+@dataclass(slots=True)
+class CachedVerdict:
+    """Validators and keyword result of the last full response of a monitor"""
+
+    fingerprint: Tuple
+    etag: Optional[str]
+    last_modified: Optional[str]
+    missing_keywords: List[str]
+
+
+def _fingerprint(monitor) -> Tuple:
+    """Verdicts are only reused while url and keywords stay the same"""
+    return monitor.url, tuple(monitor.keywords or ())
+
+
+def response_bytes(response) -> int:
+    """Bytes received for a response so far: status line, headers and body"""
+    # "HTTP/1.1 200 " + reason + CRLF, and the empty line after the headers
+    size = 15 + len(response.reason or "") + 2
+    for name, value in response.raw_headers:
+        size += len(name) + len(value) + 4
+    return size + response.content.total_bytes
+
+
+class RequestStrategy:
+    """Picks the request per monitor and keeps what is needed for the next one"""
+
+    def __init__(self, head_enabled: bool = True, conditional_enabled: bool = True, head_retry_interval: float = 3600):
+        self.head_enabled = head_enabled
+        self.conditional_enabled = conditional_enabled
+        self.head_retry_interval = head_retry_interval
+        # monitor id -> (url, monotonic time until which GET is used instead of HEAD)
+        self._get_only: Dict[int, Tuple[str, float]] = {}
+        self._verdicts: Dict[int, CachedVerdict] = {}
+        # monitor id -> HEAD status code a GET answered the same way
+        self._confirmed_failures: Dict[int, int] = {}
+
+    def method(self, monitor) -> str:
+        """HEAD for monitors that don't need the body, unless the server rejected it"""
+        if not self.head_enabled or monitor.keywords:
+            return "GET"
+        get_only = self._get_only.get(monitor.id)
+        if get_only is not None:
+            url, until = get_only
+            if url == monitor.url and time.monotonic() < until:
+                return "GET"
+            del self._get_only[monitor.id]
+        return "HEAD"
+
+    def head_rejected(self, monitor):
+        """Use GET for the monitor until HEAD is retried"""
+        self._get_only[monitor.id] = (monitor.url, time.monotonic() + self.head_retry_interval)
+        self._confirmed_failures.pop(monitor.id, None)
+
+    def needs_confirmation(self, monitor, http_code: int) -> bool:
+        """Whether a failed HEAD answer has to be repeated as GET"""
+        return http_code in HEAD_REJECTED or self._confirmed_failures.get(monitor.id) != http_code
+
+    def head_confirmed(self, monitor, http_code: Optional[int]):
+        """GET agreed with the failed HEAD (None: HEAD succeeded)"""
+        if http_code is None:
+            self._confirmed_failures.pop(monitor.id, None)
+        else:
+            self._confirmed_failures[monitor.id] = http_code
+
+    def conditional_headers(self, monitor) -> Optional[Dict[str, str]]:
+        """If-None-Match/If-Modified-Since of the cached response, None without one"""
+        cached = self._verdict(monitor)
+        if cached is None:
+            return None
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def cached_verdict(self, monitor) -> Optional[List[str]]:
+        """Missing keywords of the cached response (for a 304)"""
+        cached = self._verdict(monitor)
+        return None if cached is None else list(cached.missing_keywords)
+
+    def remember(self, monitor, response, missing_keywords: List[str]):
+        """Cache the validators and keyword result of a full 2xx response"""
+        if not self.conditional_enabled:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._verdicts[monitor.id] = CachedVerdict(
+                _fingerprint(monitor), etag, last_modified, list(missing_keywords)
+            )
+        else:
+            self._verdicts.pop(monitor.id, None)
+
+    def forget(self, monitor_id: int):
+        self._get_only.pop(monitor_id, None)
+        self._verdicts.pop(monitor_id, None)
+        self._confirmed_failures.pop(monitor_id, None)
+
+    def _verdict(self, monitor) -> Optional[CachedVerdict]:
+        if not self.conditional_enabled or not monitor.keywords:
+            return None
+        cached = self._verdicts.get(monitor.id)
+        if cached is None or cached.fingerprint != _fingerprint(monitor):
+            return None
+        return cached
@@ -0,0 +1,446 @@
+"""
+Rollups - per-minute and per-hour aggregates of check results, and retention
+
+Dashboards and long time ranges read small aggregate tables instead of the
+raw monitor_logs rows:
+- Buckets (checks, failures, avg/p50/p95/max response time of successful
+  checks) are updated in memory as monitor_logs batches are written
+- A bucket is written once it closes (bucket end + grace), open buckets
+  are checkpointed periodically and on shutdown, and reloaded at startup
+- Percentiles are exact while a bucket holds few samples and come from a
+  log-scale histogram (stored with the row, so buckets can be resumed) after
+- With several sharded workers, a worker writes and drops the buckets of
+  the monitors it hands off, the new owner merges the stored rows into its
+  own buckets before writing them
+- Retention deletes expired rows in small chunks of primary keys
+"""
+
+import asyncio
+import calendar
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, UTC
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from storage import StorageBackend
+
+logger = logging.getLogger("monitor_checker")
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Histogram upper bounds (ms), ~25% apart from 1ms to 2 minutes
+LATENCY_BOUNDS: Tuple[int, ...] = tuple(
+    sorted({max(1, round(1.25 ** exponent)) for exponent in range(0, 53)})
+)
+# Samples kept per bucket for exact percentiles before switching to the histogram
+MAX_EXACT_SAMPLES = 120
+
+RollupRow = Tuple[Any, ...]
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value: str) -> int:
+    """Epoch seconds of a UTC "%Y-%m-%d %H:%M:%S" string (rows of a batch share a few)"""
+    return calendar.timegm(time.strptime(value, TIME_FORMAT))
+
+
+def format_timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).strftime(TIME_FORMAT)
+
+
+class RollupBucket:
+    """Aggregate of one monitor over one time bucket"""
+
+    __slots__ = ("checks", "failures", "latency_sum", "latency_max", "samples", "histogram", "version")
+
+    def __init__(self):
+        self.checks = 0
+        self.failures = 0
+        self.latency_sum = 0
+        self.latency_max = 0
+        # Response times of successful checks until MAX_EXACT_SAMPLES, then None
+        self.samples: Optional[array] = array("I")
+        self.histogram: Optional[array] = None
+        # Bumped on every change, a bucket is clean when the written version is current
+        self.version = 0
+
+    @property
+    def successes(self) -> int:
+        return self.checks - self.failures
+
+    def add(self, success: bool, response_time: int):
+        self.checks += 1
+        self.version += 1
+        if not success:
+            self.failures += 1
+            return
+        response_time = max(0, int(response_time))
+        self.latency_sum += response_time
+        if response_time > self.latency_max:
+            self.latency_max = response_time
+        if self.samples is not None:
+            self.samples.append(response_time)
+            if len(self.samples) > MAX_EXACT_SAMPLES:
+                self._to_histogram()
+        else:
+            self.histogram[bisect_left(LATENCY_BOUNDS, response_time)] += 1
+
+    def _to_histogram(self):
+        if self.histogram is None:
+            self.histogram = array("I", bytes(4 * (len(LATENCY_BOUNDS) + 1)))
+        for sample in self.samples or ():
+            self.histogram[bisect_left(LATENCY_BOUNDS, sample)] += 1
+        self.samples = None
+
+    def percentile(self, fraction: float) -> Optional[int]:
+        """Nearest-rank percentile of the successful response times"""
+        count = self.successes
+        if count <= 0:
+            return None
+        rank = max(1, -(-count * fraction // 1))  # ceil
+        if self.samples is not None:
+            return sorted(self.samples)[int(rank) - 1]
+        seen = 0
+        for index, bucket_count in enumerate(self.histogram):
+            seen += bucket_count
+            if seen >= rank:
+                bound = LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else self.latency_max
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def encode_histogram(self) -> str:
+        """Sparse "index:count" list of the latency histogram"""
+        if self.samples is not None:
+            counts: Dict[int, int] = {}
+            for sample in self.samples:
+                index = bisect_left(LATENCY_BOUNDS, sample)
+                counts[index] = counts.get(index, 0) + 1
+            items = sorted(counts.items())
+        else:
+            items = [(index, count) for index, count in enumerate(self.histogram) if count]
+        return " ".join(f"{index}:{count}" for index, count in items)
+
+    def merge_row(self, checks: int, failures: int, average: Optional[float], maximum: Optional[int], histogram: str):
+        """Resume from a stored row (exact samples are not stored, continue as histogram)"""
+        self._to_histogram()
+        self.checks += checks
+        self.failures += failures
+        self.latency_sum += round((average or 0) * (checks - failures))
+        self.latency_max = max(self.latency_max, maximum or 0)
+        for item in (histogram or "").split():
+            index, count = item.split(":")
+            self.histogram[int(index)] += int(count)
+        self.version += 1
+
+
+class RollupLevel:
+    """Buckets of one resolution, indexed by bucket start for cheap closing"""
+
+    def __init__(self, table: str, seconds: int):
+        self.table = table
+        self.seconds = seconds
+        # bucket start -> monitor id -> bucket
+        self.buckets: Dict[int, Dict[int, RollupBucket]] = {}
+        # bucket start -> monitor id -> version that was written
+        self.written: Dict[int, Dict[int, int]] = {}
+
+    def bucket(self, monitor_id: int, start: int) -> RollupBucket:
+        by_monitor = self.buckets.get(start)
+        if by_monitor is None:
+            by_monitor = self.buckets[start] = {}
+        bucket = by_monitor.get(monitor_id)
+        if bucket is None:
+            bucket = by_monitor[monitor_id] = RollupBucket()
+        return bucket
+
+    def __len__(self) -> int:
+        return sum(len(by_monitor) for by_monitor in self.buckets.values())
+
+
+# (level, bucket start, bucket version, row) collected for writing
+PendingRow = Tuple[RollupLevel, int, int, RollupRow]
+
+
+class RollupAggregator:
+    """In-memory rollup buckets for several resolutions
+
+    collect() returns the rows to write, commit() marks them written and
+    forgets closed buckets, so a failed write is simply retried later.
+    Rows for a bucket that was already closed and forgotten are counted
+    as late instead of overwriting the stored aggregate.
+    """
+
+    def __init__(self, levels: Sequence[Tuple[str, int]], grace: float = 30):
+        self.levels = [RollupLevel(table, seconds) for table, seconds in levels]
+        self.grace = grace
+        self.stats = {"rows_added": 0, "late_rows": 0, "buckets_written": 0}
+
+    def _closed_before(self, level: RollupLevel, now: float) -> float:
+        """Buckets starting before this are closed"""
+        return now - self.grace - level.seconds
+
+    def add(self, monitor_id: int, started_at: int, success: bool, response_time: int, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.stats["rows_added"] += 1
+        for level in self.levels:
+            start = started_at - started_at % level.seconds
+            by_monitor = level.buckets.get(start)
+            if (by_monitor is None or monitor_id not in by_monitor) and start < self._closed_before(level, now):
+                self.stats["late_rows"] += 1
+                continue
+            level.bucket(monitor_id, start).add(success, response_time)
+
+    def restore(self, table: str, row: Dict[str, Any]):
+        """Resume an open bucket from its stored row
+
+        Results added before (a monitor taken over from another worker) are
+        merged, the bucket then stays dirty so the sum gets written.
+        """
+        for level in self.levels:
+            if level.table != table:
+                continue
+            start = parse_timestamp(str(row["bucket_start"]))
+            bucket = level.bucket(row["monitor_id"], start)
+            resumed = bucket.checks == 0
+            bucket.merge_row(
+                row["checks"],
+                row["failures"],
+                row["response_time_avg_ms"],
+                row["response_time_max_ms"],
+                row["latency_histogram"],
+            )
+            if resumed:
+                # Stored already, clean until new results arrive
+                level.written.setdefault(start, {})[row["monitor_id"]] = bucket.version
+
+    def collect(
+        self,
+        now: Optional[float] = None,
+        include_open: bool = False,
+        monitors: Optional[Callable[[int], bool]] = None,
+        held: Set[int] = frozenset(),
+    ) -> List[PendingRow]:
+        """Buckets to write: closed ones, plus changed open ones when checkpointing
+
+        monitors limits the rows to the monitors it accepts, held monitors
+        are skipped.
+        """
+        now = time.time() if now is None else now
+        pending: List[PendingRow] = []
+        for level in self.levels:
+            closed_before = self._closed_before(level, now)
+            for start, by_monitor in level.buckets.items():
+                if start >= closed_before and not include_open:
+                    continue
+                written = level.written.get(start, {})
+                bucket_start = format_timestamp(start)
+                for monitor_id, bucket in by_monitor.items():
+                    if monitor_id in held or (monitors is not None and not monitors(monitor_id)):
+                        continue
+                    if written.get(monitor_id) != bucket.version:
+                        row = self._row(monitor_id, bucket_start, bucket)
+                        pending.append((level, start, bucket.version, row))
+        return pending
+
+    def commit(self, pending: List[PendingRow], now: Optional[float] = None):
+        """Record the written versions and forget closed buckets that are fully written"""
+        now = time.time() if now is None else now
+        for level, start, version, row in pending:
+            level.written.setdefault(start, {})[row[0]] = version
+        self.stats["buckets_written"] += len(pending)
+
+        for level in self.levels:
+            closed_before = self._closed_before(level, now)
+            for start in [start for start in level.buckets if start < closed_before]:
+                written = level.written.get(start, {})
+                if all(
+                    written.get(monitor_id) == bucket.version
+                    for monitor_id, bucket in level.buckets[start].items()
+                ):
+                    del level.buckets[start]
+                    level.written.pop(start, None)
+
+    def drop(self, monitors: Callable[[int], bool]) -> int:
+        """Forget the buckets of the monitors monitors() accepts, returns the count"""
+        dropped = 0
+        for level in self.levels:
+            for start in list(level.buckets):
+                by_monitor = level.buckets[start]
+                written = level.written.get(start, {})
+                for monitor_id in [monitor_id for monitor_id in by_monitor if monitors(monitor_id)]:
+                    del by_monitor[monitor_id]
+                    written.pop(monitor_id, None)
+                    dropped += 1
+                if not by_monitor:
+                    del level.buckets[start]
+                    level.written.pop(start, None)
+        return dropped
+
+    @staticmethod
+    def _row(monitor_id: int, bucket_start: str, bucket: RollupBucket) -> RollupRow:
+        successes = bucket.successes
+        return (
+            monitor_id,
+            bucket_start,
+            bucket.checks,
+            bucket.failures,
+            round(bucket.latency_sum / successes, 1) if successes else None,
+            bucket.percentile(0.5),
+            bucket.percentile(0.95),
+            bucket.latency_max if successes else None,
+            bucket.encode_histogram(),
+        )
+
+    def open_buckets(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+
+class RollupWriter:
+    """Feeds written monitor_logs rows into the aggregator and stores the buckets"""
+
+    COLUMNS = (
+        "monitor_id, bucket_start, checks, failures, response_time_avg_ms, "
+        "response_time_p50_ms, response_time_p95_ms, response_time_max_ms, latency_histogram"
+    )
+
+    def __init__(
+        self,
+        storage_getter,
+        levels: Sequence[Tuple[str, int]] = (("monitor_logs_minutely", 60), ("monitor_logs_hourly", 3600)),
+        grace: float = 30,
+        checkpoint_interval: float = 300,
+        owns: Callable[[int], bool] = lambda monitor_id: True,
+    ):
+        self.storage_getter = storage_getter
+        self.aggregator = RollupAggregator(levels, grace)
+        self.checkpoint_interval = checkpoint_interval
+        # Only the owner of a monitor writes its buckets (sharded workers)
+        self.owns = owns
+        # Monitors taken over whose stored buckets are not merged yet
+        self._held: Set[int] = set()
+        self._last_checkpoint = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def add_log_rows(self, rows: Iterable[Sequence]):
+        """Aggregate monitor_logs rows (monitor_id, started_at, status, response_time_ms, ...)
+
+        Rows of monitors handed off to another worker (checks that were in
+        flight during the rebalance) are skipped, the new owner writes the
+        buckets.
+        """
+        now = time.time()
+        add = self.aggregator.add
+        owns = self.owns
+        for row in rows:
+            if owns(row[0]):
+                add(row[0], parse_timestamp(row[1]), row[2] == "succeeded", row[3], now)
+
+    async def flush(self, force: bool = False):
+        """Write closed buckets, and every open bucket on checkpoints or when forced"""
+        async with self._lock:
+            checkpoint = force or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+            pending = self.aggregator.collect(include_open=checkpoint, held=self._held)
+            if checkpoint:
+                self._last_checkpoint = time.monotonic()
+            await self._write(pending)
+
+    async def _write(self, pending: List[PendingRow]):
+        if not pending:
+            return
+        storage: StorageBackend = await self.storage_getter()
+        placeholders = ", ".join(["%s"] * 9)
+        for level in self.aggregator.levels:
+            rows = [row for row_level, _, _, row in pending if row_level is level]
+            if rows:
+                # REPLACE is understood by MySQL and SQLite, the bucket holds the full state
+                await storage.execute_many(
+                    f"REPLACE INTO {level.table} ({self.COLUMNS}) VALUES ({placeholders})",
+                    rows,
+                )
+        self.aggregator.commit(pending)
+
+    async def hand_off(self, monitors: Callable[[int], bool]) -> int:
+        """Write the buckets (open ones too) of monitors handed off to another worker and drop them"""
+        async with self._lock:
+            await self._write(self.aggregator.collect(include_open=True, monitors=monitors))
+            return self.aggregator.drop(monitors)
+
+    async def take_over(self, monitor_ids: Iterable[int], delay: float = 0) -> int:
+        """Merge the stored open buckets of monitors taken over from another worker
+
+        Their buckets are not written before, so the rows the previous owner
+        writes during `delay` (when it notices the rebalance) are included.
+        """
+        monitor_ids = set(monitor_ids)
+        self._held |= monitor_ids
+        try:
+            await asyncio.sleep(delay)
+            async with self._lock:
+                restored = await self.restore(lambda monitor_id: monitor_id in monitor_ids)
+        except asyncio.CancelledError:
+            # Shutting down: keep them held, the stored rows are not overwritten
+            raise
+        except Exception:
+            self._held -= monitor_ids
+            raise
+        self._held -= monitor_ids
+        return restored
+
+    async def restore(self, owns=lambda monitor_id: True) -> int:
+        """Load the stored rows of still open buckets (after a restart or a takeover)"""
+        storage: StorageBackend = await self.storage_getter()
+        now = time.time()
+        restored = 0
+        for level in self.aggregator.levels:
+            since = now - self.aggregator.grace - level.seconds
+            rows = await storage.fetch_all(
+                f"SELECT {self.COLUMNS} FROM {level.table} WHERE bucket_start >= %s",
+                (format_timestamp(since - since % level.seconds),),
+            )
+            for row in rows:
+                if owns(row["monitor_id"]):
+                    self.aggregator.restore(level.table, row)
+                    restored += 1
+        return restored
+
+
+async def purge_expired(
+    storage: StorageBackend,
+    table: str,
+    time_column: str,
+    key_columns: Sequence[str],
+    cutoff: float,
+    chunk_size: int = 5000,
+    pause: float = 0.05,
+) -> int:
+    """Delete rows older than cutoff (epoch) in chunks of chunk_size rows, returns the count
+
+    Primary keys (one or more columns) are selected first and deleted by
+    key, which works the same on MySQL (no LIMIT in IN subqueries) and
+    SQLite (no DELETE ... LIMIT).
+    """
+    cutoff_value = format_timestamp(cutoff)
+    columns = ", ".join(key_columns)
+    row_placeholder = "%s" if len(key_columns) == 1 else f"({', '.join(['%s'] * len(key_columns))})"
+    key_expression = columns if len(key_columns) == 1 else f"({columns})"
+    deleted = 0
+    while True:
+        rows = await storage.fetch_all(
+            f"SELECT {columns} FROM {table} WHERE {time_column} < %s LIMIT %s",
+            (cutoff_value, chunk_size),
+        )
+        if not rows:
+            return deleted
+        params = [row[column] for row in rows for column in key_columns]
+        placeholders = ", ".join([row_placeholder] * len(rows))
+        deleted += await storage.execute(
+            f"DELETE FROM {table} WHERE {time_column} < %s AND {key_expression} IN ({placeholders})",
+            (cutoff_value, *params),
+        )
+        if len(rows) < chunk_size:
+            return deleted
+        # Let checks and log writes in between the chunks
+        await asyncio.sleep(pause)
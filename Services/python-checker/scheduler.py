@@ -0,0 +1,272 @@
+"""
+Monitor Scheduler - min-heap keyed by next-due time
+
+Replaces the linear scan over every monitor on every tick:
+- O(log n) insert, reschedule and removal (lazy invalidation)
+- Due monitors are popped in order, untouched monitors cost nothing
+- The loop can sleep exactly until the earliest monitor is due
+- Optional max release rate (token bucket) to cap bursts
+
+Scheduling state is kept as struct-of-arrays columns indexed by a slot
+number (id, type, periodicity, next-due epoch milliseconds), and the heap
+holds single packed integers (due << 32 | slot) instead of per-monitor
+wrapper objects. The scheduler keeps no Monitor objects: due ids are
+resolved through a lookup (the registry), so each monitor exists once.
+"""
+
+import asyncio
+import heapq
+import time
+from array import array
+from datetime import datetime, UTC
+from typing import Any, Callable, Dict, List, Optional
+
+_MASK64 = (1 << 64) - 1
+# 2**64 / golden ratio, consecutive ids get evenly spread phases
+_GOLDEN = 0x9E3779B97F4A7C15
+
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+MONITOR_TYPES = {"ping": 0, "website": 1}
+OTHER_TYPE = len(MONITOR_TYPES)
+
+
+def to_epoch(value: Any) -> float:
+    """Convert a (naive UTC or aware) datetime or number to epoch seconds"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.timestamp()
+    if value is None:
+        return time.time()
+    return float(value)
+
+
+def phase_fraction(monitor_id: int) -> float:
+    """Deterministic value in [0, 1) for a monitor id (Fibonacci hashing)"""
+    return ((monitor_id * _GOLDEN) & _MASK64) / 2**64
+
+
+def phase_slot(monitor_id: int, periodicity: float, target: float) -> float:
+    """The slot of the monitor's grid (k * periodicity + phase offset) nearest to target
+
+    Checks stay exactly one period apart, but monitors sharing a
+    periodicity are spread over the whole period instead of running in
+    lockstep.
+    """
+    periodicity = max(periodicity, 1)
+    phase = phase_fraction(monitor_id) * periodicity
+    return round((target - phase) / periodicity) * periodicity + phase
+
+
+def next_check_time(
+    monitor_id: int,
+    periodicity: float,
+    last_check: Optional[float],
+    now: float,
+    phase_spread: bool = True,
+    ramp_window: float = 0,
+) -> float:
+    """Epoch seconds of a monitor's next check
+
+    One period after the last check, snapped to the monitor's phase slot
+    with phase_spread. Checks that are already due (or never ran) are
+    spread over ramp_window (at most one period) instead of all running now.
+    """
+    if last_check is not None:
+        due = last_check + periodicity
+        if phase_spread:
+            due = phase_slot(monitor_id, periodicity, due)
+    else:
+        due = now
+
+    if ramp_window and due <= now:
+        due = now + phase_fraction(monitor_id) * min(ramp_window, periodicity)
+    return due
+
+
+class MonitorScheduler:
+    """Priority queue of monitors ordered by their next check time"""
+
+    # Rebuild the heap when stale entries outnumber live ones by this factor
+    COMPACT_FACTOR = 2
+    # Granularity of the wake-ups while the rate limit holds monitors back
+    RATE_WAKEUP_INTERVAL = 0.05
+
+    def __init__(self, lookup: Callable[[int], Optional[Any]], max_rate: float = 0):
+        # Monitor of an id, None once the monitor is gone (its slot is freed)
+        self.lookup = lookup
+
+        # Token bucket limiting how many monitors are released per second
+        # (0 = unlimited), holds one second worth of tokens but at least one,
+        # so rates below one per second still release a monitor now and then
+        self.max_rate = max_rate
+        self._burst = max(1.0, float(max_rate))
+        self._tokens = self._burst
+        self._refilled = time.monotonic()
+
+        # Columns indexed by slot
+        self.ids = array("q")
+        self.types = array("b")
+        self.periodicity = array("l")
+        self.due_ms = array("q")  # 0 = not scheduled
+
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._heap: List[int] = []
+        self._scheduled = 0
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self._scheduled
+
+    def __contains__(self, monitor_id: int) -> bool:
+        slot = self._slots.get(monitor_id)
+        return slot is not None and self.due_ms[slot] != 0
+
+    def _slot_for(self, monitor: Any) -> int:
+        slot = self._slots.get(monitor.id)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                slot = len(self.ids)
+                self.ids.append(0)
+                self.types.append(0)
+                self.periodicity.append(0)
+                self.due_ms.append(0)
+            self._slots[monitor.id] = slot
+            self.ids[slot] = monitor.id
+        # The monitor may have been replaced by an edited copy
+        self.types[slot] = MONITOR_TYPES.get(monitor.monitor_type, OTHER_TYPE)
+        self.periodicity[slot] = monitor.periodicity
+        return slot
+
+    def schedule(self, monitor: Any, due: Any):
+        """Insert a monitor or move it to a new due time (epoch seconds or datetime)"""
+        # 0 means "not scheduled", so clamp to at least 1 ms after the epoch
+        due = max(1, int(to_epoch(due) * 1000))
+        slot = self._slot_for(monitor)
+        previous = self.due_ms[slot]
+        if previous == due:
+            return
+        if previous == 0:
+            self._scheduled += 1
+        self.due_ms[slot] = due
+
+        key = (due << SLOT_BITS) | slot
+        heapq.heappush(self._heap, key)
+        if previous:
+            self._maybe_compact()
+
+        # Wake the loop if this monitor is now the earliest one
+        if self._heap[0] == key:
+            self._wakeup.set()
+
+    def remove(self, monitor_id: int) -> bool:
+        """Remove a monitor from the schedule, returns False if it was not scheduled"""
+        slot = self._slots.pop(monitor_id, None)
+        if slot is None:
+            return False
+        scheduled = self.due_ms[slot] != 0
+        if scheduled:
+            self._scheduled -= 1
+        self.due_ms[slot] = 0
+        self._free.append(slot)
+        if scheduled:
+            self._maybe_compact()
+        return scheduled
+
+    def _is_live(self, key: int) -> bool:
+        slot = key & SLOT_MASK
+        return self.due_ms[slot] == key >> SLOT_BITS
+
+    def next_due(self) -> Optional[float]:
+        """Epoch seconds of the earliest scheduled check, None if empty"""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return (heap[0] >> SLOT_BITS) / 1000 if heap else None
+
+    def due_time(self, monitor_id: int) -> Optional[float]:
+        """Epoch seconds of the next check of a given monitor"""
+        slot = self._slots.get(monitor_id)
+        if slot is None or self.due_ms[slot] == 0:
+            return None
+        return self.due_ms[slot] / 1000
+
+    def pop_due(
+        self,
+        now: Optional[float] = None,
+        limit: Optional[int] = None,
+        on_lag: Optional[Callable[[float], None]] = None,
+    ) -> List[Any]:
+        """Pop every monitor whose due time is <= now, earliest first
+
+        on_lag receives how late (seconds) each popped monitor is picked up.
+        Monitors the lookup no longer knows are dropped from the schedule.
+        """
+        now_ms = int((time.time() if now is None else now) * 1000)
+        if self.max_rate:
+            available = int(self._refill())
+            limit = available if limit is None else min(limit, available)
+        due = []
+        heap = self._heap
+        due_ms = self.due_ms
+        lookup = self.lookup
+        while heap and (limit is None or len(due) < limit):
+            key = heap[0]
+            slot = key & SLOT_MASK
+            key_due = key >> SLOT_BITS
+            if due_ms[slot] != key_due:
+                heapq.heappop(heap)
+                continue
+            if key_due > now_ms:
+                break
+            heapq.heappop(heap)
+            due_ms[slot] = 0
+            self._scheduled -= 1
+            monitor = lookup(self.ids[slot])
+            if monitor is None:
+                del self._slots[self.ids[slot]]
+                self._free.append(slot)
+                continue
+            due.append(monitor)
+            if on_lag:
+                on_lag((now_ms - key_due) / 1000)
+        if self.max_rate:
+            self._tokens -= len(due)
+        return due
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self.max_rate)
+        self._refilled = now
+        return self._tokens
+
+    async def wait_until_due(self, max_wait: Optional[float] = None):
+        """Sleep until the earliest monitor is due, a sooner one is scheduled, or max_wait passes"""
+        self._wakeup.clear()
+        next_due = self.next_due()
+        delay = max_wait
+        if next_due is not None:
+            until_due = max(0.0, next_due - time.time())
+            if self.max_rate and until_due == 0 and self._refill() < 1:
+                # Due monitors are held back by the rate limit, wake up once a
+                # batch of tokens (50 ms worth) is available
+                needed = max(1.0, self.max_rate * self.RATE_WAKEUP_INTERVAL)
+                until_due = (needed - self._tokens) / self.max_rate
+            delay = until_due if delay is None else min(delay, until_due)
+        if delay == 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _maybe_compact(self):
+        """Rebuild the heap without stale entries once they dominate it"""
+        if len(self._heap) > (self.COMPACT_FACTOR + 1) * max(self._scheduled, 1):
+            self._heap = [key for key in self._heap if self._is_live(key)]
+            heapq.heapify(self._heap)
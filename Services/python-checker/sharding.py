@@ -0,0 +1,173 @@
+"""
+Sharding - split monitors between checker workers
+
+Each worker (process or container) owns the monitors that rendezvous
+hashing assigns to it:
+- Ownership is a pure function of the monitor id and the live worker set
+- Only ~1/N of the monitors move when a worker joins or leaves
+- Live workers are tracked with expiring leases in the checker_leases table
+- A worker whose lease could not be renewed for its TTL owns nothing (the
+  others have taken its monitors over) until it renews the lease again
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Callable, List, Optional, Sequence
+
+from storage import StorageBackend
+
+logger = logging.getLogger("monitor_checker")
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer, a cheap stable 64-bit hash"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def worker_seed(worker_id: str) -> int:
+    """Stable 64-bit seed of a worker id (independent of PYTHONHASHSEED)"""
+    seed = 0
+    for byte in worker_id.encode():
+        seed = _mix(seed ^ byte)
+    return seed
+
+
+def rendezvous_owner(monitor_id: int, seeds: Sequence[int]) -> int:
+    """Index of the worker with the highest score for a monitor"""
+    best_index = 0
+    best_score = -1
+    for index, seed in enumerate(seeds):
+        score = _mix(seed ^ monitor_id)
+        if score > best_score:
+            best_index, best_score = index, score
+    return best_index
+
+
+class ShardCoordinator:
+    """Keeps this worker's lease alive and answers which monitors it owns"""
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        worker_id: Optional[str] = None,
+        lease_ttl: float = 15,
+        heartbeat_interval: float = 5,
+        on_rebalance: Optional[Callable[[], None]] = None,
+    ):
+        self.storage = storage
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = lease_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.on_rebalance = on_rebalance
+
+        self.workers: List[str] = [self.worker_id]
+        self._seeds: List[int] = [worker_seed(self.worker_id)]
+        self._index = 0
+        # Membership before the last change (for the rebalance handlers),
+        # empty when the lease had expired
+        self._previous_seeds = self._seeds
+        self._previous_index = 0
+        # Monotonic time of the last renewal, the lease is ours until + lease_ttl
+        self._renewed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        """The first live worker runs the shard-wide jobs (retention)"""
+        return self._index == 0
+
+    @property
+    def has_lease(self) -> bool:
+        """Whether the lease is still valid (the other workers count this one in)"""
+        return self._renewed_at is not None and time.monotonic() - self._renewed_at < self.lease_ttl
+
+    def owns(self, monitor_id: int) -> bool:
+        if not self.has_lease:
+            return False
+        if len(self._seeds) == 1:
+            return True
+        return rendezvous_owner(monitor_id, self._seeds) == self._index
+
+    def owned_before(self, monitor_id: int) -> bool:
+        """Whether this worker owned the monitor before the last membership change"""
+        if not self._previous_seeds:
+            return False
+        if len(self._previous_seeds) == 1:
+            return True
+        return rendezvous_owner(monitor_id, self._previous_seeds) == self._previous_index
+
+    async def heartbeat(self) -> bool:
+        """Renew the lease and refresh the live worker set, returns True when it changed
+
+        A lease renewed after it had expired counts as a change too, the
+        worker owned nothing in between.
+        """
+        renewing = time.monotonic()
+        lapsed = self._renewed_at is not None and not self.has_lease
+        now = int(time.time())
+        # One statement whether the row exists or not: an UPDATE reports no
+        # affected row when expires_at did not change (MySQL), REPLACE is
+        # understood by MySQL and SQLite
+        await self.storage.execute(
+            "REPLACE INTO checker_leases (worker_id, expires_at) VALUES (%s, %s)",
+            (self.worker_id, now + int(self.lease_ttl)),
+        )
+        self._renewed_at = renewing
+
+        rows = await self.storage.fetch_all(
+            "SELECT worker_id FROM checker_leases WHERE expires_at > %s", (now,)
+        )
+        workers = sorted({row["worker_id"] for row in rows} | {self.worker_id})
+        if workers == self.workers and not lapsed:
+            return False
+
+        if lapsed:
+            logger.warning(f"Shard lease of {self.worker_id} renewed after it had expired")
+        logger.info(f"Shard membership changed: {len(workers)} workers {workers}")
+        self.workers = workers
+        if lapsed:
+            self._previous_seeds, self._previous_index = [], 0
+        else:
+            self._previous_seeds, self._previous_index = self._seeds, self._index
+        self._seeds = [worker_seed(worker) for worker in workers]
+        self._index = workers.index(self.worker_id)
+        return True
+
+    async def start(self):
+        """Acquire the lease and keep renewing it in the background"""
+        await self.heartbeat()
+
+        async def run():
+            while True:
+                await asyncio.sleep(self.heartbeat_interval)
+                try:
+                    if await self.heartbeat() and self.on_rebalance:
+                        self.on_rebalance()
+                except Exception as e:
+                    logger.error(f"Failed to renew shard lease: {e}")
+
+        self._task = asyncio.create_task(run())
+
+    async def stop(self):
+        """Stop renewing and release the lease so the others take over immediately"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.storage.execute(
+                "DELETE FROM checker_leases WHERE worker_id = %s", (self.worker_id,)
+            )
+        except Exception as e:
+            logger.error(f"Failed to release shard lease: {e}")
@@ -0,0 +1,162 @@
+"""
+Status Tracker - monitors.status writes on state transitions only
+
+The checker keeps the last known status of every monitor in memory, so a
+check result only leads to a write when the status actually changes:
+- Seeded from monitors.status when the monitors are loaded
+- CHECKER_STATUS_UPDATES=checker: changed statuses are written by the
+  checker with one UPDATE ... CASE per monitor_logs batch (the migration
+  drops the per-row update_monitor_status trigger in this mode)
+- CHECKER_STATUS_UPDATES=trigger: the trigger keeps writing monitors.status
+  (only when it differs), the tracker just records the transitions
+- Transitions are appended to monitor_status_transitions, a compact stream
+  that replay_transitions() folds back into the status of every monitor
+  as of any point in time
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from storage import StorageBackend
+
+logger = logging.getLogger("monitor_checker")
+
+# (monitor_id, previous_status, status, changed_at)
+Transition = Tuple[int, Optional[str], str, str]
+
+# Monitors per UPDATE ... CASE statement
+MAX_CASE_SIZE = 500
+
+
+class StatusTracker:
+    """Last known status per monitor, pending status writes and transitions"""
+
+    def __init__(self, storage_getter, write_status: bool = False, record_transitions: bool = True):
+        self.storage_getter = storage_getter
+        self.write_status = write_status
+        self.record_transitions = record_transitions
+        self._status: Dict[int, str] = {}
+        # monitor id -> status not written to monitors yet (latest wins)
+        self._pending_status: Dict[int, str] = {}
+        self._pending_transitions: List[Transition] = []
+        self._lock = asyncio.Lock()
+
+        self.stats = {
+            "transitions": 0,
+            "unchanged": 0,
+            "status_writes": 0,
+        }
+
+    @property
+    def active(self) -> bool:
+        return self.write_status or self.record_transitions
+
+    def seed(self, monitor_id: int, status: Optional[str]):
+        """Set the stored status of a monitor unless a newer one is known"""
+        if status is not None and self.active:
+            self._status.setdefault(monitor_id, status)
+
+    def forget(self, monitor_id: int):
+        self._status.pop(monitor_id, None)
+
+    def observe(self, monitor_id: int, status: str, changed_at: str) -> Optional[Transition]:
+        """Record a check status, returns the transition when it changed"""
+        previous = self._status.get(monitor_id)
+        if previous == status:
+            self.stats["unchanged"] += 1
+            return None
+
+        self._status[monitor_id] = status
+        if self.write_status:
+            self._pending_status[monitor_id] = status
+        # Without a known status (monitor just taken over from another shard
+        # worker) only monitors.status is written, the previous owner
+        # recorded the transitions up to the handoff
+        if previous is None:
+            return None
+
+        transition = (monitor_id, previous, status, changed_at)
+        self.stats["transitions"] += 1
+        if self.record_transitions:
+            self._pending_transitions.append(transition)
+        return transition
+
+    def add_log_rows(self, rows: Iterable[Sequence]):
+        """Observe written monitor_logs rows (monitor_id, started_at, status, ...)"""
+        observe = self.observe
+        for row in rows:
+            observe(row[0], row[2], row[1])
+
+    async def flush(self):
+        """Write pending status changes and transitions, kept for the next flush on errors"""
+        async with self._lock:
+            if not self._pending_status and not self._pending_transitions:
+                return
+            storage: StorageBackend = await self.storage_getter()
+
+            if self._pending_transitions:
+                transitions, self._pending_transitions = self._pending_transitions, []
+                try:
+                    await storage.execute_many(
+                        """
+                        INSERT INTO monitor_status_transitions
+                        (monitor_id, previous_status, status, changed_at)
+                        VALUES (%s, %s, %s, %s)
+                    """,
+                        transitions,
+                    )
+                except Exception:
+                    self._pending_transitions[:0] = transitions
+                    raise
+
+            if self._pending_status:
+                pending, self._pending_status = self._pending_status, {}
+                items = sorted(pending.items())
+                try:
+                    for start in range(0, len(items), MAX_CASE_SIZE):
+                        chunk = items[start:start + MAX_CASE_SIZE]
+                        await self._write_statuses(storage, chunk)
+                        self.stats["status_writes"] += len(chunk)
+                except Exception:
+                    # Rewriting the chunks that made it is harmless, statuses
+                    # observed since then are newer than the failed ones
+                    for monitor_id, status in pending.items():
+                        self._pending_status.setdefault(monitor_id, status)
+                    raise
+
+    @staticmethod
+    async def _write_statuses(storage: StorageBackend, items: List[Tuple[int, str]]):
+        """Set the status of several monitors with a single UPDATE ... CASE"""
+        cases = " ".join(["WHEN %s THEN %s"] * len(items))
+        placeholders = ", ".join(["%s"] * len(items))
+        params = [value for item in items for value in item]
+        params.extend(monitor_id for monitor_id, _ in items)
+        await storage.execute(
+            f"UPDATE monitors SET status = CASE id {cases} END WHERE id IN ({placeholders})",
+            params,
+        )
+
+
+async def replay_transitions(
+    storage: StorageBackend,
+    until: Optional[str] = None,
+    chunk_size: int = 5000,
+) -> Dict[int, str]:
+    """Status of every monitor with transitions as of until (UTC, default: now)
+
+    Streams monitor_status_transitions in order and keeps the last status
+    per monitor, e.g. to rebuild monitors.status or a past state.
+    """
+    query = "SELECT monitor_id, status FROM monitor_status_transitions"
+    params: Tuple = ()
+    if until is not None:
+        query += " WHERE changed_at <= %s"
+        params = (until,)
+    query += " ORDER BY changed_at, id"
+
+    statuses: Dict[int, str] = {}
+    async for rows in storage.stream(query, params, chunk_size=chunk_size):
+        for row in rows:
+            statuses[row["monitor_id"]] = row["status"]
+    return statuses
@@ -0,0 +1,347 @@
+"""
+Storage Backends - database access for the checker
+
+All backends expose the same small async interface and take MySQL style
+%s placeholders:
+- AsyncMySQLBackend: asyncio-native aiomysql pool (no threads, the default)
+- ExecutorMySQLBackend: mysql.connector pool driven through a thread pool
+- SQLiteBackend: local SQLite file, for development and tests
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("monitor_checker")
+
+Row = Dict[str, Any]
+
+
+class StorageBackend:
+    """Async SQL interface used by the checker"""
+
+    name = "backend"
+
+    def __init__(self, pool_size: int = 10):
+        self.pool_size = pool_size
+
+    async def connect(self):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    async def fetch_all(self, query: str, params: Sequence = ()) -> List[Row]:
+        """Run a query and return all rows as dicts"""
+        raise NotImplementedError
+
+    async def fetch_one(self, query: str, params: Sequence = ()) -> Optional[Row]:
+        rows = await self.fetch_all(query, params)
+        return rows[0] if rows else None
+
+    async def execute(self, query: str, params: Sequence = ()) -> int:
+        """Run a statement and return the number of affected rows"""
+        raise NotImplementedError
+
+    async def execute_many(self, query: str, rows: Sequence[Sequence]) -> int:
+        """Run a statement for many parameter rows (multi-row INSERT where supported)"""
+        raise NotImplementedError
+
+    async def stream(
+        self, query: str, params: Sequence = (), chunk_size: int = 5000
+    ) -> AsyncIterator[List[Row]]:
+        """Yield rows of a large result set in chunks"""
+        yield await self.fetch_all(query, params)
+
+    async def warm(self):
+        """Open every pooled connection up front (one SELECT 1 per connection)"""
+        size = self.pool_stats()["size"]
+        await asyncio.gather(*(self.fetch_all("SELECT 1") for _ in range(size)))
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Pool utilisation (size, in use)"""
+        return {"size": self.pool_size, "in_use": 0}
+
+
+class ExecutorMySQLBackend(StorageBackend):
+    """mysql.connector connection pool used from a thread pool (fallback backend)"""
+
+    name = "mysql"
+
+    def __init__(self, config: Dict[str, Any], pool_size: int = 10):
+        super().__init__(pool_size)
+        self.config = config
+        self.pool = None
+        # One thread per pooled connection, more threads would only hit an exhausted pool
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(pool_size, 32))
+        self._in_use = 0
+        self._in_use_lock = threading.Lock()
+
+    async def connect(self):
+        from mysql.connector import pooling
+
+        def _connect_sync():
+            return pooling.MySQLConnectionPool(
+                pool_name="monitor_pool",
+                # mysql.connector caps pools at 32 connections
+                pool_size=min(self.pool_size, 32),
+                pool_reset_session=True,
+                autocommit=True,
+                charset="utf8mb4",
+                **self.config,
+            )
+
+        self.pool = await self._run(_connect_sync)
+
+    async def close(self):
+        self.executor.shutdown(wait=True)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, fn, *args)
+
+    def _with_cursor(self, fn, dictionary: bool = False, buffered: bool = True):
+        """Run fn(cursor) on a pooled connection (called in a worker thread)"""
+        conn = self.pool.get_connection()
+        with self._in_use_lock:
+            self._in_use += 1
+        try:
+            cursor = conn.cursor(dictionary=dictionary, buffered=buffered)
+            try:
+                return fn(cursor)
+            finally:
+                cursor.close()
+        finally:
+            with self._in_use_lock:
+                self._in_use -= 1
+            conn.close()
+
+    async def fetch_all(self, query: str, params: Sequence = ()) -> List[Row]:
+        def _fetch(cursor):
+            cursor.execute(query, tuple(params))
+            return cursor.fetchall()
+
+        return await self._run(self._with_cursor, _fetch, True)
+
+    async def execute(self, query: str, params: Sequence = ()) -> int:
+        def _execute(cursor):
+            cursor.execute(query, tuple(params))
+            return cursor.rowcount
+
+        return await self._run(self._with_cursor, _execute)
+
+    async def execute_many(self, query: str, rows: Sequence[Sequence]) -> int:
+        def _execute_many(cursor):
+            cursor.executemany(query, rows)
+            return cursor.rowcount
+
+        return await self._run(self._with_cursor, _execute_many)
+
+    async def stream(
+        self, query: str, params: Sequence = (), chunk_size: int = 5000
+    ) -> AsyncIterator[List[Row]]:
+        # Keep one unbuffered cursor open in a worker thread and hand the
+        # chunks over through a small queue
+        loop = asyncio.get_event_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        stopped = threading.Event()
+        done = object()
+
+        def _stream(cursor):
+            try:
+                cursor.execute(query, tuple(params))
+                while not stopped.is_set() and (rows := cursor.fetchmany(chunk_size)):
+                    asyncio.run_coroutine_threadsafe(queue.put(rows), loop).result()
+            finally:
+                if not stopped.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+
+        task = loop.run_in_executor(self.executor, self._with_cursor, _stream, True, False)
+        try:
+            while (rows := await queue.get()) is not done:
+                yield rows
+        finally:
+            # The consumer may leave early (break, error, cancellation): stop the
+            # thread and free the queue so a put it is blocked on can finish,
+            # otherwise the thread never returns and close() hangs
+            stopped.set()
+            while not queue.empty():
+                queue.get_nowait()
+            if not task.done():
+                task.add_done_callback(lambda future: future.cancelled() or future.exception())
+        await task
+
+    def pool_stats(self) -> Dict[str, int]:
+        return {"size": min(self.pool_size, 32), "in_use": self._in_use}
+
+
+class AsyncMySQLBackend(StorageBackend):
+    """asyncio-native MySQL pool (aiomysql)"""
+
+    name = "aiomysql"
+
+    def __init__(self, config: Dict[str, Any], pool_size: int = 10):
+        super().__init__(pool_size)
+        self.config = config
+        self.pool = None
+
+    async def connect(self):
+        import aiomysql
+
+        self._aiomysql = aiomysql
+        self.pool = await aiomysql.create_pool(
+            host=self.config["host"],
+            port=self.config["port"],
+            user=self.config["user"],
+            password=self.config["password"],
+            db=self.config["database"],
+            charset="utf8mb4",
+            autocommit=True,
+            minsize=1,
+            maxsize=self.pool_size,
+        )
+
+    async def close(self):
+        if self.pool:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def fetch_all(self, query: str, params: Sequence = ()) -> List[Row]:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor(self._aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, tuple(params))
+                return list(await cursor.fetchall())
+
+    async def execute(self, query: str, params: Sequence = ()) -> int:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, tuple(params))
+                return cursor.rowcount
+
+    async def execute_many(self, query: str, rows: Sequence[Sequence]) -> int:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(query, rows)
+                return cursor.rowcount
+
+    async def stream(
+        self, query: str, params: Sequence = (), chunk_size: int = 5000
+    ) -> AsyncIterator[List[Row]]:
+        async with self.pool.acquire() as conn:
+            async with conn.cursor(self._aiomysql.SSDictCursor) as cursor:
+                await cursor.execute(query, tuple(params))
+                while rows := await cursor.fetchmany(chunk_size):
+                    yield list(rows)
+
+    def pool_stats(self) -> Dict[str, int]:
+        if not self.pool:
+            return {"size": self.pool_size, "in_use": 0}
+        return {"size": self.pool.maxsize, "in_use": self.pool.size - self.pool.freesize}
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite database file accessed from a single worker thread"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        super().__init__(pool_size=1)
+        self.path = path
+        self.conn = None
+        # One thread keeps every statement on the connection that created it
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    @staticmethod
+    def _translate(query: str) -> str:
+        return query.replace("%s", "?")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, fn, *args)
+
+    async def connect(self):
+        import sqlite3
+
+        def _connect_sync():
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+        self.conn = await self._run(_connect_sync)
+
+    async def close(self):
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+        self.executor.shutdown(wait=True)
+
+    async def fetch_all(self, query: str, params: Sequence = ()) -> List[Row]:
+        def _fetch():
+            cursor = self.conn.execute(self._translate(query), tuple(params))
+            return [dict(row) for row in cursor.fetchall()]
+
+        return await self._run(_fetch)
+
+    async def execute(self, query: str, params: Sequence = ()) -> int:
+        def _execute():
+            return self.conn.execute(self._translate(query), tuple(params)).rowcount
+
+        return await self._run(_execute)
+
+    async def execute_many(self, query: str, rows: Sequence[Sequence]) -> int:
+        def _execute_many():
+            self.conn.execute("BEGIN")
+            try:
+                cursor = self.conn.executemany(self._translate(query), rows)
+                self.conn.execute("COMMIT")
+                return cursor.rowcount
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_execute_many)
+
+
+def create_backend(pool_size: int = 10) -> StorageBackend:
+    """Create the storage backend selected by DB_CONNECTION / DB_BACKEND"""
+    connection = os.getenv("DB_CONNECTION")
+    backend = os.getenv("DB_BACKEND") or ("sqlite" if connection == "sqlite" else "aiomysql")
+
+    if backend == "sqlite":
+        path = os.getenv("DB_DATABASE")
+        if not path:
+            raise ValueError("Missing DB configuration in environment: ['DB_DATABASE']")
+        return SQLiteBackend(path)
+
+    required_keys = [
+        "DB_CONNECTION",
+        "DB_HOST",
+        "DB_PORT",
+        "DB_DATABASE",
+        "DB_USERNAME",
+        "DB_PASSWORD",
+    ]
+
+    # Check for missing environment variables
+    missing_keys = [key for key in required_keys if not os.getenv(key)]
+    if missing_keys:
+        raise ValueError(f"Missing DB configuration in environment: {missing_keys}")
+
+    if connection != "mysql":
+        raise ValueError(f"Unsupported DB connection type: {connection}")
+
+    config = {
+        "user": os.getenv("DB_USERNAME"),
+        "password": os.getenv("DB_PASSWORD"),
+        "host": os.getenv("DB_HOST"),
+        "port": int(os.getenv("DB_PORT")),
+        "database": os.getenv("DB_DATABASE"),
+    }
+
+    if backend == "aiomysql":
+        return AsyncMySQLBackend(config, pool_size)
+    if backend == "mysql":
+        return ExecutorMySQLBackend(config, pool_size)
+    raise ValueError(f"Unsupported DB backend: {backend}")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The checker modules are imported from the service directory, as Main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("CHECKER_LOG_LEVEL", "WARNING")
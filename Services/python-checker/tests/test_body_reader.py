@@ -0,0 +1,48 @@
+import asyncio
+
+from body_reader import body_encoding, read_missing_keywords
+
+
+class FakeContent:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def read(self, n: int) -> bytes:
+        chunk, self.body = self.body[:n], self.body[n:]
+        return chunk
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, content_type: str = "text/html", charset=None):
+        self.headers = {"Content-Type": content_type}
+        self.charset = charset
+        self.content = FakeContent(body)
+
+
+def missing(response, keywords, chunk_size=4):
+    return asyncio.run(read_missing_keywords(response, keywords, 1 << 20, chunk_size))
+
+
+def test_declared_charset_is_used():
+    body = "Überwachung läuft".encode("cp1252")
+    assert missing(FakeResponse(body, charset="windows-1252"), ["Überwachung läuft"]) == ([], len(body))
+
+
+def test_meta_charset_is_used_without_a_declared_one():
+    body = '<html><head><meta charset="iso-8859-2"></head><body>Łódź działa</body></html>'.encode("iso-8859-2")
+    assert missing(FakeResponse(body), ["Łódź działa"], chunk_size=len(body))[0] == []
+
+
+def test_encoding_resolution():
+    assert body_encoding(FakeResponse(b"", charset="latin1"), b"") == "iso8859-1"
+    # Unknown declared charsets fall through to sniffing
+    assert body_encoding(FakeResponse(b"", charset="x-unknown"), b"<meta charset=latin2>") == "iso8859-2"
+    assert body_encoding(FakeResponse(b"", "application/json"), b'<meta charset="latin2">') == "utf-8"
+    assert body_encoding(FakeResponse(b""), "﻿<p>".encode("utf-16-le")) == "utf-16"
+    assert body_encoding(FakeResponse(b""), b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">') == "shift_jis"
+    assert body_encoding(FakeResponse(b""), b"<p>no declaration</p>") == "utf-8"
+
+
+def test_utf8_split_inside_a_character():
+    body = "prefix — ok ✓".encode()
+    assert missing(FakeResponse(body), ["— ok ✓"], chunk_size=1)[0] == []
@@ -0,0 +1,96 @@
+import asyncio
+
+from change_feed import ChangeFeed, ChangeSource, PollingSource, UnixSocketSource, parse_monitor_ids
+
+
+def test_parse_monitor_ids():
+    assert parse_monitor_ids("12") == [12]
+    assert parse_monitor_ids(" 12,13; 14\n15 ") == [12, 13, 14, 15]
+    assert parse_monitor_ids("12, abc, -3, 4.5") == [12]
+    assert parse_monitor_ids("") == []
+
+
+def test_notifications_are_coalesced_into_one_batch():
+    async def scenario():
+        feed = ChangeFeed()
+        feed.notify([1, 2])
+        feed.notify([2, 3])
+        first = await feed.next_batch()
+        empty = await feed.next_batch(timeout=0.01)
+
+        # A waiting consumer wakes up on the next notification
+        waiting = asyncio.create_task(feed.next_batch(timeout=5))
+        await asyncio.sleep(0)
+        feed.notify([4])
+        return first, empty, await waiting
+
+    assert asyncio.run(scenario()) == ({1, 2, 3}, set(), {4})
+
+
+def test_unix_socket_source(tmp_path):
+    async def scenario():
+        feed = ChangeFeed()
+        source = UnixSocketSource(str(tmp_path / "changes.sock"))
+        feed.add_source(source)
+        await feed.start()
+        reader, writer = await asyncio.open_unix_connection(source.path)
+        writer.write(b"7,8\n9\n")
+        await writer.drain()
+        batch = set()
+        while len(batch) < 3:
+            batch |= await feed.next_batch(timeout=2)
+        writer.close()
+        await feed.stop()
+        return batch
+
+    batch = asyncio.run(scenario())
+    assert batch == {7, 8, 9}
+    assert not (tmp_path / "changes.sock").exists()
+
+
+def test_polling_source_survives_failed_polls():
+    async def scenario():
+        answers = [RuntimeError("database went away"), [5], []]
+
+        async def fetch():
+            answer = answers.pop(0) if answers else []
+            if isinstance(answer, Exception):
+                raise answer
+            return answer
+
+        feed = ChangeFeed()
+        feed.add_source(PollingSource(fetch, interval=0.01))
+        await feed.start()
+        batch = await feed.next_batch(timeout=2)
+        await feed.stop()
+        return batch
+
+    assert asyncio.run(scenario()) == {5}
+
+
+def test_failing_source_does_not_stop_the_others():
+    class Broken(ChangeSource):
+        name = "broken"
+
+        async def start(self, feed):
+            raise ConnectionError("no redis here")
+
+        async def stop(self):
+            raise ConnectionError("no redis here")
+
+    class Ready(ChangeSource):
+        name = "ready"
+
+        async def start(self, feed):
+            feed.notify([1])
+
+    async def scenario():
+        feed = ChangeFeed()
+        feed.add_source(Broken())
+        feed.add_source(Ready())
+        await feed.start()
+        batch = await feed.next_batch(timeout=1)
+        await feed.stop()
+        return batch
+
+    assert asyncio.run(scenario()) == {1}
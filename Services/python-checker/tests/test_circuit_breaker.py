@@ -0,0 +1,120 @@
+from circuit_breaker import CircuitBreaker
+
+
+def test_circuit_opens_after_the_threshold():
+    breaker = CircuitBreaker(failure_threshold=3)
+    for _ in range(2):
+        breaker.record("10.0.0.1:80", False)
+    assert not breaker.is_open("10.0.0.1:80")
+
+    breaker.record("10.0.0.1:80", False)
+    assert breaker.is_open("10.0.0.1:80")
+    # More failures keep it open without counting it again
+    breaker.record("10.0.0.1:80", False)
+    assert breaker.is_open("10.0.0.1:80")
+    assert (breaker.stats["opened"], breaker.stats["closed"]) == (1, 0)
+    assert breaker.open_count() == 1
+    assert not breaker.is_open("10.0.0.2:80")
+
+
+def test_any_answer_resets_the_count():
+    breaker = CircuitBreaker(failure_threshold=3)
+    for reachable in (False, False, True, False, False):
+        breaker.record("example.com", reachable)
+    assert not breaker.is_open("example.com")
+    assert (breaker.stats["opened"], breaker.stats["closed"]) == (0, 0)
+
+
+def test_success_closes_an_open_circuit():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record("example.com", False)
+    breaker.record("example.com", False)
+    breaker.record("example.com", True)
+
+    assert not breaker.is_open("example.com")
+    assert breaker.open_count() == 0
+    assert (breaker.stats["opened"], breaker.stats["closed"]) == (1, 1)
+    # It opens again after threshold new failures
+    breaker.record("example.com", False)
+    assert not breaker.is_open("example.com")
+    breaker.record("example.com", False)
+    assert breaker.is_open("example.com")
+    assert breaker.stats["opened"] == 2
+
+
+def test_threshold_is_at_least_one():
+    breaker = CircuitBreaker(failure_threshold=0)
+    breaker.record("example.com", False)
+    assert breaker.is_open("example.com")
+
+
+def test_prune_drops_targets_no_longer_checked():
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record("old", False)
+    breaker.record("current", False)
+    breaker._circuits["old"].updated -= 120
+
+    assert breaker.prune(60) == 1
+    assert not breaker.is_open("old")
+    assert breaker.is_open("current")
+
+
+def open_breaker(targets, **options):
+    breaker = CircuitBreaker(failure_threshold=1, **options)
+    for target in targets:
+        breaker.record(target, False)
+    return breaker
+
+
+def test_timeout_stays_full_while_the_lane_keeps_up():
+    # 10 slots x 60s period / 100 open targets = 6s per check
+    breaker = open_breaker([f"10.0.0.{index}:80" for index in range(100)], lane_concurrency=10)
+    breaker._circuits["10.0.0.1:80"].next_trial = float("inf")
+
+    assert breaker.timeout("10.0.0.1:80", 5, 60) == 5
+    assert breaker.timeout("example.com", 5, 60) == 5
+    assert breaker.stats["short_checks"] == 0
+
+
+def test_timeout_is_shortened_to_the_lane_budget_and_no_further():
+    targets = [f"10.0.0.{index}:80" for index in range(200)]
+    breaker = open_breaker(targets, lane_concurrency=10, timeout_factor=0.25)
+    for target in targets:
+        breaker._circuits[target].next_trial = float("inf")
+
+    # 10 x 60 / 200 = 3s still covers every open target once per period
+    assert breaker.timeout(targets[0], 5, 60) == 3
+    # 10 x 10 / 200 = 0.5s would be below the floor of 0.25 x 5s
+    assert breaker.timeout(targets[0], 5, 10) == 1.25
+    assert breaker.stats["short_checks"] == 2
+
+
+def test_full_timeout_trials_back_off_exponentially():
+    breaker = open_breaker(["slow"], lane_concurrency=1, trial_interval=60, max_trial_interval=200)
+    circuit = breaker._circuits["slow"]
+    intervals = []
+    for _ in range(4):
+        # Shortened until the next trial is due
+        assert breaker.timeout("slow", 5, 1) == 1.25
+        circuit.next_trial -= 1000
+        assert breaker.timeout("slow", 5, 1) == 5
+        intervals.append(circuit.trial_interval)
+    assert intervals == [200, 200, 200, 200]
+    assert breaker.stats["trials"] == 4
+
+    breaker = open_breaker(["slow"], trial_interval=10, max_trial_interval=100)
+    circuit = breaker._circuits["slow"]
+    intervals = [circuit.trial_interval]
+    for _ in range(4):
+        circuit.next_trial -= 1000
+        breaker.timeout("slow", 5, 1)
+        intervals.append(circuit.trial_interval)
+    assert intervals == [20, 40, 80, 100, 100]
+
+
+def test_open_count_follows_closes_and_prunes():
+    breaker = open_breaker(["a", "b", "c"])
+    breaker.record("a", True)
+    breaker._circuits["b"].updated -= 120
+    breaker.prune(60)
+    assert breaker.open_count() == 1
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from Main import Monitor, MonitorChecker, MonitorResult
+
+TIMEOUT = 0.2
+
+
+def test_open_circuit_host_is_checked_within_one_timeout():
+    async def scenario():
+        checker = MonitorChecker()
+        monitors = [
+            Monitor(index, "dead", "website", 60, url=f"http://dead.test/{index}") for index in range(1, 21)
+        ]
+        for _ in range(checker.CIRCUIT_FAILURE_THRESHOLD):
+            checker.circuit_breaker.record("dead.test", False)
+        peak = in_flight = 0
+
+        async def discard(rows):
+            pass
+
+        async def check(monitor):
+            nonlocal peak, in_flight
+            in_flight += 1
+            peak = max(peak, in_flight)
+            started_at = datetime.now(UTC)
+            # Connect timeout of an unreachable host
+            await asyncio.sleep(TIMEOUT)
+            in_flight -= 1
+            return MonitorResult(
+                success=False, status="failed", response_time=int(TIMEOUT * 1000),
+                error="timeout", started_at=started_at,
+            )
+
+        checker.log_writer.write_batch = discard
+        checker._run_single_website_check = check
+        start = time.perf_counter()
+        processed = await checker.run_batch_website_checks(monitors)
+        elapsed = time.perf_counter() - start
+        await checker.log_writer.stop()
+        return checker, processed, elapsed, peak
+
+    checker, processed, elapsed, peak = asyncio.run(scenario())
+    assert processed == 20
+    assert checker.circuit_breaker.is_open("dead.test")
+    # One round of the lane, not one timeout per monitor of the host
+    assert peak == 20
+    assert elapsed < 1.5 * TIMEOUT
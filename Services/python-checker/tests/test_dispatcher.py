@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from dispatcher import AIMDLimit, HostDispatcher
+
+
+def run_checks(dispatcher, items, delay, outcome):
+    """Run items through the dispatcher, returns (elapsed s, max in flight per host)"""
+    in_flight = {}
+    peak = {}
+
+    async def handle(item):
+        host = item[0]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(delay)
+        in_flight[host] -= 1
+        return item
+
+    async def scenario():
+        start = time.perf_counter()
+        await dispatcher.run(items, handle, outcome)
+        return time.perf_counter() - start
+
+    return asyncio.run(scenario()), peak
+
+
+def host_of(item):
+    return item[0]
+
+
+def test_unreachable_host_is_not_serialized():
+    dispatcher = HostDispatcher(host_of, max_concurrency=100, initial_limit=4)
+    items = [("dead.test", index) for index in range(20)]
+    # Timeouts: no answer, no latency
+    elapsed, peak = run_checks(dispatcher, items, 0.1, lambda item: (None, False))
+
+    # First wave at the initial limit, then every due check at once
+    assert elapsed < 0.35
+    assert peak["dead.test"] == 16
+
+
+def test_unreachable_host_stays_within_the_global_cap():
+    dispatcher = HostDispatcher(host_of, max_concurrency=5, initial_limit=1, assume_unreachable=True)
+    items = [("dead.test", index) for index in range(20)]
+    elapsed, peak = run_checks(dispatcher, items, 0.05, lambda item: (None, False))
+
+    assert peak["dead.test"] == 5
+    assert elapsed < 0.35
+
+
+def test_overload_answers_back_off():
+    dispatcher = HostDispatcher(host_of, max_concurrency=100, initial_limit=4)
+    items = [("busy.test", index) for index in range(12)]
+    _, peak = run_checks(dispatcher, items, 0.01, lambda item: (20.0, True))
+
+    assert peak["busy.test"] == 4
+    assert dispatcher.host_stats()["busy.test"]["limit"] == 1
+
+
+def test_hosts_are_served_round_robin():
+    dispatcher = HostDispatcher(host_of, max_concurrency=2, initial_limit=4)
+    started = []
+
+    async def handle(item):
+        started.append(item[0])
+        await asyncio.sleep(0.01)
+
+    async def scenario():
+        items = [("a.test", index) for index in range(4)] + [("b.test", index) for index in range(4)]
+        await dispatcher.run(items, handle, lambda result: (10.0, False))
+
+    asyncio.run(scenario())
+    assert started[:4] in (["a.test", "b.test"] * 2, ["b.test", "a.test"] * 2)
+
+
+def test_aimd_limit():
+    limit = AIMDLimit(initial=4, min_limit=1, max_limit=6)
+    for _ in range(100):
+        limit.on_success(20.0)
+    assert int(limit) == 6
+
+    limit.on_overload()
+    assert int(limit) == 3
+    for _ in range(10):
+        limit.on_overload()
+    assert int(limit) == 1
+
+    # Latency far above the baseline backs off gently
+    before = limit.limit = 4.0
+    limit.on_success(500.0)
+    assert limit.limit < before
@@ -0,0 +1,109 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from dns_cache import CachingResolver, DNSCache
+
+
+def counting_cache(answer=None, ttl=60.0, delay=0.0, **options):
+    """A cache whose lookups return answer (or fail without one) and are counted"""
+    cache = DNSCache(**options)
+    lookups = []
+
+    async def lookup(host, family):
+        lookups.append(host)
+        await asyncio.sleep(delay)
+        if answer is None:
+            raise socket.gaierror(socket.EAI_NONAME, f"{host}: not found")
+        return answer, ttl
+
+    cache._lookup = lookup
+    return cache, lookups
+
+
+def test_literal_addresses_are_not_looked_up():
+    cache, lookups = counting_cache()
+
+    async def scenario():
+        return await cache.resolve("127.0.0.1"), await cache.resolve("[::1]")
+
+    assert asyncio.run(scenario()) == ([(socket.AF_INET, "127.0.0.1")], [(socket.AF_INET6, "::1")])
+    assert lookups == []
+
+
+def test_answers_are_cached_for_their_clamped_ttl():
+    cache, lookups = counting_cache([(socket.AF_INET, "192.0.2.1")], ttl=1, min_ttl=5)
+
+    async def scenario():
+        first = await cache.resolve("Example.test")
+        second = await cache.resolve("example.test")
+        (expires_at, _), = cache._entries.values()
+        return first, second, expires_at - time.monotonic()
+
+    first, second, ttl = asyncio.run(scenario())
+    assert first == second == [(socket.AF_INET, "192.0.2.1")]
+    assert lookups == ["example.test"]
+    assert cache.stats()["hits"] == 1
+    # The record TTL of 1s is raised to min_ttl
+    assert 4 < ttl <= 5
+
+    # Expired entries are looked up again
+
+    cache._entries[("example.test", socket.AF_UNSPEC)] = (0, [(socket.AF_INET, "192.0.2.1")])
+    asyncio.run(cache.resolve("example.test"))
+    assert lookups == ["example.test", "example.test"]
+
+
+def test_failures_are_cached_for_the_negative_ttl():
+    cache, lookups = counting_cache(None)
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(socket.gaierror):
+                await cache.resolve("missing.test")
+
+    asyncio.run(scenario())
+    assert lookups == ["missing.test"]
+    assert cache.stats()["negative_hits"] == 2
+
+
+def test_concurrent_lookups_share_one_query():
+    cache, lookups = counting_cache([(socket.AF_INET, "192.0.2.1")], delay=0.05)
+
+    async def scenario():
+        impatient = asyncio.create_task(cache.resolve("example.test"))
+        waiting = [asyncio.create_task(cache.resolve("example.test")) for _ in range(9)]
+        await asyncio.sleep(0.01)
+        # A caller giving up (ping timeout) does not cancel the lookup of the others
+        impatient.cancel()
+        return await asyncio.gather(*waiting)
+
+    results = asyncio.run(scenario())
+    assert results == [[(socket.AF_INET, "192.0.2.1")]] * 9
+    assert lookups == ["example.test"]
+    assert cache.stats()["coalesced"] == 9
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_oldest_entry_is_dropped_when_full():
+    cache, lookups = counting_cache([(socket.AF_INET, "192.0.2.1")], max_entries=2)
+
+    async def scenario():
+        for host in ("a.test", "b.test", "c.test", "a.test"):
+            await cache.resolve(host)
+
+    asyncio.run(scenario())
+    assert lookups == ["a.test", "b.test", "c.test", "a.test"]
+    assert cache.stats()["entries"] == 2
+
+
+def test_caching_resolver_returns_aiohttp_host_entries():
+    cache, _ = counting_cache([(socket.AF_INET, "192.0.2.1"), (socket.AF_INET6, "2001:db8::1")])
+    hosts = asyncio.run(CachingResolver(cache).resolve("example.test", 443, socket.AF_UNSPEC))
+    assert [(host["host"], host["port"], host["family"]) for host in hosts] == [
+        ("192.0.2.1", 443, socket.AF_INET),
+        ("2001:db8::1", 443, socket.AF_INET6),
+    ]
+    assert all(host["hostname"] == "example.test" for host in hosts)
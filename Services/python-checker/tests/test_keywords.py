@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+import keywords
+from keywords import (
+    AhoCorasickMatcher,
+    AlternationMatcher,
+    SubstringMatcher,
+    compile_keywords,
+)
+
+ENGINES = [SubstringMatcher, AlternationMatcher]
+if keywords.ahocorasick is not None:
+    ENGINES.append(AhoCorasickMatcher)
+
+
+def baseline_missing(text, words, ignore_case=False):
+    """The original check: plain substring search per keyword"""
+    if ignore_case:
+        text = text.casefold()
+        return [k for k in words if k.casefold() not in text]
+    return [k for k in words if k not in text]
+
+
+def chunked_missing(matcher, text, chunk_size):
+    scanner = matcher.scanner()
+    for start in range(0, len(text), chunk_size):
+        scanner.feed(text[start:start + chunk_size])
+    return [k for k in matcher.keywords if k not in scanner.found]
+
+
+def random_cases():
+    rng = random.Random(7)
+    alphabet = "abcAB <>/"
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 300)))
+        words = list(dict.fromkeys(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))
+            for _ in range(rng.randint(1, 12))
+        ))
+        yield text, words, rng.randint(1, 16)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("ignore_case", [False, True])
+def test_engines_agree_with_substring_search_across_chunks(engine, ignore_case):
+    for text, words, chunk_size in random_cases():
+        matcher = engine(words, ignore_case)
+        expected = baseline_missing(text, words, ignore_case)
+        assert matcher.missing(text) == expected
+        assert chunked_missing(matcher, text, chunk_size) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_keyword_split_over_every_boundary(engine):
+    matcher = engine(["status: ok", "uptime"], False)
+    text = "<html>status: ok, uptime 99.9%</html>"
+    for chunk_size in range(1, len(text) + 1):
+        assert chunked_missing(matcher, text, chunk_size) == []
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ignore_case_matches_other_cases(engine):
+    matcher = engine(["Service Online", "ERROR"], True)
+    assert matcher.missing("<p>SERVICE ONLINE</p> no error here") == []
+    assert matcher.missing("<p>service offline</p>") == ["Service Online", "ERROR"]
+
+
+def test_compile_keywords_picks_the_engine():
+    assert isinstance(compile_keywords(["a", "b"]), SubstringMatcher)
+    many = [f"keyword{index}" for index in range(20)]
+    assert isinstance(compile_keywords(many), (AhoCorasickMatcher, AlternationMatcher))
+    assert compile_keywords(many, "ignore_case").mode == "ignore_case"
+    with pytest.raises(ValueError):
+        compile_keywords(["a"], "fuzzy")
+
+
+def test_regex_keywords_across_chunks():
+    matcher = compile_keywords([r"version \d+\.\d+", r"^missing$"], "regex")
+    text = "x" * 100 + "version 12.34" + "y" * 100
+    assert chunked_missing(matcher, text, 7) == [r"^missing$"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_ignore_case_folds_across_chunk_boundaries(engine):
+    # Folding changes the length: "ß" -> "ss", "İ" -> "i̇"
+    matcher = engine(["STRASSE", "ßtraße", "İstanbul"], True)
+    text = "Hauptstraße 1, ẞTRASSE, İSTANBUL"
+    expected = baseline_missing(text, matcher.keywords, True)
+    assert expected == []
+    for chunk_size in range(1, len(text) + 1):
+        assert chunked_missing(matcher, text, chunk_size) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_agree_on_text_that_folds_longer(engine):
+    rng = random.Random(11)
+    alphabet = "sSßẞiİ x"
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        words = list(dict.fromkeys(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(6)
+        ))
+        matcher = engine(words, True)
+        expected = baseline_missing(text, words, True)
+        assert chunked_missing(matcher, text, rng.randint(1, 5)) == expected
@@ -0,0 +1,80 @@
+import asyncio
+
+from log_writer import MonitorLogWriter
+
+
+def recording_writer(fail_times=0, delay=0.0, **options):
+    """A writer whose batches are recorded, the first fail_times writes fail"""
+    batches = []
+    failures = 0
+
+    async def write_batch(rows):
+        nonlocal failures
+        await asyncio.sleep(delay)
+        if failures < fail_times:
+            failures += 1
+            raise ConnectionError("database went away")
+        batches.append(list(rows))
+
+    return MonitorLogWriter(write_batch, **options), batches
+
+
+def test_full_batches_are_written_and_stop_drains_the_rest():
+    async def scenario():
+        writer, batches = recording_writer(max_batch_size=3, flush_interval=60)
+        for row in range(7):
+            await writer.put((row,))
+        await writer.stop()
+        return writer, batches
+
+    writer, batches = asyncio.run(scenario())
+    assert batches == [[(0,), (1,), (2,)], [(3,), (4,), (5,)], [(6,)]]
+    assert writer.stats == {"rows_written": 7, "rows_dropped": 0, "batches_written": 3}
+    assert not writer.running
+
+
+def test_partial_batch_is_flushed_after_the_interval():
+    async def scenario():
+        writer, batches = recording_writer(max_batch_size=100, flush_interval=0.05)
+        await writer.put((1,))
+        await writer.put((2,))
+        await asyncio.sleep(0.2)
+        written = list(batches)
+        await writer.stop()
+        return written
+
+    assert asyncio.run(scenario()) == [[(1,), (2,)]]
+
+
+def test_failed_batch_is_retried_then_dropped():
+    async def scenario():
+        retried, retried_batches = recording_writer(fail_times=1, max_retries=2, flush_interval=0)
+        dropped, dropped_batches = recording_writer(fail_times=1, max_retries=1, flush_interval=0)
+        for writer in (retried, dropped):
+            await writer.put((1,))
+            await writer.stop()
+        return retried, retried_batches, dropped, dropped_batches
+
+    retried, retried_batches, dropped, dropped_batches = asyncio.run(scenario())
+    assert retried_batches == [[(1,)]] and retried.stats["rows_written"] == 1
+    assert dropped_batches == [] and dropped.stats["rows_dropped"] == 1
+
+
+def test_full_queue_holds_producers_back():
+    async def scenario():
+        writer, batches = recording_writer(delay=0.1, max_batch_size=1, max_queue_size=2, flush_interval=0)
+        await writer.put((0,))
+        await asyncio.sleep(0)
+        # One row in the slow write, two queued, the next one waits
+        await writer.put((1,))
+        await writer.put((2,))
+        blocked = asyncio.create_task(writer.put((3,)))
+        await asyncio.sleep(0.01)
+        was_blocked = not blocked.done()
+        await blocked
+        await writer.stop()
+        return was_blocked, batches
+
+    was_blocked, batches = asyncio.run(scenario())
+    assert was_blocked
+    assert batches == [[(0,)], [(1,)], [(2,)], [(3,)]]
@@ -0,0 +1,42 @@
+from metrics import MetricsRegistry
+
+
+def families(text):
+    """metric name of every HELP/TYPE line and of every sample"""
+    declared, sampled = [], []
+    for line in text.splitlines():
+        if line.startswith("# "):
+            declared.append(line.split()[2])
+        else:
+            sampled.append(line.split("{")[0].split()[0])
+    return declared, sampled
+
+
+def test_counter_help_and_type_match_the_samples():
+    registry = MetricsRegistry(prefix="monitor_checker_")
+    registry.counter("log_rows", "Rows written", ("table",)).labels("monitor_logs").inc(3)
+    registry.counter("checks_total", "Completed checks").inc()
+    registry.counter("circuit_events", "Circuit events", ("event",), callback=lambda: {("opened",): 2})
+
+    text = registry.render()
+    declared, sampled = families(text)
+    assert set(sampled) == {
+        "monitor_checker_log_rows_total",
+        "monitor_checker_checks_total",
+        "monitor_checker_circuit_events_total",
+    }
+    assert set(declared) == set(sampled)
+    assert "# TYPE monitor_checker_log_rows_total counter" in text
+    assert 'monitor_checker_log_rows_total{table="monitor_logs"} 3' in text
+
+
+def test_histogram_samples():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("check_seconds", "Check duration", buckets=(0.1, 1))
+    histogram.labels().observe(0.5)
+
+    lines = registry.render().splitlines()
+    assert 'check_seconds_bucket{le="0.1"} 0' in lines
+    assert 'check_seconds_bucket{le="1"} 1' in lines
+    assert 'check_seconds_bucket{le="+Inf"} 1' in lines
+    assert "check_seconds_count 1" in lines
@@ -0,0 +1,42 @@
+import asyncio
+from datetime import UTC, datetime
+
+from Main import Monitor, MonitorChecker, MonitorResult
+
+
+def test_pushed_insert_is_checked_once():
+    async def scenario():
+        checker = MonitorChecker()
+        monitor = Monitor(7, "new", "ping", 60, hostname="127.0.0.1", port=1)
+        checks = []
+
+        async def discard(rows):
+            pass
+
+        async def load(monitor_ids):
+            return [monitor]
+
+        async def check(monitor):
+            checks.append(monitor.id)
+            return MonitorResult(success=True, status="succeeded", response_time=1, started_at=datetime.now(UTC))
+
+        async def reset(monitor_ids):
+            # The monitoring loop runs while the must_update flags are reset
+            due = checker.scheduler.pop_due()
+            if due:
+                await checker.run_batch_ping_checks(due, checker._reschedule_after_check)
+
+        checker.log_writer.write_batch = discard
+        checker._load_monitors_by_ids = load
+        checker._reset_monitor_updates = reset
+        checker._run_single_ping_check = check
+
+        await checker._process_monitor_updates([7])
+        await checker.log_writer.stop()
+        return checker, checks
+
+    checker, checks = asyncio.run(scenario())
+    assert checks == [7]
+    # Back in the scheduler for the next period
+    assert 7 in checker.scheduler
+    assert checker.scheduler.due_time(7) > datetime.now(UTC).timestamp() + 30
@@ -0,0 +1,43 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from Main import MonitorChecker, MonitorResult
+
+MONITORS = """
+CREATE TABLE monitors (id INTEGER PRIMARY KEY, label TEXT, periodicity INT, monitor_type TEXT,
+    status TEXT DEFAULT 'unknown', hostname TEXT, port INT, url TEXT, check_status INT,
+    keywords TEXT, updated_at TEXT);
+INSERT INTO monitors (id, label, periodicity, monitor_type, hostname, port, updated_at)
+    VALUES (1, 'ping', 60, 'ping', '127.0.0.1', 1, '2026-01-01 00:00:00');
+"""
+LOGS = """
+CREATE TABLE monitor_logs (id INTEGER PRIMARY KEY, monitor_id INT, started_at TEXT, status TEXT,
+    response_time_ms INT, created_at TEXT, updated_at TEXT{timings});
+"""
+TIMINGS = ", dns_time_ms INT, connect_time_ms INT, tls_time_ms INT, ttfb_ms INT, body_time_ms INT"
+
+
+@pytest.mark.parametrize("migrated", [True, False])
+def test_phase_timings_follow_the_schema(tmp_path, monkeypatch, migrated):
+    database = tmp_path / "monitors.sqlite"
+    with sqlite3.connect(database) as conn:
+        conn.executescript(MONITORS + LOGS.format(timings=TIMINGS if migrated else ""))
+    monkeypatch.setenv("DB_CONNECTION", "sqlite")
+    monkeypatch.setenv("DB_DATABASE", str(database))
+    monkeypatch.setenv("PREWARM_POOLS", "false")
+
+    async def scenario():
+        checker = MonitorChecker()
+        await checker.initialize_monitors()
+        monitor = checker.registry.get(1)
+        result = MonitorResult(success=True, status="succeeded", response_time=3, dns_time=1, connect_time=3)
+        await checker._save_result_async(monitor, result)
+        await checker.cleanup()
+        return checker
+
+    checker = asyncio.run(scenario())
+    assert checker.LOG_PHASE_TIMINGS == migrated
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("SELECT monitor_id, response_time_ms FROM monitor_logs").fetchall() == [(1, 3)]
@@ -0,0 +1,49 @@
+import asyncio
+from datetime import UTC, datetime
+
+from Main import Monitor, MonitorChecker, MonitorResult
+
+SLOW = 0.3
+
+
+def test_ping_batches_run_next_to_the_loop_and_share_the_slots():
+    async def scenario():
+        checker = MonitorChecker()
+        checker.ping_slots = asyncio.Semaphore(3)
+        slow = [Monitor(index, "slow", "ping", 60, hostname="slow.test", port=80) for index in range(1, 6)]
+        fast = [Monitor(index, "fast", "ping", 60, hostname="fast.test", port=80) for index in range(6, 11)]
+        checker.registry.upsert(slow + fast)
+        peak = in_flight = 0
+        finished = {}
+
+        async def discard(rows):
+            pass
+
+        async def check(monitor):
+            nonlocal peak, in_flight
+            in_flight += 1
+            peak = max(peak, in_flight)
+            started_at = datetime.now(UTC)
+            await asyncio.sleep(SLOW if monitor.hostname == "slow.test" else 0)
+            in_flight -= 1
+            finished[monitor.id] = asyncio.get_running_loop().time()
+            return MonitorResult(success=True, status="succeeded", response_time=1, started_at=started_at)
+
+        checker.log_writer.write_batch = discard
+        checker._run_single_ping_check = check
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        # Two ticks: the slow batch must not hold up the next one
+        checker._start_background_batch(checker.run_batch_ping_checks, slow)
+        checker._start_background_batch(checker.run_batch_ping_checks, fast)
+        handed_off = loop.time() - started
+        await asyncio.gather(*checker.background_batches)
+        await checker.log_writer.stop()
+        return checker, peak, finished, started, handed_off
+
+    checker, peak, finished, started, handed_off = asyncio.run(scenario())
+    assert handed_off < SLOW / 10
+    assert peak <= 3
+    # The fast monitors finish as soon as slots free up, not after the whole slow batch
+    assert max(finished[index] for index in range(6, 11)) - started < 2 * SLOW
+    assert all(index in checker.scheduler for index in range(1, 11))
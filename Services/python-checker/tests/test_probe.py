@@ -0,0 +1,57 @@
+import asyncio
+import os
+import socket
+
+from probe import TCPProbeEngine, _checksum
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_connect_probe_against_a_listening_port():
+    async def scenario():
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        engine = TCPProbeEngine()
+        results = await asyncio.gather(*(
+            engine.probe("127.0.0.1", port, socket.AF_INET, 2.0) for _ in range(20)
+        ))
+        server.close()
+        await server.wait_closed()
+        return engine, results
+
+    engine, results = asyncio.run(scenario())
+    assert all(result.success and result.rtt >= 0 for result in results)
+    assert len(engine) == 0
+
+
+def test_refused_connection_fails():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    # Bound but not listening, connects are refused
+    result = asyncio.run(TCPProbeEngine().probe("127.0.0.1", port, socket.AF_INET, 2.0))
+    listener.close()
+    assert not result.success and result.error
+
+
+def test_missing_port_fails_without_leaking_a_socket():
+    async def scenario():
+        engine = TCPProbeEngine()
+        return await asyncio.gather(*(
+            engine.probe("127.0.0.1", None, socket.AF_INET, 1.0) for _ in range(50)
+        ))
+
+    before = open_fds()
+    results = asyncio.run(scenario())
+    assert all(not result.success for result in results)
+    assert open_fds() <= before
+
+
+def test_icmp_checksum():
+    # Echo request, identifier 1, sequence 1, checksum field zeroed
+    header = bytes([8, 0, 0, 0, 0, 1, 0, 1])
+    checksum = _checksum(header)
+    assert checksum == 0xF7FD
+    assert _checksum(header[:2] + checksum.to_bytes(2, "big") + header[4:]) == 0
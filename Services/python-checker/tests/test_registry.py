@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+
+from registry import MonitorRegistry
+
+
+@dataclass
+class FakeMonitor:
+    id: int
+    periodicity: int = 60
+    monitor_type: str = "ping"
+
+
+def test_upsert_reports_added_and_updated_monitors():
+    registry = MonitorRegistry()
+    diff = registry.upsert([FakeMonitor(1), FakeMonitor(2)], watermark="2026-01-01 00:00:00")
+    assert [m.id for m in diff.added] == [1, 2] and not diff.updated
+
+    diff = registry.upsert(
+        [FakeMonitor(1), FakeMonitor(2, periodicity=30), FakeMonitor(3)],
+        watermark="2026-01-01 00:00:05",
+    )
+    assert [m.id for m in diff.added] == [3]
+    assert diff.updated == [(FakeMonitor(2), FakeMonitor(2, periodicity=30))]
+    assert len(diff) == 2
+    assert registry.get(2).periodicity == 30
+    assert registry.watermark == "2026-01-01 00:00:05"
+
+
+def test_unchanged_upsert_is_empty_and_keeps_the_watermark():
+    registry = MonitorRegistry()
+    registry.upsert([FakeMonitor(1)], watermark="2026-01-01 00:00:05")
+
+    diff = registry.upsert([FakeMonitor(1)], watermark="2026-01-01 00:00:00")
+    assert not diff
+    assert registry.watermark == "2026-01-01 00:00:05"
+
+
+def test_remove_and_retain_report_removed_monitors():
+    registry = MonitorRegistry()
+    registry.upsert([FakeMonitor(monitor_id) for monitor_id in range(1, 6)])
+
+    diff = registry.remove([2, 42])
+    assert [m.id for m in diff.removed] == [2]
+    diff = registry.retain([1, 3])
+    assert sorted(m.id for m in diff.removed) == [4, 5]
+    assert sorted(registry.ids()) == [1, 3]
+    assert 2 not in registry and registry.get(4) is None
+
+
+def test_checksum_follows_inserts_and_deletes():
+    registry = MonitorRegistry()
+    assert registry.checksum == (0, 0)
+    registry.upsert([FakeMonitor(3), FakeMonitor(10)])
+    # Updates keep the checksum
+    registry.upsert([FakeMonitor(3, periodicity=30)])
+    assert registry.checksum == (2, 13)
+
+    registry.remove([3, 3])
+    assert registry.checksum == (1, 10)
+    registry.retain([])
+    assert registry.checksum == (0, 0)
+
+
+def test_by_type():
+    registry = MonitorRegistry()
+    registry.upsert([FakeMonitor(1), FakeMonitor(2, monitor_type="website"), FakeMonitor(3)])
+
+    assert [m.id for m in registry.by_type("ping")] == [1, 3]
+    assert [m.id for m in registry.by_type("website")] == [2]
@@ -0,0 +1,92 @@
+import asyncio
+
+from Main import MonitorChecker
+from storage import SQLiteBackend
+
+SCHEMA = """
+CREATE TABLE monitors (id INTEGER PRIMARY KEY, label TEXT, periodicity INT, monitor_type TEXT,
+    hostname TEXT, port INT, url TEXT, check_status INT, keywords TEXT, updated_at TEXT);
+CREATE TABLE monitor_deletions (id INTEGER PRIMARY KEY, monitor_id INT, deleted_at TEXT);
+CREATE TRIGGER after_monitor_delete AFTER DELETE ON monitors FOR EACH ROW BEGIN
+    INSERT INTO monitor_deletions (monitor_id, deleted_at) VALUES (OLD.id, datetime('now'));
+END;
+"""
+
+
+async def open_checker(tmp_path, deletions: bool = True):
+    storage = SQLiteBackend(str(tmp_path / "monitors.sqlite"))
+    await storage.connect()
+    await storage._run(storage.conn.executescript, SCHEMA)
+    if not deletions:
+        await storage.execute("DROP TRIGGER after_monitor_delete")
+        await storage.execute("DROP TABLE monitor_deletions")
+    await storage.execute_many(
+        "INSERT INTO monitors (id, label, periodicity, monitor_type, hostname, port, updated_at) "
+        "VALUES (%s, %s, 60, 'ping', 'example.test', 443, '2026-01-01 00:00:00')",
+        [(monitor_id, f"ping {monitor_id}") for monitor_id in range(1, 6)],
+    )
+    checker = MonitorChecker()
+    checker.storage = storage
+    try:
+        checker.deletions_watermark = await checker._load_deletions_watermark()
+    except Exception:
+        pass
+    await checker.sync_registry()
+
+    checksums = []
+    load_checksum = checker._load_monitor_checksum
+
+    async def counting_checksum():
+        checksums.append(1)
+        return await load_checksum()
+
+    checker._load_monitor_checksum = counting_checksum
+    return checker, storage, checksums
+
+
+def test_deletions_come_from_the_deletion_log(tmp_path):
+    async def scenario():
+        checker, storage, checksums = await open_checker(tmp_path)
+        await storage.execute("DELETE FROM monitors WHERE id IN (2, 4)")
+        first = await checker.sync_registry()
+        second = await checker.sync_registry()
+        await storage.close()
+        return checker, first, second, checksums
+
+    checker, first, second, checksums = asyncio.run(scenario())
+    assert sorted(m.id for m in first.removed) == [2, 4]
+    assert not second
+    assert sorted(checker.registry.ids()) == [1, 3, 5]
+    # No full table scan between checksum intervals
+    assert checksums == []
+
+
+def test_checksum_catches_deletions_missing_from_the_log(tmp_path):
+    async def scenario():
+        checker, storage, checksums = await open_checker(tmp_path)
+        await storage.execute("DELETE FROM monitors WHERE id = 3")
+        await storage.execute("DELETE FROM monitor_deletions")
+        missed = await checker.sync_registry()
+        checker.checksum_checked_at -= checker.REGISTRY_CHECKSUM_INTERVAL
+        caught = await checker.sync_registry()
+        await storage.close()
+        return missed, caught, checksums
+
+    missed, caught, checksums = asyncio.run(scenario())
+    assert not missed
+    assert [m.id for m in caught.removed] == [3]
+    assert checksums == [1]
+
+
+def test_without_a_deletion_log_the_checksum_runs_every_sync(tmp_path):
+    async def scenario():
+        checker, storage, checksums = await open_checker(tmp_path, deletions=False)
+        await storage.execute("DELETE FROM monitors WHERE id = 1")
+        diff = await checker.sync_registry()
+        await storage.close()
+        return checker, diff, checksums
+
+    checker, diff, checksums = asyncio.run(scenario())
+    assert checker.deletions_watermark is None
+    assert [m.id for m in diff.removed] == [1]
+    assert checksums == [1]
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from request_strategy import RequestStrategy, response_bytes
+
+
+@dataclass
+class FakeMonitor:
+    id: int
+    url: str = "https://example.test/"
+    keywords: Optional[List[str]] = None
+
+
+class FakeContent:
+    total_bytes = 100
+
+
+@dataclass
+class FakeResponse:
+    headers: dict = field(default_factory=dict)
+    reason: str = "OK"
+    raw_headers: tuple = ((b"ETag", b'"v1"'),)
+    content: FakeContent = field(default_factory=FakeContent)
+
+
+def test_head_only_without_keywords():
+    strategy = RequestStrategy()
+    assert strategy.method(FakeMonitor(1)) == "HEAD"
+    assert strategy.method(FakeMonitor(2, keywords=["ok"])) == "GET"
+    assert RequestStrategy(head_enabled=False).method(FakeMonitor(1)) == "GET"
+
+
+def test_rejected_head_uses_get_until_the_retry_interval():
+    strategy = RequestStrategy(head_retry_interval=60)
+    monitor = FakeMonitor(1)
+    assert strategy.needs_confirmation(monitor, 405)
+    strategy.head_rejected(monitor)
+    assert strategy.method(monitor) == "GET"
+
+    # A new URL, or the end of the interval, tries HEAD again
+    assert strategy.method(FakeMonitor(1, url="https://other.test/")) == "HEAD"
+    strategy.head_rejected(monitor)
+    url, until = strategy._get_only[1]
+    strategy._get_only[1] = (url, until - 61)
+    assert strategy.method(monitor) == "HEAD"
+
+
+def test_failed_head_is_confirmed_once_per_status_code():
+    strategy = RequestStrategy()
+    monitor = FakeMonitor(1)
+    assert strategy.needs_confirmation(monitor, 500)
+    strategy.head_confirmed(monitor, 500)
+    assert not strategy.needs_confirmation(monitor, 500)
+    assert strategy.needs_confirmation(monitor, 503)
+    # Rejections are always repeated as GET
+    assert strategy.needs_confirmation(monitor, 405)
+    # A successful HEAD resets it
+    strategy.head_confirmed(monitor, None)
+    assert strategy.needs_confirmation(monitor, 500)
+
+
+def test_conditional_requests_reuse_the_keyword_verdict():
+    strategy = RequestStrategy()
+    monitor = FakeMonitor(1, keywords=["ok", "up"])
+    assert strategy.conditional_headers(monitor) is None
+
+    response = FakeResponse({"ETag": '"v1"', "Last-Modified": "Sat, 17 Oct 2026 07:00:00 GMT"})
+    strategy.remember(monitor, response, ["up"])
+    assert strategy.conditional_headers(monitor) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Sat, 17 Oct 2026 07:00:00 GMT",
+    }
+    assert strategy.cached_verdict(monitor) == ["up"]
+
+    # Edited keywords or URL invalidate the verdict
+    assert strategy.cached_verdict(FakeMonitor(1, keywords=["ok"])) is None
+    assert strategy.cached_verdict(FakeMonitor(1, url="https://other.test/", keywords=["ok", "up"])) is None
+
+    # A response without validators drops it
+    strategy.remember(monitor, FakeResponse(), [])
+    assert strategy.conditional_headers(monitor) is None
+
+
+def test_disabled_conditional_requests_cache_nothing():
+    strategy = RequestStrategy(conditional_enabled=False)
+    monitor = FakeMonitor(1, keywords=["ok"])
+    strategy.remember(monitor, FakeResponse({"ETag": '"v1"'}), [])
+    assert strategy.conditional_headers(monitor) is None
+
+
+def test_forget_drops_every_state_of_a_monitor():
+    strategy = RequestStrategy()
+    monitor = FakeMonitor(1, keywords=["ok"])
+    strategy.remember(monitor, FakeResponse({"ETag": '"v1"'}), [])
+    strategy.head_rejected(FakeMonitor(1))
+    strategy.forget(1)
+    assert strategy.cached_verdict(monitor) is None
+    assert strategy.method(FakeMonitor(1)) == "HEAD"
+
+
+def test_response_bytes_counts_status_line_headers_and_body():
+    # "HTTP/1.1 200 OK\r\n" + 'ETag: "v1"\r\n' + "\r\n" + 100 body bytes
+    assert response_bytes(FakeResponse()) == 17 + 12 + 2 + 100
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from rollups import RollupWriter, format_timestamp, purge_expired
+from storage import SQLiteBackend
+
+SCHEMA = """
+CREATE TABLE monitor_logs_minutely (monitor_id INT, bucket_start TEXT, checks INT, failures INT,
+    response_time_avg_ms REAL, response_time_p50_ms INT, response_time_p95_ms INT,
+    response_time_max_ms INT, latency_histogram TEXT, PRIMARY KEY (monitor_id, bucket_start));
+CREATE TABLE monitor_logs_hourly (monitor_id INT, bucket_start TEXT, checks INT, failures INT,
+    response_time_avg_ms REAL, response_time_p50_ms INT, response_time_p95_ms INT,
+    response_time_max_ms INT, latency_histogram TEXT, PRIMARY KEY (monitor_id, bucket_start));
+"""
+
+
+async def open_storage(path) -> SQLiteBackend:
+    storage = SQLiteBackend(str(path))
+    await storage.connect()
+    await storage._run(storage.conn.executescript, SCHEMA)
+    return storage
+
+
+def log_rows(monitor_id: int, count: int, status: str = "succeeded"):
+    started_at = format_timestamp(time.time())
+    return [(monitor_id, started_at, status, 100) for _ in range(count)]
+
+
+def test_handoff_keeps_the_checks_of_both_owners(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "rollups.sqlite")
+
+        async def get_storage():
+            return storage
+
+        owner = {"old": True}
+        old = RollupWriter(get_storage, owns=lambda monitor_id: owner["old"])
+        new = RollupWriter(get_storage, owns=lambda monitor_id: not owner["old"])
+        old.add_log_rows(log_rows(1, 3))
+
+        # Rebalance: the new owner holds its buckets until the old one wrote its part
+        owner["old"] = False
+        take_over = asyncio.create_task(new.take_over([1], delay=0.05))
+        await asyncio.sleep(0)
+        new.add_log_rows(log_rows(1, 2, "failed"))
+        await new.flush(force=True)
+        # A check of the old owner that was in flight is left to the new owner
+        old.add_log_rows(log_rows(1, 1))
+        assert await old.hand_off(lambda monitor_id: not owner["old"]) == 2
+        assert await take_over == 2
+        await new.flush(force=True)
+
+        rows = await storage.fetch_all("SELECT checks, failures FROM monitor_logs_minutely")
+        await storage.close()
+        return old, rows
+
+    old, rows = asyncio.run(scenario())
+    assert [(row["checks"], row["failures"]) for row in rows] == [(5, 2)]
+    assert old.aggregator.open_buckets() == 0
+
+
+def test_purge_expired_deletes_rollups_in_row_chunks(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "purge.sqlite")
+        rows = [
+            (monitor_id, format_timestamp(86400 * day), 1, 0, 1.0, 1, 1, 1, "")
+            for monitor_id in range(1, 11)
+            for day in range(1, 4)
+        ]
+        await storage.execute_many(
+            f"INSERT INTO monitor_logs_minutely ({RollupWriter.COLUMNS}) VALUES ({', '.join(['%s'] * 9)})", rows
+        )
+        statements = []
+        execute = storage.execute
+
+        async def counting_execute(query, params=()):
+            statements.append(len(params) - 1)
+            return await execute(query, params)
+
+        storage.execute = counting_execute
+        deleted = await purge_expired(
+            storage, "monitor_logs_minutely", "bucket_start", ("monitor_id", "bucket_start"),
+            86400 * 3, chunk_size=4, pause=0,
+        )
+        left = await storage.fetch_all("SELECT monitor_id, bucket_start FROM monitor_logs_minutely")
+        await storage.close()
+        return deleted, statements, left
+
+    deleted, statements, left = asyncio.run(scenario())
+    assert deleted == 20
+    # At most chunk_size rows (two key columns each) per DELETE
+    assert max(statements) <= 8
+    assert len(left) == 10 and all(row["bucket_start"] == format_timestamp(86400 * 3) for row in left)
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+
+from scheduler import MonitorScheduler, next_check_time, phase_slot
+
+NOW = 1_000_000.0
+
+
+@dataclass
+class FakeMonitor:
+    id: int
+    periodicity: int = 60
+    monitor_type: str = "ping"
+
+
+def new_scheduler(monitor_ids):
+    """A scheduler resolving ids through a dict, as Main does with the registry"""
+    registry = {monitor_id: FakeMonitor(monitor_id) for monitor_id in monitor_ids}
+    return MonitorScheduler(registry.get), registry
+
+
+def test_pop_due_returns_due_monitors_earliest_first():
+    scheduler, registry = new_scheduler(range(1, 6))
+    for monitor_id, offset in ((1, 30), (2, -5), (3, 10), (4, -20), (5, 0)):
+        scheduler.schedule(registry[monitor_id], NOW + offset)
+
+    assert [m.id for m in scheduler.pop_due(NOW)] == [4, 2, 5]
+    assert len(scheduler) == 2
+    assert scheduler.next_due() == NOW + 10
+    assert [m.id for m in scheduler.pop_due(NOW + 60)] == [3, 1]
+    assert scheduler.next_due() is None
+
+
+def test_reschedule_moves_a_monitor():
+    scheduler, registry = new_scheduler([1, 2])
+    scheduler.schedule(registry[1], NOW + 10)
+    scheduler.schedule(registry[2], NOW + 20)
+    # Both directions: later and sooner than before
+    scheduler.schedule(registry[1], NOW + 30)
+    scheduler.schedule(registry[2], NOW + 5)
+
+    assert len(scheduler) == 2
+    assert scheduler.due_time(1) == NOW + 30
+    assert [m.id for m in scheduler.pop_due(NOW + 20)] == [2]
+    assert [m.id for m in scheduler.pop_due(NOW + 30)] == [1]
+
+
+def test_pop_due_returns_the_current_monitor():
+    scheduler, registry = new_scheduler([1])
+    scheduler.schedule(registry[1], NOW)
+    # Edited while it was waiting
+    registry[1] = FakeMonitor(1, periodicity=30)
+
+    (monitor,) = scheduler.pop_due(NOW)
+    assert monitor is registry[1]
+
+
+def test_monitors_gone_from_the_lookup_are_dropped():
+    scheduler, registry = new_scheduler([1, 2, 3])
+    for monitor in registry.values():
+        scheduler.schedule(monitor, NOW)
+    del registry[2]
+
+    assert [m.id for m in scheduler.pop_due(NOW, limit=2)] == [1, 3]
+    assert 2 not in scheduler._slots and len(scheduler) == 0
+    # Its slot is reused
+    registry[4] = FakeMonitor(4)
+    scheduler.schedule(registry[4], NOW)
+    assert len(scheduler.ids) == 3
+
+
+def test_remove_drops_a_monitor_and_reuses_its_slot():
+    scheduler, registry = new_scheduler(range(1, 7))
+    for monitor_id in range(1, 6):
+        scheduler.schedule(registry[monitor_id], NOW + monitor_id)
+
+    assert scheduler.remove(3)
+    assert not scheduler.remove(3)
+    assert 3 not in scheduler and scheduler.due_time(3) is None
+    scheduler.schedule(registry[6], NOW)
+
+    assert [m.id for m in scheduler.pop_due(NOW + 10)] == [6, 1, 2, 4, 5]
+    # Popped monitors are no longer scheduled
+    assert not scheduler.remove(1)
+
+
+def test_stale_entries_are_compacted():
+    scheduler, registry = new_scheduler(range(1, 11))
+    monitors = list(registry.values())
+    for step in range(50):
+        for monitor in monitors:
+            scheduler.schedule(monitor, NOW + step + monitor.id / 100)
+
+    assert len(scheduler._heap) <= (MonitorScheduler.COMPACT_FACTOR + 1) * len(monitors) + 1
+    assert [m.id for m in scheduler.pop_due(NOW + 100)] == list(range(1, 11))
+
+
+def test_pop_due_respects_the_limit():
+    scheduler, registry = new_scheduler(range(1, 6))
+    for monitor_id in range(1, 6):
+        scheduler.schedule(registry[monitor_id], NOW - monitor_id)
+
+    assert [m.id for m in scheduler.pop_due(NOW, limit=2)] == [5, 4]
+    assert [m.id for m in scheduler.pop_due(NOW)] == [3, 2, 1]
+
+
+def test_next_check_time_keeps_the_periodicity():
+    for monitor_id in range(1, 50):
+        first = next_check_time(monitor_id, 60, NOW, NOW)
+        second = next_check_time(monitor_id, 60, first, first)
+        assert second - first == 60
+        # The first check moves at most half a period to reach the phase slot
+        assert abs(first - (NOW + 60)) <= 30
+        assert phase_slot(monitor_id, 60, first) == first
+
+
+def test_next_check_time_ramps_overdue_monitors():
+    dues = [next_check_time(monitor_id, 300, None, NOW, ramp_window=30) for monitor_id in range(1, 101)]
+    assert all(NOW <= due < NOW + 30 for due in dues)
+    assert len({int(due) for due in dues}) > 20
+
+
+def test_fractional_rate_releases_monitors():
+    registry = {monitor_id: FakeMonitor(monitor_id) for monitor_id in range(1, 6)}
+    scheduler = MonitorScheduler(registry.get, max_rate=0.5)
+    for monitor_id in range(1, 6):
+        scheduler.schedule(registry[monitor_id], NOW - monitor_id)
+
+    # One token up front, then one every two seconds
+    assert [m.id for m in scheduler.pop_due(NOW)] == [5]
+    assert scheduler.pop_due(NOW) == []
+    scheduler._refilled -= 2
+    assert [m.id for m in scheduler.pop_due(NOW)] == [4]
+    # Never more than one at a time
+    scheduler._refilled -= 60
+    assert [m.id for m in scheduler.pop_due(NOW)] == [3]
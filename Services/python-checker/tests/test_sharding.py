@@ -0,0 +1,72 @@
+import asyncio
+
+from sharding import ShardCoordinator, rendezvous_owner, worker_seed
+from storage import SQLiteBackend
+
+
+async def open_storage(path) -> SQLiteBackend:
+    storage = SQLiteBackend(str(path))
+    await storage.connect()
+    await storage.execute("CREATE TABLE checker_leases (worker_id TEXT PRIMARY KEY, expires_at INT)")
+    return storage
+
+
+def test_lease_is_renewed_within_the_same_second(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "leases.sqlite")
+        # Restart with a fixed SHARD_WORKER_ID, the old lease is still there
+        await storage.execute("INSERT INTO checker_leases VALUES ('worker-a', 4102444800)")
+        shard = ShardCoordinator(storage, worker_id="worker-a", lease_ttl=15)
+        await shard.heartbeat()
+        await shard.heartbeat()
+        rows = await storage.fetch_all("SELECT worker_id, expires_at FROM checker_leases")
+        await storage.close()
+        return shard, rows
+
+    shard, rows = asyncio.run(scenario())
+    assert [row["worker_id"] for row in rows] == ["worker-a"]
+    assert rows[0]["expires_at"] < 4102444800
+    assert shard.has_lease and shard.owns(1)
+
+
+def test_expired_lease_owns_nothing_until_renewed(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "leases.sqlite")
+        shard = ShardCoordinator(storage, worker_id="worker-a", lease_ttl=15)
+        assert not await shard.heartbeat()
+
+        # The database was unreachable for longer than the TTL
+        shard._renewed_at -= 20
+        lapsed = shard.owns(1)
+        changed = await shard.heartbeat()
+        await storage.close()
+        return shard, lapsed, changed
+
+    shard, lapsed, changed = asyncio.run(scenario())
+    assert not lapsed
+    # Renewing counts as a membership change, every monitor is taken over again
+    assert changed
+    assert shard.owns(1) and not shard.owned_before(1)
+
+
+def test_membership_change_moves_few_monitors(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "leases.sqlite")
+        shards = [ShardCoordinator(storage, worker_id=f"worker-{index}") for index in range(3)]
+        for shard in shards:
+            await shard.heartbeat()
+        changed = [await shard.heartbeat() for shard in shards]
+        await storage.close()
+        return shards, changed
+
+    shards, changed = asyncio.run(scenario())
+    assert changed == [True, True, False]
+    owners = [[shard.owns(monitor_id) for shard in shards].count(True) for monitor_id in range(1, 1001)]
+    assert owners == [1] * 1000
+
+    seeds = [worker_seed(f"worker-{index}") for index in range(3)]
+    moved = sum(
+        rendezvous_owner(monitor_id, seeds) != rendezvous_owner(monitor_id, seeds + [worker_seed("worker-3")])
+        for monitor_id in range(1, 10001)
+    )
+    assert 1500 < moved < 3500
@@ -0,0 +1,106 @@
+import asyncio
+
+from status_tracker import StatusTracker, replay_transitions
+from storage import SQLiteBackend
+
+SCHEMA = """
+CREATE TABLE monitors (id INTEGER PRIMARY KEY, status TEXT DEFAULT 'unknown');
+CREATE TABLE monitor_status_transitions (id INTEGER PRIMARY KEY, monitor_id INT,
+    previous_status TEXT, status TEXT, changed_at TEXT);
+"""
+
+
+async def open_storage(path) -> SQLiteBackend:
+    storage = SQLiteBackend(str(path))
+    await storage.connect()
+    await storage._run(storage.conn.executescript, SCHEMA)
+    await storage.execute_many(
+        "INSERT INTO monitors (id, status) VALUES (%s, 'succeeded')", [(1,), (2,), (3,)]
+    )
+    return storage
+
+
+def test_observe_records_transitions_only():
+    tracker = StatusTracker(None, write_status=True)
+    tracker.seed(1, "succeeded")
+
+    assert tracker.observe(1, "succeeded", "2026-01-01 00:00:00") is None
+    assert tracker.observe(1, "failed", "2026-01-01 00:01:00") == (
+        1, "succeeded", "failed", "2026-01-01 00:01:00"
+    )
+    # Unknown previous status: monitors.status is written, no transition
+    assert tracker.observe(2, "failed", "2026-01-01 00:01:00") is None
+    assert tracker.stats == {"transitions": 1, "unchanged": 1, "status_writes": 0}
+    assert tracker._pending_status == {1: "failed", 2: "failed"}
+
+
+def test_replay_gives_the_status_at_any_time(tmp_path):
+    log_rows = [
+        (1, "2026-01-01 00:01:00", "failed"),
+        (2, "2026-01-01 00:01:00", "succeeded"),
+        (1, "2026-01-01 00:02:00", "failed"),
+        (3, "2026-01-01 00:02:00", "failed"),
+        (1, "2026-01-01 00:03:00", "succeeded"),
+        (3, "2026-01-01 00:04:00", "succeeded"),
+    ]
+
+    async def scenario():
+        storage = await open_storage(tmp_path / "status.sqlite")
+
+        async def get_storage():
+            return storage
+
+        tracker = StatusTracker(get_storage, write_status=True)
+        for monitor_id in (1, 2, 3):
+            tracker.seed(monitor_id, "succeeded")
+        for row in log_rows:
+            tracker.add_log_rows([row])
+            await tracker.flush()
+
+        statuses = {row["id"]: row["status"] for row in await storage.fetch_all("SELECT id, status FROM monitors")}
+        now = await replay_transitions(storage, chunk_size=2)
+        past = await replay_transitions(storage, until="2026-01-01 00:02:30")
+        before = await replay_transitions(storage, until="2026-01-01 00:00:30")
+        await storage.close()
+        return tracker, statuses, now, past, before
+
+    tracker, statuses, now, past, before = asyncio.run(scenario())
+    assert tracker.stats["transitions"] == 4
+    assert statuses == {1: "succeeded", 2: "succeeded", 3: "succeeded"}
+    assert now == {1: "succeeded", 3: "succeeded"}
+    assert past == {1: "failed", 3: "failed"}
+    assert before == {}
+
+
+def test_failed_flush_is_retried(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path / "retry.sqlite")
+
+        async def get_storage():
+            return storage
+
+        tracker = StatusTracker(get_storage, write_status=True)
+        tracker.seed(1, "succeeded")
+        tracker.observe(1, "failed", "2026-01-01 00:01:00")
+
+        execute_many = storage.execute_many
+
+        async def failing_execute_many(query, rows):
+            raise RuntimeError("database is gone")
+
+        storage.execute_many = failing_execute_many
+        try:
+            await tracker.flush()
+        except RuntimeError:
+            pass
+        storage.execute_many = execute_many
+        await tracker.flush()
+
+        replayed = await replay_transitions(storage)
+        status = await storage.fetch_one("SELECT status FROM monitors WHERE id = 1")
+        await storage.close()
+        return replayed, status
+
+    replayed, status = asyncio.run(scenario())
+    assert replayed == {1: "failed"}
+    assert status["status"] == "failed"
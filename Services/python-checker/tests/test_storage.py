@@ -0,0 +1,64 @@
+import asyncio
+
+from storage import ExecutorMySQLBackend
+
+
+class FakeCursor:
+    def __init__(self, rows: int):
+        self.rows = [{"id": index} for index in range(rows)]
+
+    def execute(self, query, params):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def cursor(self, dictionary=False, buffered=True):
+        return FakeCursor(1000)
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def get_connection(self):
+        return FakeConnection()
+
+
+def test_abandoned_stream_releases_the_worker_thread():
+    async def scenario():
+        backend = ExecutorMySQLBackend({}, pool_size=2)
+        backend.pool = FakePool()
+        chunks = 0
+        async for rows in backend.stream("SELECT id FROM monitor_logs", chunk_size=10):
+            chunks += 1
+            # Let the thread fill the queue before leaving
+            await asyncio.sleep(0.05)
+            if chunks == 2:
+                break
+        # close() waits for the executor threads, it must not hang on the stream
+        closing = asyncio.get_running_loop().run_in_executor(None, backend.executor.shutdown, True)
+        await asyncio.wait_for(closing, timeout=5)
+        return chunks, backend.pool_stats()
+
+    chunks, stats = asyncio.run(scenario())
+    assert chunks == 2
+    assert stats["in_use"] == 0
+
+
+def test_stream_yields_every_row():
+    async def scenario():
+        backend = ExecutorMySQLBackend({}, pool_size=2)
+        backend.pool = FakePool()
+        rows = [row async for chunk in backend.stream("SELECT id FROM monitor_logs", chunk_size=64) for row in chunk]
+        await backend.close()
+        return rows
+
+    rows = asyncio.run(scenario())
+    assert [row["id"] for row in rows] == list(range(1000))
@@ -0,0 +1,139 @@
+"""
+Request Tracing - per-phase latency of website checks
+
+Splits the time of a request into the phases that tell our side from
+theirs, using the monotonic clock:
+- dns: name resolution (aiohttp resolve hooks)
+- connect: TCP handshake
+- tls: TLS handshake (taken from the SSL context when it wraps the socket,
+  aiohttp has no hook for it)
+- ttfb: request sent until the response headers arrived
+- body: reading the response body (measured by the caller)
+
+Reused keep-alive connections have no dns/connect/tls phases.
+"""
+
+import ssl
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from aiohttp import TraceConfig
+
+# Timings of the request running in the current task, read by the SSL context
+current_timings: ContextVar[Optional["PhaseTimings"]] = ContextVar(
+    "current_timings", default=None
+)
+
+
+def _ms(seconds: Optional[float]) -> Optional[int]:
+    return None if seconds is None else max(0, round(seconds * 1000))
+
+
+class PhaseTimings:
+    """Monotonic timestamps of one request"""
+
+    __slots__ = (
+        "started",
+        "dns",
+        "dns_started",
+        "connect_started",
+        "tls_started",
+        "connected",
+        "headers",
+        "body",
+    )
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.dns = 0.0
+        self.dns_started: Optional[float] = None
+        self.connect_started: Optional[float] = None
+        self.tls_started: Optional[float] = None
+        self.connected: Optional[float] = None
+        self.headers: Optional[float] = None
+        self.body: Optional[float] = None
+
+    def mark_headers(self):
+        self.headers = time.monotonic()
+
+    def phases(self) -> Dict[str, Optional[int]]:
+        """Phase durations in milliseconds (None when a phase did not happen)"""
+        connect = tls = None
+        if self.connect_started is not None and self.connected is not None:
+            handshake_started = self.tls_started or self.connected
+            connect = handshake_started - self.connect_started - self.dns
+            if self.tls_started is not None:
+                tls = self.connected - self.tls_started
+
+        ttfb = None
+        if self.headers is not None:
+            ttfb = self.headers - (self.connected or self.started)
+
+        return {
+            "dns": _ms(self.dns) if self.connect_started is not None else None,
+            "connect": _ms(connect),
+            "tls": _ms(tls),
+            "ttfb": _ms(ttfb),
+            "body": _ms(self.body),
+        }
+
+    def response_time(self) -> int:
+        """Time until the response headers, without name resolution (ms)"""
+        end = self.headers if self.headers is not None else time.monotonic()
+        return _ms(end - self.started - self.dns)
+
+
+class TimingSSLContext(ssl.SSLContext):
+    """SSL context that records when the TLS handshake of a connection starts"""
+
+    def __repr__(self) -> str:
+        # Shown in aiohttp connection errors ("ssl:...")
+        return "unverified"
+
+    def wrap_bio(self, *args, **kwargs):
+        timings = current_timings.get()
+        if timings is not None:
+            timings.tls_started = time.monotonic()
+        return super().wrap_bio(*args, **kwargs)
+
+
+def unverified_ssl_context() -> TimingSSLContext:
+    """TLS without certificate verification (the checker's ssl=False behaviour)"""
+    context = TimingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def phase_trace_config() -> TraceConfig:
+    """Record phase timestamps into the PhaseTimings passed as trace_request_ctx"""
+
+    def timings_of(context) -> Optional[PhaseTimings]:
+        timings = context.trace_request_ctx
+        return timings if isinstance(timings, PhaseTimings) else None
+
+    async def on_dns_start(session, context, params):
+        if timings := timings_of(context):
+            timings.dns_started = time.monotonic()
+
+    async def on_dns_end(session, context, params):
+        timings = timings_of(context)
+        if timings and timings.dns_started is not None:
+            timings.dns += time.monotonic() - timings.dns_started
+            timings.dns_started = None
+
+    async def on_connection_start(session, context, params):
+        if timings := timings_of(context):
+            timings.connect_started = time.monotonic()
+
+    async def on_connection_end(session, context, params):
+        if timings := timings_of(context):
+            timings.connected = time.monotonic()
+
+    trace_config = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_end)
+    trace_config.on_connection_create_start.append(on_connection_start)
+    trace_config.on_connection_create_end.append(on_connection_end)
+    return trace_config
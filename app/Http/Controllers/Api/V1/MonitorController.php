@@ -4,6 +4,7 @@
 
 use App\Http\Controllers\Controller;
 use App\Models\Monitor;
+use App\Services\CheckerNotifier;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Log;
 
@@ -64,6 +65,7 @@ public function store(Request $request)
             'monitor_id' => $monitor->id,
             'must_update' => true,
         ]);
+        CheckerNotifier::notify($monitor->id);
         Log::info('Monitor created', ['monitor' => $monitor]);
 
         return response()->json($monitor, 201);
@@ -136,6 +138,7 @@ public function update(Request $request, Monitor $monitor)
         // Set must_update to true for the corresponding MonitorUpdate
         \App\Models\MonitorUpdate::where('monitor_id', $monitor->id)
             ->update(['must_update' => true]);
+        CheckerNotifier::notify($monitor->id);
         Log::info('Monitor updated', ['monitor' => $monitor]);
 
         return $monitor;
@@ -164,6 +167,7 @@ public function update(Request $request, Monitor $monitor)
     public function destroy(Monitor $monitor)
     {
         $monitor->delete();
+        CheckerNotifier::notify($monitor->id);
         Log::info('Monitor deleted', ['monitor' => $monitor->id]);
 
         return response()->json(null, 204);
@@ -0,0 +1,122 @@
+<?php
+
+namespace App\Http\Controllers\Api\V1;
+
+use App\Http\Controllers\Controller;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * MonitorLogRollupController serves the per-minute and per-hour aggregates of
+ * monitor logs written by the checker, for graphs over longer time ranges.
+ */
+class MonitorLogRollupController extends Controller
+{
+    /*
+    * Resolution => rollup table.
+    */
+    private const TABLES = [
+        'minute' => 'monitor_logs_minutely',
+        'hour' => 'monitor_logs_hourly',
+    ];
+
+    /**
+     * @OA\Get(
+     *     path="/api/v1/monitors/{monitorId}/rollups",
+     *     summary="Get aggregated monitor logs",
+     *     tags={"MonitorLogs"},
+     *
+     *     @OA\Parameter(
+     *         name="monitorId",
+     *         in="path",
+     *         required=true,
+     *
+     *         @OA\Schema(type="integer")
+     *     ),
+     *
+     *     @OA\Parameter(
+     *         name="resolution",
+     *         in="query",
+     *         required=false,
+     *
+     *         @OA\Schema(type="string", enum={"minute", "hour"}, default="hour")
+     *     ),
+     *
+     *     @OA\Parameter(
+     *         name="start_date",
+     *         in="query",
+     *         required=false,
+     *
+     *         @OA\Schema(type="string", format="date")
+     *     ),
+     *
+     *     @OA\Parameter(
+     *         name="end_date",
+     *         in="query",
+     *         required=false,
+     *
+     *         @OA\Schema(type="string", format="date")
+     *     ),
+     *
+     *     @OA\Response(
+     *         response=200,
+     *         description="Buckets with checks, failures and avg/p50/p95/max response time",
+     *
+     *         @OA\JsonContent(type="object")
+     *     ),
+     *
+     *     @OA\Response(response=422, description="Unknown resolution")
+     * )
+     */
+    public function index($monitorId, Request $request)
+    {
+        $resolution = $request->input('resolution', 'hour');
+        if (! isset(self::TABLES[$resolution])) {
+            return response()->json(['error' => 'Resolution must be minute or hour'], 422);
+        }
+
+        try {
+            $query = DB::table(self::TABLES[$resolution])
+                ->where('monitor_id', $monitorId)
+                ->select(
+                    'bucket_start',
+                    'checks',
+                    'failures',
+                    'response_time_avg_ms',
+                    'response_time_p50_ms',
+                    'response_time_p95_ms',
+                    'response_time_max_ms'
+                );
+
+            // Range filters on the indexed bucket_start (no DATE() around the column)
+            if ($request->has('start_date') && $request->start_date !== '') {
+                $query->where('bucket_start', '>=', $request->start_date.' 00:00:00');
+            }
+
+            if ($request->has('end_date') && $request->end_date !== '') {
+                $query->where('bucket_start', '<=', $request->end_date.' 23:59:59');
+            }
+
+            $rollups = $query->orderBy('bucket_start')->get();
+
+            Log::info('Monitor log rollups fetched', [
+                'monitor_id' => $monitorId,
+                'resolution' => $resolution,
+                'count' => $rollups->count(),
+            ]);
+
+            return response()->json([
+                'resolution' => $resolution,
+                'rollups' => $rollups,
+            ]);
+        } catch (\Exception $e) {
+            Log::error('Error fetching monitor log rollups', [
+                'monitor_id' => $monitorId,
+                'error' => $e->getMessage(),
+            ]);
+
+            return response()->json(['error' => 'Failed to fetch rollups'], 500);
+        }
+    }
+}
@@ -0,0 +1,99 @@
+<?php
+
+namespace App\Http\Controllers\Api\V1;
+
+use App\Http\Controllers\Controller;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * MonitorStatusTransitionController serves the status changes of a monitor
+ * recorded by the checker, in order, so a client can replay the status
+ * history of a time range without reading every monitor log.
+ */
+class MonitorStatusTransitionController extends Controller
+{
+    /**
+     * @OA\Get(
+     *     path="/api/v1/monitors/{monitorId}/transitions",
+     *     summary="Get monitor status transitions",
+     *     tags={"MonitorLogs"},
+     *
+     *     @OA\Parameter(
+     *         name="monitorId",
+     *         in="path",
+     *         required=true,
+     *
+     *         @OA\Schema(type="integer")
+     *     ),
+     *
+     *     @OA\Parameter(
+     *         name="start_date",
+     *         in="query",
+     *         required=false,
+     *
+     *         @OA\Schema(type="string", format="date")
+     *     ),
+     *
+     *     @OA\Parameter(
+     *         name="end_date",
+     *         in="query",
+     *         required=false,
+     *
+     *         @OA\Schema(type="string", format="date")
+     *     ),
+     *
+     *     @OA\Response(
+     *         response=200,
+     *         description="Status at the start of the range and the transitions within it",
+     *
+     *         @OA\JsonContent(type="object")
+     *     )
+     * )
+     */
+    public function index($monitorId, Request $request)
+    {
+        try {
+            $query = DB::table('monitor_status_transitions')
+                ->where('monitor_id', $monitorId)
+                ->select('previous_status', 'status', 'changed_at');
+
+            // Status before the range, the starting point of a replay
+            $initialStatus = null;
+            if ($request->has('start_date') && $request->start_date !== '') {
+                $start = $request->start_date.' 00:00:00';
+                $initialStatus = DB::table('monitor_status_transitions')
+                    ->where('monitor_id', $monitorId)
+                    ->where('changed_at', '<', $start)
+                    ->orderByDesc('changed_at')
+                    ->orderByDesc('id')
+                    ->value('status');
+                $query->where('changed_at', '>=', $start);
+            }
+
+            if ($request->has('end_date') && $request->end_date !== '') {
+                $query->where('changed_at', '<=', $request->end_date.' 23:59:59');
+            }
+
+            $transitions = $query->orderBy('changed_at')->orderBy('id')->get();
+
+            Log::info('Monitor status transitions fetched', [
+                'monitor_id' => $monitorId,
+                'count' => $transitions->count(),
+            ]);
+
+            return response()->json([
+                'initial_status' => $initialStatus,
+                'transitions' => $transitions,
+            ]);
+        } catch (\Exception $e) {
+            Log::error('Error fetching monitor status transitions', [
+                'monitor_id' => $monitorId,
+                'error' => $e->getMessage(),
+            ]);
+
+            return response()->json(['error' => 'Failed to fetch status transitions'], 500);
+        }
+    }
+}
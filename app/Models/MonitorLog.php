@@ -16,7 +16,12 @@
  *   @OA\Property(property="monitor_id", type="integer", format="int64", example=1),
  *   @OA\Property(property="started_at", type="string", format="date-time", example="2025-08-11T12:00:00Z"),
  *   @OA\Property(property="status", type="string", example="succeeded"),
- *   @OA\Property(property="response_time_ms", type="integer", example=123)
+ *   @OA\Property(property="response_time_ms", type="integer", example=123),
+ *   @OA\Property(property="dns_time_ms", type="integer", nullable=true, example=4),
+ *   @OA\Property(property="connect_time_ms", type="integer", nullable=true, example=20),
+ *   @OA\Property(property="tls_time_ms", type="integer", nullable=true, example=35),
+ *   @OA\Property(property="ttfb_ms", type="integer", nullable=true, example=68),
+ *   @OA\Property(property="body_time_ms", type="integer", nullable=true, example=12)
  * )
  */
 class MonitorLog extends Model
@@ -31,6 +36,11 @@ class MonitorLog extends Model
         'started_at',
         'status',
         'response_time_ms',
+        'dns_time_ms',
+        'connect_time_ms',
+        'tls_time_ms',
+        'ttfb_ms',
+        'body_time_ms',
     ];
 
     /*
@@ -40,6 +50,11 @@ class MonitorLog extends Model
         'started_at' => 'datetime',
         'status' => 'string',
         'response_time_ms' => 'integer',
+        'dns_time_ms' => 'integer',
+        'connect_time_ms' => 'integer',
+        'tls_time_ms' => 'integer',
+        'ttfb_ms' => 'integer',
+        'body_time_ms' => 'integer',
     ];
 
     /*
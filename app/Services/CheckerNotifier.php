@@ -0,0 +1,57 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Redis;
+
+/**
+ * CheckerNotifier pushes ids of created/updated monitors to the Python checker,
+ * so they are checked immediately instead of waiting for the monitor_updates poll.
+ */
+class CheckerNotifier
+{
+    /**
+     * Notify the checker about a changed monitor. Failures are only logged,
+     * the checker still picks the change up from monitor_updates.
+     */
+    public static function notify(int $monitorId): void
+    {
+        $driver = config('services.checker.notify');
+
+        try {
+            if ($driver === 'unix') {
+                foreach (self::socketPaths() as $path) {
+                    $socket = @stream_socket_client('unix://'.$path, $errno, $errstr, 0.5);
+                    if ($socket === false) {
+                        throw new \RuntimeException("{$path}: {$errstr}");
+                    }
+                    fwrite($socket, $monitorId."\n");
+                    fclose($socket);
+                }
+            } elseif ($driver === 'redis') {
+                Redis::publish(config('services.checker.redis_channel'), (string) $monitorId);
+            }
+        } catch (\Throwable $e) {
+            Log::warning('Failed to notify checker', ['monitor' => $monitorId, 'error' => $e->getMessage()]);
+        }
+    }
+
+    /**
+     * Sockets of the checker processes. With --workers N every worker listens
+     * on "<socket>.<index>" and only handles the monitors of its shard, so
+     * every worker gets the id.
+     *
+     * @return array<int, string>
+     */
+    public static function socketPaths(): array
+    {
+        $socket = config('services.checker.socket');
+        $workers = (int) config('services.checker.workers', 1);
+        if ($workers <= 1) {
+            return [$socket];
+        }
+
+        return array_map(fn (int $index) => "{$socket}.{$index}", range(0, $workers - 1));
+    }
+}
@@ -35,4 +35,15 @@
         ],
     ],
 
+    'checker' => [
+        // none, unix or redis (must match CHANGE_FEED_SOURCES of the Python checker)
+        'notify' => env('CHECKER_NOTIFY', 'none'),
+        'socket' => env('CHANGE_FEED_SOCKET', '/tmp/monitor-checker.sock'),
+        // Worker processes of the checker (--workers), each has its own socket
+        'workers' => env('CHECKER_WORKERS', 1),
+        'redis_channel' => env('CHANGE_FEED_REDIS_CHANNEL', 'monitor-updates'),
+        // trigger or checker (who writes monitors.status, shared with the Python checker)
+        'status_updates' => env('CHECKER_STATUS_UPDATES', 'trigger'),
+    ],
+
 ];
@@ -0,0 +1,28 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Leases of the running Python checker workers (sharded mode)
+        Schema::create('checker_leases', function (Blueprint $table) {
+            $table->string('worker_id')->primary();
+            $table->unsignedBigInteger('expires_at')->index(); // Unix timestamp
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('checker_leases');
+    }
+};
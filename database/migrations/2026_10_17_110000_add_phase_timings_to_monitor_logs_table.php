@@ -0,0 +1,34 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Latency breakdown written by the Python checker (null when a phase
+        // did not happen, e.g. no TLS for plain HTTP or a reused connection)
+        Schema::table('monitor_logs', function (Blueprint $table) {
+            $table->unsignedInteger('dns_time_ms')->nullable()->after('response_time_ms');
+            $table->unsignedInteger('connect_time_ms')->nullable()->after('dns_time_ms');
+            $table->unsignedInteger('tls_time_ms')->nullable()->after('connect_time_ms');
+            $table->unsignedInteger('ttfb_ms')->nullable()->after('tls_time_ms');
+            $table->unsignedInteger('body_time_ms')->nullable()->after('ttfb_ms');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('monitor_logs', function (Blueprint $table) {
+            $table->dropColumn(['dns_time_ms', 'connect_time_ms', 'tls_time_ms', 'ttfb_ms', 'body_time_ms']);
+        });
+    }
+};
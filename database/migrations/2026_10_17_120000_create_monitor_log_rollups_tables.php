@@ -0,0 +1,55 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Per-monitor time range reads (API, dashboards, the checker's startup
+        // query) and the retention job's range deletes
+        Schema::table('monitor_logs', function (Blueprint $table) {
+            $table->index(['monitor_id', 'started_at']);
+            $table->index('started_at');
+        });
+
+        // Aggregates maintained by the Python checker as it writes monitor_logs.
+        // Response time statistics cover successful checks only, the
+        // histogram lets the checker resume a bucket after a restart.
+        foreach (['monitor_logs_minutely', 'monitor_logs_hourly'] as $name) {
+            Schema::create($name, function (Blueprint $table) {
+                $table->foreignId('monitor_id')->constrained()->onDelete('cascade');
+                $table->timestamp('bucket_start');
+                $table->unsignedInteger('checks');
+                $table->unsignedInteger('failures');
+                $table->decimal('response_time_avg_ms', 10, 1)->nullable();
+                $table->unsignedInteger('response_time_p50_ms')->nullable();
+                $table->unsignedInteger('response_time_p95_ms')->nullable();
+                $table->unsignedInteger('response_time_max_ms')->nullable();
+                $table->text('latency_histogram')->nullable();
+
+                $table->primary(['monitor_id', 'bucket_start']);
+                $table->index('bucket_start');
+            });
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('monitor_logs_hourly');
+        Schema::dropIfExists('monitor_logs_minutely');
+
+        Schema::table('monitor_logs', function (Blueprint $table) {
+            $table->dropIndex(['started_at']);
+            $table->dropIndex(['monitor_id', 'started_at']);
+        });
+    }
+};
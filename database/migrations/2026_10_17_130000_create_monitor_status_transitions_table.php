@@ -0,0 +1,65 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Status changes of the monitors, appended by the Python checker
+        Schema::create('monitor_status_transitions', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('monitor_id')->constrained()->onDelete('cascade');
+            $table->string('previous_status');
+            $table->string('status');
+            $table->timestamp('changed_at');
+
+            $table->index(['monitor_id', 'changed_at']);
+            $table->index('changed_at');
+        });
+
+        // The trigger rewrote the monitor row for every log. It now only
+        // writes changed statuses, and is left out entirely when the checker
+        // writes monitors.status itself (CHECKER_STATUS_UPDATES=checker).
+        DB::unprepared('DROP TRIGGER IF EXISTS update_monitor_status');
+
+        if (config('services.checker.status_updates') !== 'checker') {
+            DB::unprepared('
+                CREATE TRIGGER update_monitor_status
+                AFTER INSERT ON monitor_logs
+                FOR EACH ROW
+                BEGIN
+                    UPDATE monitors
+                    SET status = NEW.status
+                    WHERE id = NEW.monitor_id AND status <> NEW.status;
+                END
+            ');
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        DB::unprepared('DROP TRIGGER IF EXISTS update_monitor_status');
+        DB::unprepared('
+            CREATE TRIGGER update_monitor_status
+            AFTER INSERT ON monitor_logs
+            FOR EACH ROW
+            BEGIN
+                UPDATE monitors
+                SET status = NEW.status
+                WHERE id = NEW.monitor_id;
+            END
+        ');
+
+        Schema::dropIfExists('monitor_status_transitions');
+    }
+};
@@ -0,0 +1,29 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // The Python checker syncs monitors changed since its last sync (updated_at >= ?)
+        Schema::table('monitors', function (Blueprint $table) {
+            $table->index('updated_at');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('monitors', function (Blueprint $table) {
+            $table->dropIndex(['updated_at']);
+        });
+    }
+};
@@ -0,0 +1,42 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Ids of deleted monitors (also cascaded deletes), read by the Python
+        // checker from its last seen id and purged by its retention job
+        Schema::create('monitor_deletions', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('monitor_id');
+            $table->timestamp('deleted_at')->index();
+        });
+
+        DB::unprepared('
+            CREATE TRIGGER after_monitor_delete
+            AFTER DELETE ON monitors
+            FOR EACH ROW
+            BEGIN
+                INSERT INTO monitor_deletions (monitor_id, deleted_at)
+                VALUES (OLD.id, UTC_TIMESTAMP());
+            END
+        ');
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        DB::unprepared('DROP TRIGGER IF EXISTS after_monitor_delete');
+        Schema::dropIfExists('monitor_deletions');
+    }
+};
@@ -3,6 +3,8 @@
 use App\Http\Controllers\Api\V1\BadgeController;
 use App\Http\Controllers\Api\V1\MonitorController;
 use App\Http\Controllers\Api\V1\MonitorLogController;
+use App\Http\Controllers\Api\V1\MonitorLogRollupController;
+use App\Http\Controllers\Api\V1\MonitorStatusTransitionController;
 use App\Http\Controllers\Api\V1\ProjectController;
 use Illuminate\Support\Facades\Route;
 
@@ -10,6 +12,8 @@
     Route::apiResource('projects', ProjectController::class);
     Route::apiResource('monitors', MonitorController::class);
     Route::apiResource('monitors.logs', MonitorLogController::class);
+    Route::get('/monitors/{monitorId}/rollups', [MonitorLogRollupController::class, 'index']);
+    Route::get('/monitors/{monitorId}/transitions', [MonitorStatusTransitionController::class, 'index']);
     Route::get('/badge/{monitorId}', [BadgeController::class, 'show']);
 });
 